@@ -0,0 +1,52 @@
+"""drop user foreign keys on shard tables
+
+In sharded mode `users` lives in the global database only, so a shard's
+accounts, categories, budgets, recurring state and archive rows cannot
+reference it; a database enforcing foreign keys rejected their inserts.
+owner_id stays a plain (indexed) column, checked by the application.
+
+The constraints were created unnamed: PostgreSQL named them
+<table>_owner_id_fkey, and on SQLite the batch rebuild names the reflected
+ones through a naming convention so they can be dropped.
+
+Revision ID: 49dd93c6e948
+Revises: a4c2e8f61d93
+Create Date: 2026-10-19 11:40:05.175501
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '49dd93c6e948'
+down_revision: Union[str, Sequence[str], None] = 'a4c2e8f61d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    'accounts',
+    'budgets',
+    'categories',
+    'recurring_series',
+    'recurring_watermarks',
+    'transaction_archives',
+)
+_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        with op.batch_alter_table(table, naming_convention=_CONVENTION) as batch_op:
+            batch_op.drop_constraint(f'{table}_owner_id_fkey', type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, naming_convention=_CONVENTION) as batch_op:
+            batch_op.create_foreign_key(
+                f'{table}_owner_id_fkey', 'users', ['owner_id'], ['id']
+            )
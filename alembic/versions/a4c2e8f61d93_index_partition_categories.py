@@ -0,0 +1,46 @@
+"""index partition categories
+
+SQLite's transactions_<year> tables got only the (account_id, date) index;
+add (category_id, date) to the existing ones, as on `transactions`.
+PostgreSQL's native partitions inherit the parent's indexes already.
+
+Revision ID: a4c2e8f61d93
+Revises: 501fa8fb3b31
+Create Date: 2026-10-19 21:14:03.417250
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c2e8f61d93'
+down_revision: Union[str, Sequence[str], None] = '501fa8fb3b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _partition_tables(bind) -> list[str]:
+    if bind.dialect.name != 'sqlite':
+        return []
+    return list(bind.execute(sa.text(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name GLOB 'transactions_[0-9][0-9][0-9][0-9]'"
+    )).scalars())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _partition_tables(op.get_bind()):
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_{table}_category_date '
+            f'ON {table} (category_id, date)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _partition_tables(op.get_bind()):
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_category_date')
@@ -0,0 +1,126 @@
+"""store cents and epoch timestamps
+
+Money columns become BIGINT cents on every dialect.  On SQLite
+transactions.date becomes BIGINT microseconds since the epoch (UTC),
+including in any transactions_<year> partition tables; PostgreSQL keeps
+timestamptz, which is already an int64 and is the partition key there.
+
+Revision ID: b5c1e7a9d204
+Revises: 6a2d8f4c1e93
+Create Date: 2026-10-19 19:26:51.904412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c1e7a9d204'
+down_revision: Union[str, Sequence[str], None] = '6a2d8f4c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY = {
+    'accounts': ('balance',),
+    'budgets': ('amount',),
+    'recurring_series': ('last_amount', 'amount_total'),
+    'transactions': ('amount',),
+}
+NUMERIC = sa.Numeric(precision=15, scale=2)
+
+# Stored DATETIMEs are 'YYYY-MM-DD HH:MM:SS.ffffff' in UTC
+TO_MICROS = (
+    "CAST(strftime('%s', date) AS INTEGER) * 1000000"
+    " + CAST(COALESCE(NULLIF(substr(date, 21, 6), ''), '0') AS INTEGER)"
+)
+FROM_MICROS = (
+    "strftime('%Y-%m-%d %H:%M:%S', date / 1000000, 'unixepoch')"
+    " || printf('.%06d', date % 1000000)"
+)
+
+
+def _partition_tables(bind) -> list[str]:
+    return list(bind.execute(sa.text(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name GLOB 'transactions_[0-9][0-9][0-9][0-9]'"
+    )).scalars())
+
+
+def _table_kwargs(table: str) -> dict:
+    return {'sqlite_autoincrement': True} if table == 'transactions' else {}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table, columns in MONEY.items():
+            for column in columns:
+                op.alter_column(
+                    table, column,
+                    existing_type=NUMERIC,
+                    type_=sa.BigInteger(),
+                    postgresql_using=f'round({column} * 100)::bigint',
+                )
+        return
+
+    for table, columns in MONEY.items():
+        cents = ', '.join(
+            f'{c} = CAST(ROUND({c} * 100) AS INTEGER)' for c in columns
+        )
+        op.execute(f'UPDATE {table} SET {cents}')
+    for table in ['transactions', *_partition_tables(bind)]:
+        if table != 'transactions':
+            op.execute(f'UPDATE {table} SET amount = CAST(ROUND(amount * 100) AS INTEGER)')
+        op.execute(f'UPDATE {table} SET date = {TO_MICROS}')
+
+    for table, columns in MONEY.items():
+        with op.batch_alter_table(
+            table, recreate='always', table_kwargs=_table_kwargs(table)
+        ) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column, existing_type=NUMERIC, type_=sa.BigInteger()
+                )
+            if table == 'transactions':
+                batch_op.alter_column(
+                    'date', existing_type=sa.DateTime(), type_=sa.BigInteger()
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table, columns in MONEY.items():
+            for column in columns:
+                op.alter_column(
+                    table, column,
+                    existing_type=sa.BigInteger(),
+                    type_=NUMERIC,
+                    postgresql_using=f'{column} / 100.0',
+                )
+        return
+
+    for table, columns in MONEY.items():
+        with op.batch_alter_table(
+            table, recreate='always', table_kwargs=_table_kwargs(table)
+        ) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column, existing_type=sa.BigInteger(), type_=NUMERIC
+                )
+            if table == 'transactions':
+                batch_op.alter_column(
+                    'date', existing_type=sa.BigInteger(), type_=sa.DateTime()
+                )
+
+    for table, columns in MONEY.items():
+        amounts = ', '.join(f'{c} = {c} / 100.0' for c in columns)
+        op.execute(f'UPDATE {table} SET {amounts}')
+    for table in ['transactions', *_partition_tables(bind)]:
+        if table != 'transactions':
+            op.execute(f'UPDATE {table} SET amount = amount / 100.0')
+        op.execute(f'UPDATE {table} SET date = {FROM_MICROS}')
@@ -0,0 +1,95 @@
+"""partition transactions by year
+
+On PostgreSQL `transactions` becomes a natively partitioned table (RANGE on
+date, one partition per year from the oldest row through next year, plus a
+DEFAULT partition); `python -m scripts.partitions` adds later years.  On
+SQLite the table is rebuilt with AUTOINCREMENT so ids are never reused once
+rows move to transactions_<year> tables or the archive.
+
+Revision ID: d8e41a5c03b7
+Revises: 9b1f6e2c7d40
+Create Date: 2026-10-19 15:47:12.604118
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e41a5c03b7'
+down_revision: Union[str, Sequence[str], None] = '9b1f6e2c7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _years(bind) -> range:
+    oldest = bind.execute(sa.text('SELECT min(date) FROM transactions')).scalar()
+    this_year = date.today().year
+    return range(oldest.year if oldest else this_year, this_year + 2)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        with op.batch_alter_table(
+            'transactions',
+            recreate='always',
+            table_kwargs={'sqlite_autoincrement': True},
+        ):
+            pass
+        return
+
+    years = _years(bind)
+    op.execute('ALTER TABLE transactions RENAME TO transactions_unpartitioned')
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY NONE')
+    op.execute('DROP INDEX ix_transactions_id')
+    op.execute(
+        'CREATE TABLE transactions ('
+        'LIKE transactions_unpartitioned INCLUDING DEFAULTS, '
+        'PRIMARY KEY (id, date), '
+        'FOREIGN KEY (account_id) REFERENCES accounts (id), '
+        'FOREIGN KEY (category_id) REFERENCES categories (id)'
+        ') PARTITION BY RANGE (date)'
+    )
+    for year in years:
+        op.execute(
+            f'CREATE TABLE transactions_{year} PARTITION OF transactions '
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions DEFAULT')
+    op.execute('INSERT INTO transactions SELECT * FROM transactions_unpartitioned')
+    op.execute('DROP TABLE transactions_unpartitioned')
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        with op.batch_alter_table(
+            'transactions',
+            recreate='always',
+            table_kwargs={'sqlite_autoincrement': False},
+        ):
+            pass
+        return
+
+    op.execute('ALTER TABLE transactions RENAME TO transactions_partitioned')
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY NONE')
+    op.execute('DROP INDEX ix_transactions_id')
+    op.execute(
+        'CREATE TABLE transactions ('
+        'LIKE transactions_partitioned INCLUDING DEFAULTS, '
+        'PRIMARY KEY (id), '
+        'FOREIGN KEY (account_id) REFERENCES accounts (id), '
+        'FOREIGN KEY (category_id) REFERENCES categories (id))'
+    )
+    op.execute('INSERT INTO transactions SELECT * FROM transactions_partitioned')
+    op.execute('DROP TABLE transactions_partitioned CASCADE')
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
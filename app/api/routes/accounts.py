@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
+from app.core import cache, events
+from app.db import partitions
 from app.db.session import get_db
+from app.db.writes import insert_returning, update_returning
 from app.models.account import Account
 from app.models.user import User
-from app.schemas.account import AccountCreate, AccountRead, AccountUpdate
+from app.schemas.account import (
+    AccountCreate,
+    AccountRead,
+    AccountUpdate,
+    ReconciliationRead,
+)
+from app.schemas.fields import columns, fields_param, partial
+from app.services import ledger, recurring
 from app.services.auth import get_current_user
+from app.services.versions import bump_data_version
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
@@ -19,10 +31,25 @@ def _get_account_or_404(account_id: int, user: User, db: Session) -> Account:
 
 @router.get("/", response_model=list[AccountRead])
 def list_accounts(
+    fields: tuple[str, ...] | None = Depends(fields_param(AccountRead)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return db.query(Account).filter(Account.owner_id == current_user.id).all()
+    if fields:
+        # Projections skip the cache, which holds the full rows
+        rows = (
+            db.query(*columns(Account, fields))
+            .filter(Account.owner_id == current_user.id)
+            .all()
+        )
+        return JSONResponse(cache.dump(partial(AccountRead, fields), rows))
+    return cache.read_through(
+        cache.user_key("accounts", current_user.id),
+        lambda: cache.dump(
+            AccountRead,
+            db.query(Account).filter(Account.owner_id == current_user.id).all(),
+        ),
+    )
 
 
 @router.post("/", response_model=AccountRead, status_code=status.HTTP_201_CREATED)
@@ -31,10 +58,17 @@ def create_account(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    account = Account(**payload.model_dump(), owner_id=current_user.id)
-    db.add(account)
+    account = insert_returning(
+        db,
+        Account,
+        {
+            **payload.model_dump(),
+            "owner_id": current_user.id,
+            "opening_balance": payload.balance,
+        },
+    )
     db.commit()
-    db.refresh(account)
+    cache.invalidate(current_user.id, "accounts")
     return account
 
 
@@ -54,11 +88,18 @@ def update_account(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    account = _get_account_or_404(account_id, current_user, db)
-    for field, value in payload.model_dump(exclude_none=True).items():
-        setattr(account, field, value)
+    # Ownership is part of the UPDATE: no SELECT beforehand
+    account = update_returning(
+        db,
+        Account,
+        payload.model_dump(exclude_none=True),
+        Account.id == account_id,
+        Account.owner_id == current_user.id,
+    )
+    if account is None:
+        raise HTTPException(status_code=404, detail="Account not found")
     db.commit()
-    db.refresh(account)
+    cache.invalidate(current_user.id, "accounts")
     return account
 
 
@@ -69,5 +110,41 @@ def delete_account(
     current_user: User = Depends(get_current_user),
 ):
     account = _get_account_or_404(account_id, current_user, db)
+    partitions.delete_by_column(db, "account_id", [account.id])
+    ledger.forget(db, account.id)
     db.delete(account)
+    recurring.reset(db, current_user.id)
+    bump_data_version(db, current_user.id)
+    db.commit()
+    cache.invalidate(current_user.id, "accounts")
+
+
+@router.get("/{account_id}/reconcile", response_model=ReconciliationRead)
+def reconcile_account(
+    account_id: int,
+    full: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Balance vs. ledger; recomputes months changed since the last check."""
+    _get_account_or_404(account_id, current_user, db)
+    result = ledger.reconcile(db, account_id, full=full)
+    db.commit()
+    return result
+
+
+@router.post("/{account_id}/reconcile", response_model=ReconciliationRead)
+def repair_account(
+    account_id: int,
+    full: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """As GET, and a drifted balance is reset to the ledger's."""
+    _get_account_or_404(account_id, current_user, db)
+    result = ledger.reconcile(db, account_id, full=full, repair=True)
     db.commit()
+    if result.repaired:
+        cache.invalidate(current_user.id, "accounts")
+        events.publish(current_user.id, "balance", account_id=account_id)
+    return result
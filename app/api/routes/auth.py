@@ -3,30 +3,56 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.security import create_access_token, hash_password, verify_password
-from app.db.session import get_db
+from app.db.session import get_db, shard_engines
+from app.db.sharding import assign_shard
+from app.db.writes import insert_returning
 from app.models.user import User
-from app.schemas.user import Token, UserCreate, UserRead
+from app.schemas.user import RefreshRequest, Token, UserCreate, UserRead
+from app.services import tokens
+from app.services.admission import auth_rate, auth_slots, login_name_rate
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Both routes run bcrypt: cap them per client and in total
+_admission = [Depends(auth_rate.by_client), Depends(auth_slots)]
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == payload.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
 
-    user = User(
-        email=payload.email,
-        hashed_password=hash_password(payload.password),
-        full_name=payload.full_name,
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=_admission,
+)
+def register(payload: UserCreate, db: Session = Depends(get_db)):
+    # The unique index on email decides: a duplicate inserts nothing
+    user = insert_returning(
+        db,
+        User,
+        {
+            "email": payload.email,
+            "hashed_password": hash_password(payload.password),
+            "full_name": payload.full_name,
+        },
+        conflict=["email"],
     )
-    db.add(user)
+    if user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if shard_engines:
+        user.shard = assign_shard(user.id)  # the ring places users by id
     db.commit()
-    db.refresh(user)
     return user
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    # Per name too: guessing one account's password from many addresses
+    dependencies=[
+        Depends(auth_rate.by_client),
+        Depends(login_name_rate.by_login_name),
+        Depends(auth_slots),
+    ],
+)
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
@@ -39,4 +65,29 @@ def login(
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return Token(access_token=create_access_token(user.id))
+    refresh_token = tokens.issue(db, user.id)
+    db.commit()
+    return Token(access_token=create_access_token(user.id), refresh_token=refresh_token)
+
+
+# No bcrypt below: an index lookup and a SHA-256 per call, no admission limits
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(payload: RefreshRequest, db: Session = Depends(get_db)):
+    rotated = tokens.rotate(db, payload.refresh_token)
+    db.commit()  # a reused token has revoked its family
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user, refresh_token = rotated
+    return Token(access_token=create_access_token(user.id), refresh_token=refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(payload: RefreshRequest, db: Session = Depends(get_db)):
+    tokens.revoke(db, payload.refresh_token)
+    db.commit()
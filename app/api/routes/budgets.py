@@ -1,15 +1,26 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core import cache, events
+from app.db import partitions
 from app.db.session import get_db
+from app.db.types import epoch_day
+from app.db.writes import insert_returning, update_returning
+from app.models.account import Account
 from app.models.budget import Budget
-from app.models.transaction import Category, Transaction
+from app.models.transaction import Category
 from app.models.user import User
 from app.schemas.budget import BudgetCreate, BudgetRead, BudgetStatus, BudgetUpdate
+from app.schemas.fields import columns, fields_param, partial
+from app.services import fx
+from app.services.admission import report_rate
 from app.services.auth import get_current_user
+from app.services.budgets import budgets_with_names, build_status, month_bounds
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
 
@@ -25,15 +36,34 @@ def _get_budget_or_404(budget_id: int, user: User, db: Session) -> Budget:
 def list_budgets(
     year: int | None = Query(None),
     month: int | None = Query(None),
+    fields: tuple[str, ...] | None = Depends(fields_param(BudgetRead)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    q = db.query(Budget).filter(Budget.owner_id == current_user.id)
-    if year:
-        q = q.filter(Budget.year == year)
-    if month:
-        q = q.filter(Budget.month == month)
-    return q.all()
+    if fields:
+        # Projections skip the cache, which holds the full rows
+        q = db.query(*columns(Budget, fields)).filter(
+            Budget.owner_id == current_user.id
+        )
+        if year:
+            q = q.filter(Budget.year == year)
+        if month:
+            q = q.filter(Budget.month == month)
+        return JSONResponse(cache.dump(partial(BudgetRead, fields), q.all()))
+
+    # The whole list is cached once per user; filters apply to the cached copy
+    budgets = cache.read_through(
+        cache.user_key("budgets", current_user.id),
+        lambda: cache.dump(
+            BudgetRead,
+            db.query(Budget).filter(Budget.owner_id == current_user.id).all(),
+        ),
+    )
+    return [
+        b
+        for b in budgets
+        if (not year or b["year"] == year) and (not month or b["month"] == month)
+    ]
 
 
 @router.post("/", response_model=BudgetRead, status_code=201)
@@ -47,25 +77,22 @@ def create_budget(
     if not cat or cat.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    existing = (
-        db.query(Budget)
-        .filter(
-            Budget.owner_id == current_user.id,
-            Budget.category_id == payload.category_id,
-            Budget.year == payload.year,
-            Budget.month == payload.month,
-        )
-        .first()
+    # uq_budget rejects a second budget for the category/month
+    budget = insert_returning(
+        db,
+        Budget,
+        {**payload.model_dump(), "owner_id": current_user.id},
+        conflict=["owner_id", "category_id", "year", "month"],
     )
-    if existing:
+    if budget is None:
         raise HTTPException(
             status_code=400, detail="Budget already exists for this category/month"
         )
-
-    budget = Budget(**payload.model_dump(), owner_id=current_user.id)
-    db.add(budget)
     db.commit()
-    db.refresh(budget)
+    cache.invalidate(current_user.id, "budgets")
+    events.publish(
+        current_user.id, "budget", budget_id=budget.id, category_id=budget.category_id
+    )
     return budget
 
 
@@ -76,10 +103,20 @@ def update_budget(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    budget = _get_budget_or_404(budget_id, current_user, db)
-    budget.amount = payload.amount
+    budget = update_returning(
+        db,
+        Budget,
+        {"amount": payload.amount},
+        Budget.id == budget_id,
+        Budget.owner_id == current_user.id,
+    )
+    if budget is None:
+        raise HTTPException(status_code=404, detail="Budget not found")
     db.commit()
-    db.refresh(budget)
+    cache.invalidate(current_user.id, "budgets")
+    events.publish(
+        current_user.id, "budget", budget_id=budget.id, category_id=budget.category_id
+    )
     return budget
 
 
@@ -92,68 +129,72 @@ def delete_budget(
     budget = _get_budget_or_404(budget_id, current_user, db)
     db.delete(budget)
     db.commit()
+    cache.invalidate(current_user.id, "budgets")
+    events.publish(
+        current_user.id, "budget", budget_id=budget.id, category_id=budget.category_id
+    )
 
 
-@router.get("/status", response_model=list[BudgetStatus])
+@router.get(
+    "/status",
+    response_model=list[BudgetStatus],
+    dependencies=[Depends(report_rate.by_user)],
+)
 def budget_status(
     year: int | None = Query(None),
     month: int | None = Query(None),
+    currency: str | None = Query(None, min_length=3, max_length=3),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     now = datetime.now(timezone.utc)
     year = year or now.year
     month = month or now.month
+    month_start, month_end = month_bounds(year, month)
 
-    budgets = (
-        db.query(Budget)
+    budgets = budgets_with_names(db, current_user.id, year, month)
+    if not budgets:
+        return []
+
+    # Expenses for every budgeted category in a single grouped query
+    Tx = partitions.transactions(db, month_start, month_end)
+    q = (
+        db.query(Tx)
+        .join(Account, Account.id == Tx.account_id)
         .filter(
-            Budget.owner_id == current_user.id,
-            Budget.year == year,
-            Budget.month == month,
+            Account.owner_id == current_user.id,
+            Tx.category_id.in_([b.category_id for b, _ in budgets]),
+            Tx.transaction_type == "expense",
+            Tx.date >= month_start,
+            Tx.date < month_end,
         )
-        .all()
     )
+    target = currency.upper() if currency else None
+    if target is None:
+        spent_by_category = dict(
+            q.with_entities(Tx.category_id, func.sum(Tx.amount))
+            .group_by(Tx.category_id)
+            .all()
+        )
+        return build_status(budgets, spent_by_category)
 
-    # Get all accounts owned by the user for filtering transactions
-    from app.models.account import Account
-
-    owned_account_ids = [
-        r[0]
-        for r in db.query(Account.id).filter(Account.owner_id == current_user.id).all()
-    ]
-
-    result = []
-    for b in budgets:
-        # Sum expenses for this category in the given month
-        spent_raw = (
-            db.query(func.coalesce(func.sum(Transaction.amount), 0))
-            .filter(
-                Transaction.account_id.in_(owned_account_ids),
-                Transaction.category_id == b.category_id,
-                Transaction.transaction_type == "expense",
-                func.strftime("%Y", Transaction.date) == str(year),
-                func.strftime("%m", Transaction.date) == f"{month:02d}",
-            )
-            .scalar()
+    # Budgets are taken to be in `currency`; spending is converted per day
+    rows = (
+        q.with_entities(
+            Tx.category_id, Account.currency, epoch_day(Tx.date), func.sum(Tx.amount)
         )
-        from decimal import Decimal
-
-        budget_amt = Decimal(str(b.amount))
-        spent = abs(Decimal(str(spent_raw)))
-        remaining = budget_amt - spent
-        percent_used = float(spent / budget_amt * 100) if budget_amt > 0 else 0.0
-
-        result.append(
-            BudgetStatus(
-                category_id=b.category_id,
-                category_name=b.category.name,
-                budget=budget_amt,
-                spent=spent,
-                remaining=remaining,
-                percent_used=round(percent_used, 1),
-                over_budget=spent > budget_amt,
-            )
+        .group_by(Tx.category_id, Account.currency, epoch_day(Tx.date))
+        .all()
+    )
+    categories, currencies, days, amounts = fx.columns(rows)
+    if fx.needs_conversion(currencies, target):
+        spent_by_category = fx.sum_converted(
+            db, categories, currencies, days, amounts, target
         )
-
-    return result
+    else:
+        spent_by_category = {}
+        for category_id, _, _, amount in rows:
+            spent_by_category[category_id] = (
+                spent_by_category.get(category_id, Decimal(0)) + amount
+            )
+    return build_status(budgets, spent_by_category)
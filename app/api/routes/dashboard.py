@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.db import partitions
+from app.db.session import get_db
+from app.models.account import Account
+from app.models.transaction import Category
+from app.models.user import User
+from app.schemas.account import AccountRead
+from app.schemas.dashboard import DashboardRead
+from app.schemas.transaction import CategoryRead, SummaryRead
+from app.services.admission import report_rate
+from app.services.auth import get_current_user
+from app.services.budgets import budgets_with_names, build_status, month_bounds
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+RECENT_LIMIT = 5
+
+
+@router.get(
+    "", response_model=DashboardRead, dependencies=[Depends(report_rate.by_user)]
+)
+def get_dashboard(
+    period: str | None = Query(
+        None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Accounts, categories, the period's summary and budget status, and the
+    latest transactions.
+
+    Accounts and categories come from the reference-data cache, and the
+    owned account ids are taken from that list instead of a separate lookup.
+    Income, expenses and spend per category all come from one grouped
+    query over the period.  The whole response needs at most three queries
+    once the cache is warm.
+    """
+    if period:
+        year, month = int(period[:4]), int(period[5:])
+    else:
+        now = datetime.now(timezone.utc)
+        year, month = now.year, now.month
+    start, end = month_bounds(year, month)
+
+    accounts = cache.read_through(
+        cache.user_key("accounts", current_user.id),
+        lambda: cache.dump(
+            AccountRead,
+            db.query(Account).filter(Account.owner_id == current_user.id).all(),
+        ),
+    )
+    categories = cache.read_through(
+        cache.user_key("categories", current_user.id),
+        lambda: cache.dump(
+            CategoryRead,
+            db.query(Category).filter(Category.owner_id == current_user.id).all(),
+        ),
+    )
+    owned = [a["id"] for a in accounts]
+
+    # One pass over the period: (type, category) → sum
+    Tx = partitions.transactions(db, start, end)
+    totals = (
+        db.query(
+            Tx.transaction_type,
+            Tx.category_id,
+            func.sum(Tx.amount),
+        )
+        .filter(
+            Tx.account_id.in_(owned),
+            Tx.date >= start,
+            Tx.date < end,
+        )
+        .group_by(Tx.transaction_type, Tx.category_id)
+        .all()
+    )
+    income = sum((t for kind, _, t in totals if kind == "income"), Decimal(0))
+    expenses = sum((t for kind, _, t in totals if kind == "expense"), Decimal(0))
+    spent_by_category = {
+        category_id: total
+        for kind, category_id, total in totals
+        if kind == "expense" and category_id is not None
+    }
+
+    Tx = partitions.transactions(db)
+    recent = (
+        db.query(Tx)
+        .filter(Tx.account_id.in_(owned))
+        .order_by(Tx.date.desc())
+        .limit(RECENT_LIMIT)
+        .all()
+    )
+    budgets = budgets_with_names(db, current_user.id, year, month)
+
+    return DashboardRead(
+        period=f"{year:04d}-{month:02d}",
+        accounts=accounts,
+        categories=categories,
+        summary=SummaryRead(
+            total_income=income,
+            total_expenses=abs(expenses),
+            net=income + expenses,
+            period_start=start,
+            period_end=end,
+        ),
+        recent=recent,
+        budgets=build_status(budgets, spent_by_category),
+    )
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import PATH, hub
+from app.db.session import get_db
+from app.models.user import User
+from app.services.auth import get_current_user
+
+router = APIRouter(tags=["events"])
+
+_bearer = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+
+def _event_user(
+    header_token: str | None = Depends(_bearer),
+    access_token: str | None = Query(None),
+    db: Session = Depends(get_db),
+) -> User:
+    # Browsers' EventSource can't send headers: accept ?access_token= too
+    return get_current_user(header_token or access_token or "", db)
+
+
+@router.get(PATH)
+async def events(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(_event_user),
+):
+    """Server-Sent Events: the user's change notifications as they happen."""
+    # The stream can stay open for hours: give the connection back now
+    db.close()
+    return StreamingResponse(
+        hub.stream(
+            current_user.id,
+            settings.EVENTS_QUEUE_SIZE,
+            settings.EVENTS_HEARTBEAT_SECONDS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
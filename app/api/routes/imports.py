@@ -1,21 +1,32 @@
 import io
+import time
 from datetime import datetime
+from decimal import Decimal
 
-import openpyxl
+import anyio.to_thread
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
 from pydantic import BaseModel
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from app.core import cache, events, metrics
 from app.db.session import get_db
 from app.models.account import Account
 from app.models.transaction import Transaction
 from app.models.user import User
+from app.services import ledger
+from app.services.admission import import_rate, import_slots
 from app.services.auth import get_current_user
 from app.services.fineco_parser import parse_fineco_excel
+from app.services.versions import bump_data_version
 
 router = APIRouter(prefix="/import", tags=["import"])
 
+# Parsing a workbook is CPU-bound: rate-limit per user and bound concurrency
+_admission = [Depends(import_rate.by_user), Depends(import_slots)]
+
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+_CENT = Decimal("0.01")
 
 
 class ImportPreviewRow(BaseModel):
@@ -40,12 +51,14 @@ class ImportConfirmResponse(BaseModel):
     imported: int
 
 
-@router.post("/inspect")
+@router.post("/inspect", dependencies=_admission)
 async def inspect_file(
     file: UploadFile,
     current_user: User = Depends(get_current_user),
 ):
     """Return the first 15 rows of the uploaded file (values only) for debugging."""
+    import openpyxl
+
     content = await file.read()
     wb = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
     ws = wb.active
@@ -57,7 +70,7 @@ async def inspect_file(
     return {"sheet": ws.title, "rows": rows}
 
 
-@router.post("/preview", response_model=ImportPreviewResponse)
+@router.post("/preview", response_model=ImportPreviewResponse, dependencies=_admission)
 async def preview_import(
     file: UploadFile,
     current_user: User = Depends(get_current_user),
@@ -71,10 +84,15 @@ async def preview_import(
     if len(content) > MAX_FILE_SIZE:
         raise HTTPException(status_code=400, detail="File troppo grande (max 10 MB)")
 
+    started = time.perf_counter()
     try:
-        rows = parse_fineco_excel(content)
+        # Off the event loop, so one large upload doesn't stall other requests
+        rows = await anyio.to_thread.run_sync(parse_fineco_excel, content)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    metrics.IMPORT_DURATION.observe(time.perf_counter() - started, stage="preview")
+    metrics.IMPORT_ROWS.inc(len(rows), stage="preview")
+    metrics.IMPORT_BYTES.inc(len(content))
 
     if not rows:
         raise HTTPException(
@@ -103,7 +121,11 @@ async def preview_import(
     )
 
 
-@router.post("/confirm", response_model=ImportConfirmResponse)
+@router.post(
+    "/confirm",
+    response_model=ImportConfirmResponse,
+    dependencies=[Depends(import_rate.by_user)],
+)
 def confirm_import(
     payload: ImportConfirmRequest,
     db: Session = Depends(get_db),
@@ -113,8 +135,14 @@ def confirm_import(
     if not account or account.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Conto non trovato")
 
+    started = time.perf_counter()
+    dates = []
+    total = Decimal(0)
     for row in payload.rows:
-        amount = row.amount if row.transaction_type == "income" else -row.amount
+        # Preview amounts are JSON floats: back to exact cents via their repr
+        amount = Decimal(str(row.amount)).quantize(_CENT)
+        if row.transaction_type != "income":
+            amount = -amount
         tx = Transaction(
             account_id=account.id,
             amount=amount,
@@ -123,7 +151,24 @@ def confirm_import(
             date=datetime.strptime(row.date, "%Y-%m-%d"),
         )
         db.add(tx)
-        account.balance = float(account.balance) + amount
-
+        total += amount
+        dates.append(tx.date)
+
+    # One SQL-side increment for the whole import
+    db.execute(
+        update(Account)
+        .where(Account.id == account.id)
+        .values(balance=Account.balance + total)
+        .execution_options(synchronize_session=False)
+    )
+    ledger.mark(db, [(account.id, when) for when in dates])
+    bump_data_version(db, current_user.id)
     db.commit()
+    cache.invalidate(current_user.id, "accounts")
+    events.publish(
+        current_user.id, "transactions", account_id=account.id, count=len(dates)
+    )
+    events.publish(current_user.id, "balance", account_id=account.id)
+    metrics.IMPORT_DURATION.observe(time.perf_counter() - started, stage="confirm")
+    metrics.IMPORT_ROWS.inc(len(payload.rows), stage="confirm")
     return ImportConfirmResponse(imported=len(payload.rows))
@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.recurring import RecurringRead
+from app.services import recurring
+from app.services.auth import get_current_user
+
+router = APIRouter(prefix="/recurring", tags=["recurring"])
+
+
+@router.get("", response_model=list[RecurringRead])
+def list_recurring(
+    include_inactive: bool = Query(
+        False, description="Also list series that have stopped"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Subscriptions and recurring bills/income, soonest next payment first."""
+    result = []
+    for s in recurring.recurring_series(
+        db, current_user.id, include_inactive=include_inactive
+    ):
+        average = s.amount_total / s.occurrences
+        result.append(
+            RecurringRead(
+                payee=s.payee,
+                description=s.description,
+                transaction_type=s.transaction_type,
+                period=s.period,
+                occurrences=s.occurrences,
+                average_amount=average.quantize(Decimal("0.01")),
+                first_date=s.first_date,
+                last_date=s.last_date,
+                next_date=recurring.next_date(s),
+                next_amount=s.last_amount,
+            )
+        )
+    return result
@@ -0,0 +1,83 @@
+from datetime import date, datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.db.session import get_db
+from app.models.account import Account
+from app.models.transaction import Category
+from app.models.user import User
+from app.schemas.account import AccountRead
+from app.schemas.report import ReportsRead
+from app.schemas.transaction import CategoryRead
+from app.services import analytics, fx
+from app.services.admission import report_rate
+from app.services.auth import get_current_user
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+MAX_PERIOD_DAYS = 3 * 366
+
+
+@router.get("", response_model=ReportsRead, dependencies=[Depends(report_rate.by_user)])
+def get_reports(
+    start_date: date | None = Query(None, description="Default: 12 months back"),
+    end_date: date | None = Query(None, description="Default: today"),
+    account_id: int | None = Query(None),
+    window: int = Query(7, ge=1, le=90, description="Rolling average, in days"),
+    currency: str | None = Query(
+        None, min_length=3, max_length=3, description="Convert amounts to"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Totals, monthly figures, category trends and rolling spend at once."""
+    end = end_date or datetime.now(timezone.utc).date()
+    if start_date is None:
+        # First day of the month eleven months back: twelve calendar months
+        first = end.year * 12 + end.month - 1 - 11
+        start_date = date(first // 12, first % 12 + 1, 1)
+    start = start_date
+    if end < start:
+        raise HTTPException(status_code=422, detail="end_date is before start_date")
+    if (end - start).days > MAX_PERIOD_DAYS:
+        raise HTTPException(status_code=422, detail="Period too long (max 3 years)")
+
+    target = currency.upper() if currency else None
+    accounts = []
+    if account_id is not None or target is not None:
+        accounts = cache.read_through(
+            cache.user_key("accounts", current_user.id),
+            lambda: cache.dump(
+                AccountRead,
+                db.query(Account).filter(Account.owner_id == current_user.id).all(),
+            ),
+        )
+    if account_id is not None and account_id not in {a["id"] for a in accounts}:
+        raise HTTPException(status_code=403, detail="Not your account")
+
+    frame = analytics.load_frame(
+        db, current_user.id, current_user.data_version, start, end, account_id
+    )
+    currency_of = {a["id"]: a["currency"] for a in accounts}
+    if fx.needs_conversion(
+        {currency_of.get(int(a), target) for a in frame.account_ids}, target
+    ):
+        frame = fx.convert_frame(db, frame, currency_of, target)
+    report = analytics.compute_reports(frame, start, end, window)
+    report["currency"] = target
+
+    names = {
+        c["id"]: c["name"]
+        for c in cache.read_through(
+            cache.user_key("categories", current_user.id),
+            lambda: cache.dump(
+                CategoryRead,
+                db.query(Category).filter(Category.owner_id == current_user.id).all(),
+            ),
+        )
+    }
+    for row in report["categories"]:
+        row["category_name"] = names.get(row["category_id"], "?")
+    return report
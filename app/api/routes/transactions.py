@@ -1,14 +1,21 @@
-from datetime import datetime
+import heapq
+from datetime import datetime, timezone
 from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
+from app.core import cache, events
+from app.db import partitions
 from app.db.session import get_db
+from app.db.types import epoch_day
+from app.db.writes import insert_returning, update_returning
 from app.models.account import Account
 from app.models.transaction import Category, Transaction
 from app.models.user import User
+from app.schemas.fields import columns, fields_param, partial
 from app.schemas.transaction import (
     CategoryCreate,
     CategoryRead,
@@ -17,7 +24,11 @@ from app.schemas.transaction import (
     TransactionRead,
     TransactionUpdate,
 )
+from app.services import archive, fx, ledger, recurring
+from app.services.admission import report_rate
 from app.services.auth import get_current_user
+from app.services.budgets import crossed_thresholds
+from app.services.versions import bump_data_version
 
 router = APIRouter(tags=["transactions"])
 
@@ -30,7 +41,13 @@ def list_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return db.query(Category).filter(Category.owner_id == current_user.id).all()
+    return cache.read_through(
+        cache.user_key("categories", current_user.id),
+        lambda: cache.dump(
+            CategoryRead,
+            db.query(Category).filter(Category.owner_id == current_user.id).all(),
+        ),
+    )
 
 
 @router.post("/categories", response_model=CategoryRead, status_code=201)
@@ -39,10 +56,12 @@ def create_category(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    cat = Category(**payload.model_dump(), owner_id=current_user.id)
-    db.add(cat)
+    cat = insert_returning(
+        db, Category, {**payload.model_dump(), "owner_id": current_user.id}
+    )
+    bump_data_version(db, current_user.id)
     db.commit()
-    db.refresh(cat)
+    cache.invalidate(current_user.id, "categories")
     return cat
 
 
@@ -54,32 +73,103 @@ def _owned_account_ids(user: User, db: Session) -> list[int]:
     return [r[0] for r in rows]
 
 
+def _publish_added(db: Session, user_id: int, tx: Transaction) -> None:
+    """Tell the user's open event streams about a new transaction."""
+    events.publish(user_id, "transactions", account_id=tx.account_id, count=1)
+    events.publish(user_id, "balance", account_id=tx.account_id)
+    # Budget alerts cost two queries: only when someone is listening
+    if tx.category_id is None or tx.transaction_type != "expense":
+        return
+    if not events.hub.has_subscribers(user_id):
+        return
+    for budget, share in crossed_thresholds(
+        db, user_id, tx.category_id, tx.date, tx.amount
+    ):
+        events.publish(
+            user_id,
+            "budget",
+            budget_id=budget.id,
+            category_id=budget.category_id,
+            threshold=share,
+        )
+
+
+def _adjust_balance(db: Session, account_id: int, delta: Decimal) -> None:
+    """SQL-side increment: no SELECT of the account, no lost updates."""
+    db.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(balance=Account.balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
 @router.get("/transactions", response_model=list[TransactionRead])
 def list_transactions(
     account_id: int | None = Query(None),
+    category_id: int | None = Query(None),
     transaction_type: str | None = Query(None),
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
     limit: int = Query(50, le=500),
     offset: int = Query(0),
+    fields: tuple[str, ...] | None = Depends(fields_param(TransactionRead)),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     owned = _owned_account_ids(current_user, db)
-    q = db.query(Transaction).filter(Transaction.account_id.in_(owned))
+    Tx = partitions.transactions(db, start_date, end_date)
+    q = db.query(*columns(Tx, fields)) if fields else db.query(Tx)
+    q = q.filter(Tx.account_id.in_(owned))
 
     if account_id:
         if account_id not in owned:
             raise HTTPException(status_code=403, detail="Not your account")
-        q = q.filter(Transaction.account_id == account_id)
+        q = q.filter(Tx.account_id == account_id)
+    if category_id:
+        q = q.filter(Tx.category_id == category_id)
     if transaction_type:
-        q = q.filter(Transaction.transaction_type == transaction_type)
+        q = q.filter(Tx.transaction_type == transaction_type)
     if start_date:
-        q = q.filter(Transaction.date >= start_date)
+        q = q.filter(Tx.date >= start_date)
     if end_date:
-        q = q.filter(Transaction.date <= end_date)
-
-    return q.order_by(Transaction.date.desc()).offset(offset).limit(limit).all()
+        q = q.filter(Tx.date <= end_date)
+    q = q.order_by(Tx.date.desc())
+
+    cold = archive.latest(
+        db,
+        current_user.id,
+        archive.ArchiveFilter(
+            [account_id] if account_id else owned,
+            transaction_type,
+            start_date,
+            end_date,
+            category_id,
+        ),
+        limit=offset + limit,
+    )
+    if not cold:
+        rows = q.offset(offset).limit(limit).all()
+    else:
+        # Both sides are sorted newest first: merge the top offset+limit of each
+        if fields and "date" not in fields:
+            q = q.add_columns(Tx.date)
+        hot = q.limit(offset + limit).all()
+        # Archived times are naive UTC; timestamptz (PostgreSQL) reads aware
+        if hot and hot[0].date.tzinfo is not None:
+            for row in cold:
+                for name in ("date", "created_at"):
+                    row[name] = row[name].replace(tzinfo=timezone.utc)
+        merged = heapq.merge(
+            hot,
+            cold,
+            key=lambda r: r["date"] if isinstance(r, dict) else r.date,
+            reverse=True,
+        )
+        rows = list(merged)[offset : offset + limit]
+    if fields:
+        return JSONResponse(cache.dump(partial(TransactionRead, fields), rows))
+    return rows
 
 
 @router.post("/transactions", response_model=TransactionRead, status_code=201)
@@ -92,52 +182,70 @@ def create_transaction(
     if payload.account_id not in owned:
         raise HTTPException(status_code=403, detail="Not your account")
 
-    tx = Transaction(**payload.model_dump())
-    db.add(tx)
-
+    # Unset fields are left out so column defaults (date: now) apply
+    tx = insert_returning(db, Transaction, payload.model_dump(exclude_none=True))
     # Update account balance atomically in the same transaction
-    account = db.get(Account, payload.account_id)
-    account.balance = float(account.balance) + float(payload.amount)
+    _adjust_balance(db, payload.account_id, payload.amount)
+    ledger.mark(db, [(tx.account_id, tx.date)])
 
+    bump_data_version(db, current_user.id)
     db.commit()
-    db.refresh(tx)
+    cache.invalidate(current_user.id, "accounts")
+    _publish_added(db, current_user.id, tx)
     return tx
 
 
-@router.get("/transactions/summary", response_model=SummaryRead)
+@router.get(
+    "/transactions/summary",
+    response_model=SummaryRead,
+    dependencies=[Depends(report_rate.by_user)],
+)
 def get_summary(
     account_id: int | None = Query(None),
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
+    currency: str | None = Query(None, min_length=3, max_length=3),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     owned = _owned_account_ids(current_user, db)
-    q = db.query(Transaction).filter(Transaction.account_id.in_(owned))
+    Tx = partitions.transactions(db, start_date, end_date)
+    q = db.query(Tx).filter(Tx.account_id.in_(owned))
 
     if account_id:
         if account_id not in owned:
             raise HTTPException(status_code=403, detail="Not your account")
-        q = q.filter(Transaction.account_id == account_id)
+        q = q.filter(Tx.account_id == account_id)
     if start_date:
-        q = q.filter(Transaction.date >= start_date)
+        q = q.filter(Tx.date >= start_date)
     if end_date:
-        q = q.filter(Transaction.date <= end_date)
+        q = q.filter(Tx.date <= end_date)
 
-    income = (
-        q.filter(Transaction.transaction_type == "income")
-        .with_entities(func.coalesce(func.sum(Transaction.amount), 0))
-        .scalar()
+    cold = archive.ArchiveFilter(
+        [account_id] if account_id else owned, None, start_date, end_date
     )
-
-    expenses = (
-        q.filter(Transaction.transaction_type == "expense")
-        .with_entities(func.coalesce(func.sum(Transaction.amount), 0))
-        .scalar()
+    target = currency.upper() if currency else None
+    currency_of = dict(
+        db.query(Account.id, Account.currency).filter(Account.id.in_(cold.account_ids))
     )
-
-    income = Decimal(str(income))
-    expenses = Decimal(str(expenses))  # stored as negative
+    if fx.needs_conversion(currency_of.values(), target):
+        income, expenses = _converted_totals(
+            db, q, Tx, cold, current_user.id, currency_of, target
+        )
+    else:
+        income = (
+            q.filter(Tx.transaction_type == "income")
+            .with_entities(func.coalesce(func.sum(Tx.amount), 0))
+            .scalar()
+        )
+        expenses = (
+            q.filter(Tx.transaction_type == "expense")
+            .with_entities(func.coalesce(func.sum(Tx.amount), 0))
+            .scalar()
+        )
+        cold_income, cold_expenses = archive.totals(db, current_user.id, cold)
+        income += cold_income
+        expenses += cold_expenses  # stored as negative
 
     return SummaryRead(
         total_income=income,
@@ -145,7 +253,52 @@ def get_summary(
         net=income + expenses,
         period_start=start_date,
         period_end=end_date,
+        currency=target,
+    )
+
+
+def _converted_totals(
+    db: Session,
+    q,
+    Tx,
+    cold: archive.ArchiveFilter,
+    user_id: int,
+    currency_of: dict[int, str],
+    target: str,
+) -> tuple[Decimal, Decimal]:
+    """(income, expenses) in `target`, from per (type, currency, day) sums."""
+    import numpy as np
+
+    rows = (
+        q.join(Account, Account.id == Tx.account_id)
+        .with_entities(
+            Tx.transaction_type,
+            Account.currency,
+            epoch_day(Tx.date),
+            func.sum(Tx.amount),
+        )
+        .group_by(Tx.transaction_type, Account.currency, epoch_day(Tx.date))
+        .all()
     )
+    kinds, currencies, days, amounts = fx.columns(rows)
+
+    archived = archive.matching_columns(db, user_id, cold)
+    kinds = np.concatenate(
+        [kinds, np.where(archived["income"], "income", "expense").astype(object)]
+    )
+    currencies = np.concatenate(
+        [
+            currencies,
+            np.array(
+                [currency_of[int(a)] for a in archived["account_id"]], dtype=object
+            ),
+        ]
+    )
+    days = np.concatenate([days, archived["day"]])
+    amounts = np.concatenate([amounts, archived["cents"] / 100])
+
+    sums = fx.sum_converted(db, kinds, currencies, days, amounts, target)
+    return sums.get("income", Decimal("0.00")), sums.get("expense", Decimal("0.00"))
 
 
 @router.get("/transactions/{tx_id}", response_model=TransactionRead)
@@ -155,12 +308,28 @@ def get_transaction(
     current_user: User = Depends(get_current_user),
 ):
     owned = _owned_account_ids(current_user, db)
-    tx = db.get(Transaction, tx_id)
-    if not tx or tx.account_id not in owned:
+    Tx = partitions.transactions(db)
+    tx = db.query(Tx).filter(Tx.id == tx_id, Tx.account_id.in_(owned)).first()
+    if not tx:
+        tx = archive.find(db, current_user.id, tx_id, owned)
+    if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return tx
 
 
+def _get_hot_or_404(tx_id: int, owned: list[int], user: User, db: Session):
+    tx = db.get(Transaction, tx_id)
+    if not tx and partitions.promote(db, tx_id, owned):
+        tx = db.get(Transaction, tx_id)
+    if tx and tx.account_id in owned:
+        return tx
+    if archive.find(db, user.id, tx_id, owned):
+        raise HTTPException(
+            status_code=409, detail="Archived transactions are read-only"
+        )
+    raise HTTPException(status_code=404, detail="Transaction not found")
+
+
 @router.patch("/transactions/{tx_id}", response_model=TransactionRead)
 def update_transaction(
     tx_id: int,
@@ -169,14 +338,21 @@ def update_transaction(
     current_user: User = Depends(get_current_user),
 ):
     owned = _owned_account_ids(current_user, db)
-    tx = db.get(Transaction, tx_id)
-    if not tx or tx.account_id not in owned:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-
-    for field, value in payload.model_dump(exclude_none=True).items():
-        setattr(tx, field, value)
+    tx = _get_hot_or_404(tx_id, owned, current_user, db)
+    before = (tx.account_id, tx.date)
+
+    tx = update_returning(
+        db,
+        Transaction,
+        payload.model_dump(exclude_none=True),
+        Transaction.id == tx.id,
+    )
+    if payload.date is not None:
+        ledger.mark(db, [before, (tx.account_id, tx.date)])
+    # Date or description may move it to another series
+    recurring.reset(db, current_user.id)
+    bump_data_version(db, current_user.id)
     db.commit()
-    db.refresh(tx)
     return tx
 
 
@@ -187,13 +363,15 @@ def delete_transaction(
     current_user: User = Depends(get_current_user),
 ):
     owned = _owned_account_ids(current_user, db)
-    tx = db.get(Transaction, tx_id)
-    if not tx or tx.account_id not in owned:
-        raise HTTPException(status_code=404, detail="Transaction not found")
+    tx = _get_hot_or_404(tx_id, owned, current_user, db)
 
     # Reverse the balance effect before deleting
-    account = db.get(Account, tx.account_id)
-    account.balance = float(account.balance) - float(tx.amount)
+    _adjust_balance(db, tx.account_id, -tx.amount)
+    ledger.mark(db, [(tx.account_id, tx.date)])
 
     db.delete(tx)
+    recurring.reset(db, current_user.id)
+    bump_data_version(db, current_user.id)
     db.commit()
+    cache.invalidate(current_user.id, "accounts")
+    events.publish(current_user.id, "balance", account_id=tx.account_id)
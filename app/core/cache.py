@@ -0,0 +1,159 @@
+"""
+Read-through cache for per-user reference data.
+
+Accounts, categories and budgets are listed on nearly every page load but
+change rarely.  List routes read them through `read_through()`, and every
+route that changes one of them calls `invalidate()` after committing.
+
+CACHE_BACKEND selects the store:
+
+* "memory" (default) — an in-process LRU with TTL.  Invalidation only
+  reaches the current process, so use it for single-worker deployments.
+* "redis" — any Redis-compatible server at CACHE_URL, shared by all workers.
+  Needs the optional `redis` package.
+* "none" — caching disabled.
+
+Values are stored as JSON-compatible data (the route's response schema
+dumped in JSON mode), so every backend returns the same thing.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+
+from app.core import metrics
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCache:
+    """Thread-safe LRU; entries also expire `ttl` seconds after being set."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Shared cache on a Redis-compatible server; eviction is the server's job."""
+
+    def __init__(self, url: str, prefix: str = "ft:"):
+        try:
+            import redis
+        except ImportError as exc:  # optional dependency
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package"
+            ) from exc
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any | None:
+        raw = self._client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._client.delete(*(self.prefix + k for k in keys))
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+class NullCache:
+    def get(self, key: str) -> Any | None:
+        return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+def create_cache(backend: str) -> CacheBackend:
+    if backend == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        return RedisCache(settings.CACHE_URL)
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"unknown CACHE_BACKEND {backend!r}")
+
+
+cache: CacheBackend = create_cache(settings.CACHE_BACKEND)
+
+
+def user_key(entity: str, user_id: int) -> str:
+    return f"{entity}:{user_id}"
+
+
+def dump(schema: type[BaseModel], rows: Iterable) -> list[dict]:
+    """ORM rows → JSON-compatible dicts via the route's response schema."""
+    return [schema.model_validate(row).model_dump(mode="json") for row in rows]
+
+
+def read_through(key: str, load: Callable[[], Any]) -> Any:
+    entity = key.split(":", 1)[0]
+    value = cache.get(key)
+    if value is not None:
+        metrics.CACHE_REQUESTS.inc(entity=entity, result="hit")
+        return value
+    metrics.CACHE_REQUESTS.inc(entity=entity, result="miss")
+    value = load()
+    cache.set(key, value, settings.CACHE_TTL_SECONDS)
+    return value
+
+
+def invalidate(user_id: int, *entities: str) -> None:
+    cache.delete(*(user_key(entity, user_id) for entity in entities))
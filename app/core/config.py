@@ -10,9 +10,106 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me-in-production-use-openssl-rand-hex-32"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Refresh tokens rotate on use; each new one is valid this long again
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
     # Database
     DATABASE_URL: str = "sqlite:///./finance.db"
+    # Sharding — {"name": "url", ...}; users stay in DATABASE_URL, each user's
+    # data lives on one shard (`python -m scripts.shards` migrates/rebalances)
+    SHARDS: dict[str, str] = {}
+    # Open WARMUP_CONNECTIONS and prime hot queries before serving traffic
+    WARMUP_ON_STARTUP: bool = False
+    WARMUP_CONNECTIONS: int = 4
+
+    # Read-through cache for accounts/categories/budgets lists:
+    # "memory" (per process), "redis" (shared, needs `redis`) or "none"
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: float = 300.0
+    CACHE_MAX_ENTRIES: int = 10_000
+
+    # Analytics — per-process LRU of loaded transaction frames (see /reports)
+    ANALYTICS_FRAME_CACHE_SIZE: int = 32
+
+    # Currency conversion — rates are units per FX_BASE_CURRENCY, loaded with
+    # `python -m scripts.import_fx_rates`; cached in memory for the TTL
+    FX_BASE_CURRENCY: str = "EUR"
+    FX_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Archive — `python -m scripts.archive_transactions` moves transactions
+    # older than ARCHIVE_AFTER_MONTHS into per-user files under ARCHIVE_DIR
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_AFTER_MONTHS: int = 24
+
+    # Partitioning — on SQLite, keep closed years of transactions in
+    # transactions_<year> tables (`python -m scripts.partitions` rolls them)
+    TRANSACTION_PARTITIONING: bool = False
+
+    # Maintenance — in-process scheduler for ANALYZE/PRAGMA optimize, WAL
+    # checkpoints, incremental vacuum, expired-data cleanup and the ledger
+    # reconciliation.  A lease row per task lets one worker run it; tasks
+    # wait until no request has used the database for
+    # MAINTENANCE_QUIET_SECONDS.  Interval 0 disables a task.
+    MAINTENANCE_ENABLED: bool = False
+    MAINTENANCE_TICK_SECONDS: float = 60.0
+    MAINTENANCE_QUIET_SECONDS: float = 30.0
+    MAINTENANCE_LEASE_SECONDS: float = 900.0
+    MAINTENANCE_INTERVALS: dict[str, float] = {
+        "optimize": 6 * 3600.0,
+        "wal_checkpoint": 300.0,
+        "incremental_vacuum": 3600.0,
+        "cleanup": 3600.0,
+        "reconcile": 24 * 3600.0,
+        "expire_tokens": 3600.0,
+    }
+    # Pages freed per incremental-vacuum step; writers get the lock in between
+    MAINTENANCE_VACUUM_PAGES: int = 256
+    MAINTENANCE_PROFILE_RETENTION_DAYS: float = 14.0
+
+    # Observability — Prometheus text format on GET /metrics
+    METRICS_ENABLED: bool = True
+    # Slow-query log and N+1 detector (logger "app.sql"); off by default
+    SQL_INSTRUMENTATION: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # On-demand profiling: requests with `X-Profile: <PROFILING_TOKEN>` (or a
+    # random PROFILING_SAMPLE_RATE share) write a flamegraph to PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_TRACEMALLOC: bool = False
+    PROFILING_DIR: str = "profiles"
+
+    # Admission control — token buckets per user (per client address for
+    # login/register, plus per login name for login) and bounded concurrency
+    # for the CPU-heavy routes.
+    # Excess requests get 429/503 with Retry-After; 0 disables a limit.
+    ADMISSION_ENABLED: bool = True
+    RATE_LIMIT_AUTH_PER_MINUTE: float = 10
+    RATE_LIMIT_AUTH_BURST: int = 5
+    RATE_LIMIT_LOGIN_NAME_PER_MINUTE: float = 10
+    RATE_LIMIT_LOGIN_NAME_BURST: int = 5
+    RATE_LIMIT_IMPORT_PER_MINUTE: float = 20
+    RATE_LIMIT_IMPORT_BURST: int = 5
+    RATE_LIMIT_REPORT_PER_MINUTE: float = 120
+    RATE_LIMIT_REPORT_BURST: int = 30
+    AUTH_CONCURRENCY: int = 4
+    IMPORT_CONCURRENCY: int = 2
+    ADMISSION_QUEUE_SIZE: int = 8
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+
+    # Live events (GET /events) — per-stream queue bound, idle seconds between
+    # heartbeats, and budget shares whose crossing sends a `budget` event
+    EVENTS_QUEUE_SIZE: int = 64
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    BUDGET_ALERT_THRESHOLDS: list[float] = [0.8, 1.0]
+
+    # HTTP — responses smaller than this many bytes are sent uncompressed
+    GZIP_MINIMUM_SIZE: int = 1024
+    # Frontend — the hashed build in <STATIC_DIR>/dist is served when present
+    STATIC_DIR: str = "app/static"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,153 @@
+"""
+In-process pub/sub for live change notifications (GET /events).
+
+Routes call `publish(user_id, type, **data)` after committing; every open
+event stream of that user receives the event.  Events are small — ids and
+counts, not rows — and tell the frontend what to re-fetch:
+
+* `transactions` — transactions were added to an account (`count` of them)
+* `balance` — an account's balance changed
+* `budget` — a budget changed, or its spending crossed a threshold
+  (BUDGET_ALERT_THRESHOLDS) with `threshold` set
+* `resync` — events were dropped; re-fetch everything
+
+Each stream is a coroutine waiting on its own bounded asyncio queue, so an
+idle subscriber costs a queue and a sleeping task — no thread, no database
+connection.  `publish()` is safe to call from the worker threads sync
+routes run on; it is a dict lookup when the user has no open stream.  A
+subscriber that falls EVENTS_QUEUE_SIZE events behind has its queue
+replaced by a single `resync`.
+
+Like CACHE_BACKEND=memory, the hub only reaches streams served by the same
+process: with several workers, route a user's requests to one worker or
+expect the other workers' changes only on the next `resync`/page load.
+
+GZip would buffer frames until enough bytes pile up, so the stream is
+exempted from compression by path (`EventStreamGZipMiddleware`) rather than
+relying on the Starlette release skipping text/event-stream.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+from app.core import metrics
+
+PATH = "/events"
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        data = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize)
+
+    def offer(self, event: Event) -> None:
+        """Queue `event`; runs on the subscriber's loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(Event(event.id, "resync", {}))
+            metrics.EVENTS_DROPPED.inc()
+
+
+class Hub:
+    def __init__(self):
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, user_id: int, maxsize: int) -> Subscription:
+        """Open a subscription; must be called on the event loop."""
+        sub = Subscription(user_id, maxsize)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(sub)
+        metrics.EVENTS_SUBSCRIBERS.inc()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs is not None and sub in subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+                metrics.EVENTS_SUBSCRIBERS.dec()
+
+    def has_subscribers(self, user_id: int) -> bool:
+        return user_id in self._subscribers
+
+    def publish(self, user_id: int, type: str, **data) -> None:
+        """Send an event to the user's open streams; callable from any thread."""
+        if user_id not in self._subscribers:
+            return
+        with self._lock:
+            subs = list(self._subscribers.get(user_id, ()))
+        event = Event(next(self._ids), type, data)
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(sub)
+        metrics.EVENTS_PUBLISHED.inc(len(subs), type=type)
+
+    async def stream(
+        self, user_id: int, maxsize: int, heartbeat: float
+    ) -> AsyncIterator[bytes]:
+        """
+        Encoded events for the user, with a comment line after `heartbeat`
+        idle seconds.  Subscribed from the first iteration until closed.
+        """
+        sub = self.subscribe(user_id, maxsize)
+        try:
+            # Sent at once so clients (and proxies) see the stream is open
+            yield b"retry: 5000\n: connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), heartbeat)
+                except TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            self.unsubscribe(sub)
+
+    def clear(self) -> None:
+        with self._lock:
+            count = sum(len(subs) for subs in self._subscribers.values())
+            self._subscribers.clear()
+        metrics.EVENTS_SUBSCRIBERS.dec(count)
+
+
+hub = Hub()
+publish = hub.publish
+
+
+class EventStreamGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the event stream through uncompressed."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] == PATH:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,360 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Deliberately dependency-free: a metric is a dict of label tuples guarded by
+a lock, so recording costs a dict lookup and an addition.  Everything that
+needs measuring in the app goes through the module-level metrics below.
+
+Per-request database accounting works through a ContextVar: the middleware
+installs a fresh RequestStats for every request and the SQLAlchemy cursor
+hooks add to whichever one is current.  Sync endpoints run in a worker
+thread, but Starlette copies the context into it, so they see the same object.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # label key -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        names = (*self.labelnames, "le")
+        for key, counts in items:
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = _format_labels(names, (*key, str(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {counts[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before rendering."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            collect()
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── HTTP ────────────────────────────────────────────────────────────────────
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requests served", ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency", ("method", "route")
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served")
+APP_WARMUP = Gauge("app_warmup_seconds", "Duration of the start-up warm-up")
+
+# ── Database ────────────────────────────────────────────────────────────────
+
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed")
+DB_TIME = Counter("db_time_seconds_total", "Time spent executing SQL statements")
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed per request",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per request", ("route",)
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Pool connection checkouts")
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection"
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size")
+
+# ── Imports ─────────────────────────────────────────────────────────────────
+
+IMPORT_ROWS = Counter("import_rows_total", "Statement rows processed", ("stage",))
+IMPORT_BYTES = Counter("import_bytes_total", "Statement bytes uploaded")
+IMPORT_DURATION = Histogram(
+    "import_duration_seconds", "Time spent parsing or storing imports", ("stage",)
+)
+
+# ── Cache ───────────────────────────────────────────────────────────────────
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Reference-data cache lookups", ("entity", "result")
+)
+
+# ── Maintenance ─────────────────────────────────────────────────────────────
+
+MAINTENANCE_DURATION = Histogram(
+    "maintenance_task_seconds", "Duration of maintenance tasks", ("task", "database")
+)
+MAINTENANCE_RUNS = Counter(
+    "maintenance_runs_total", "Maintenance task runs", ("task", "outcome")
+)
+
+# ── Events ──────────────────────────────────────────────────────────────────
+
+EVENTS_SUBSCRIBERS = Gauge("events_subscribers", "Open GET /events streams")
+EVENTS_PUBLISHED = Counter(
+    "events_published_total", "Events delivered to streams", ("type",)
+)
+EVENTS_DROPPED = Counter(
+    "events_overflows_total", "Streams whose queue overflowed into a resync"
+)
+
+# ── Admission control ───────────────────────────────────────────────────────
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests rejected by admission control",
+    ("group", "reason"),
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Requests waiting for a concurrency slot", ("group",)
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Requests holding a concurrency slot", ("group",)
+)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_time: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+# ── SQLAlchemy hooks ────────────────────────────────────────────────────────
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_STATEMENTS.inc()
+    DB_TIME.inc(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += elapsed
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+_hooks_installed = False
+
+
+def install_sqlalchemy_hooks() -> None:
+    """Attach the statement and pool listeners to every Engine and Pool."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Pool, "checkout", _on_checkout)
+    event.listen(Pool, "checkin", _on_checkin)
+    _hooks_installed = True
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout blocked."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def watch_pool(*pools: Pool) -> None:
+    """Report size/overflow summed over `pools` on every scrape (QueuePool only)."""
+    pools = [p for p in pools if isinstance(p, QueuePool)]
+    if not pools:
+        return
+
+    def collect():
+        DB_POOL_SIZE.set(sum(p.size() for p in pools))
+        DB_POOL_OVERFLOW.set(sum(max(p.overflow(), 0) for p in pools))
+
+    REGISTRY.add_collector(collect)
+
+
+# ── ASGI middleware ─────────────────────────────────────────────────────────
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, so /accounts/7 reports as one series."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    if isinstance(route, Mount):
+        return route.path + "/{path}"
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Records latency, status and SQL accounting for every HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+
+            method, route = scope["method"], route_template(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            if stats.statements:
+                DB_STATEMENTS_PER_REQUEST.observe(stats.statements, route=route)
+                DB_TIME_PER_REQUEST.observe(stats.db_time, route=route)
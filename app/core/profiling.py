@@ -0,0 +1,151 @@
+"""
+On-demand request profiling for production.
+
+With PROFILING_ENABLED=true, a request is profiled when it carries
+`X-Profile: <PROFILING_TOKEN>` or is picked by PROFILING_SAMPLE_RATE.  A
+sampling profiler snapshots every thread's stack each PROFILING_INTERVAL_MS
+and writes the result in the collapsed ("folded") stack format, which
+flamegraph.pl, speedscope and inferno read directly.  Import requests can
+also record a tracemalloc snapshot (`X-Profile-Memory: 1` or
+PROFILING_TRACEMALLOC=true).
+
+When PROFILING_ENABLED is false the middleware is not installed at all.
+"""
+
+import hmac
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Leaf frames of threads that are parked, not doing work for anyone
+_IDLE_FILES = ("threading.py", "queue.py")
+
+
+class StackSampler:
+    """Samples the stacks of all other threads on a background thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def _slug(method: str, path: str) -> str:
+    return method + re.sub(r"[^A-Za-z0-9]+", "-", path).rstrip("-")
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        token: str = "",
+        sample_rate: float = 0.0,
+        interval_ms: float = 5.0,
+        trace_memory: bool = False,
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.trace_memory = trace_memory
+        # One profile at a time: the sampler sees every thread, so
+        # overlapping profiles would attribute each other's work.
+        self._busy = threading.Lock()
+
+    def _requested(self, headers: Headers) -> bool:
+        supplied = headers.get("x-profile")
+        if supplied is not None and self.token:
+            return hmac.compare_digest(supplied, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not self._requested(headers) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = "-".join(
+            (
+                time.strftime("%Y%m%dT%H%M%S"),
+                _slug(scope["method"], scope["path"]),
+                secrets.token_hex(3),
+            )
+        )
+        trace_memory = scope["path"].startswith("/import") and (
+            self.trace_memory or headers.get("x-profile-memory") == "1"
+        )
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-File"] = name
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(25)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            sampler.stop()
+            snapshot = tracemalloc.take_snapshot() if trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+            self._busy.release()
+            await anyio.to_thread.run_sync(self._write, name, sampler, snapshot)
+
+    def _write(self, name: str, sampler: StackSampler, snapshot) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{name}.folded").write_text(sampler.folded())
+        if snapshot is not None:
+            snapshot.dump(str(self.directory / f"{name}.tracemalloc"))
+            top = snapshot.statistics("lineno")[:50]
+            (self.directory / f"{name}.tracemalloc.txt").write_text(
+                "\n".join(str(stat) for stat in top) + "\n"
+            )
@@ -0,0 +1,203 @@
+"""
+Opt-in SQL instrumentation: slow-query log and N+1 detection.
+
+With SQL_INSTRUMENTATION=true every statement slower than SLOW_QUERY_MS is
+logged to the "app.sql" logger together with its parameters and query plan,
+and any request that runs the same normalized statement more than
+N_PLUS_ONE_THRESHOLD times is reported as a suspected N+1.
+
+QueryRecorder exposes the same detection to tests, independent of settings:
+
+    with QueryRecorder() as queries:
+        client.get("/budgets/status")
+    queries.assert_no_n_plus_one(threshold=3)
+    queries.assert_no_full_scans(engine)
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(\?|%s|\$\d+)(?:\s*,\s*(\?|%s|\$\d+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+# Plan lines that read a whole table: SQLite's "SCAN t" without an index
+# (t may be a subquery, named by an earlier CO-ROUTINE/MATERIALIZE line),
+# PostgreSQL's "Seq Scan on t"
+_FULL_SCAN = re.compile(r"\bSCAN (\w+)\b(?! USING)|\bSeq Scan on (\w+)")
+_SUBQUERY = re.compile(r"\b(?:CO-ROUTINE|MATERIALIZE) (\w+)")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape so repeated executions compare equal.
+
+    Literals become `?` and expanded IN lists collapse to a single
+    placeholder — `IN (?, ?, ?)` and `IN (?)` are the same query.
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def explain(conn, statement: str, parameters) -> list[str]:
+    """Query plan for a SELECT, read through a raw cursor to skip the hooks."""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return []
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" ".join(str(col) for col in row) for row in cursor.fetchall()]
+    except Exception as exc:  # the plan is diagnostic only — never fail the query
+        return [f"(EXPLAIN failed: {exc})"]
+    finally:
+        cursor.close()
+
+
+# ── Request-scoped detection (SQL_INSTRUMENTATION) ──────────────────────────
+
+_request_statements: ContextVar[Counter | None] = ContextVar(
+    "request_statements", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_log_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed_ms = (time.perf_counter() - conn.info["query_log_start"].pop()) * 1000
+
+    seen = _request_statements.get()
+    if seen is not None:
+        seen[normalize_statement(statement)] += 1
+
+    if elapsed_ms >= settings.SLOW_QUERY_MS:
+        plan = [] if many else explain(conn, statement, parameters)
+        logger.warning(
+            "slow query (%.1f ms): %s\n  parameters: %r%s",
+            elapsed_ms,
+            statement,
+            parameters,
+            "".join(f"\n  plan: {line}" for line in plan),
+        )
+
+
+_hooks_installed = False
+
+
+def install_sqlalchemy_hooks() -> None:
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _hooks_installed = True
+
+
+class QueryLogMiddleware:
+    """Reports requests that repeat one statement more than the threshold."""
+
+    def __init__(self, app: ASGIApp, threshold: int | None = None):
+        self.app = app
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seen: Counter = Counter()
+        token = _request_statements.set(seen)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_statements.reset(token)
+            for statement, count in seen.items():
+                if count > self.threshold:
+                    logger.warning(
+                        "possible N+1 in %s %s: %d× %s",
+                        scope["method"],
+                        scope["path"],
+                        count,
+                        statement,
+                    )
+
+
+# ── Test helper ─────────────────────────────────────────────────────────────
+
+
+class QueryRecorder:
+    """
+    Record every statement executed on any engine while the block runs.
+
+    Listens globally rather than per request, so it also sees statements
+    issued from TestClient's worker threads.
+    """
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.executions: list[tuple[str, object]] = []  # single executions only
+
+    def _record(self, conn, cursor, statement, parameters, context, many):
+        self.statements.append(statement)
+        if not many:
+            self.executions.append((statement, parameters))
+
+    def __enter__(self) -> "QueryRecorder":
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Normalized statements executed more than `threshold` times."""
+        counts = Counter(normalize_statement(s) for s in self.statements)
+        return {sql: n for sql, n in counts.items() if n > threshold}
+
+    def assert_no_n_plus_one(self, threshold: int = 3) -> None:
+        repeated = self.repeated(threshold)
+        assert not repeated, "N+1 query pattern detected:\n" + "\n".join(
+            f"  {n}× {sql}" for sql, n in repeated.items()
+        )
+
+    def full_scans(self, engine: Engine, allow: frozenset = frozenset()) -> dict:
+        """
+        {statement: plan} for recorded SELECTs whose plan reads a whole
+        table other than those in `allow`, re-planned on `engine`.
+        """
+        found = {}
+        with engine.connect() as conn:
+            for statement, parameters in self.executions:
+                plan = explain(conn, statement, parameters)
+                scanned = {a or b for line in plan for a, b in _FULL_SCAN.findall(line)}
+                subqueries = {s for line in plan for s in _SUBQUERY.findall(line)}
+                if scanned - subqueries - {"CONSTANT"} - allow:
+                    found[normalize_statement(statement)] = plan
+        return found
+
+    def assert_no_full_scans(
+        self, engine: Engine, allow: frozenset = frozenset()
+    ) -> None:
+        found = self.full_scans(engine, allow)
+        assert not found, "Full table scan:\n" + "\n".join(
+            f"  {sql}\n    " + "\n    ".join(plan) for sql, plan in found.items()
+        )
@@ -1,21 +1,28 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import bcrypt
-from jose import JWTError, jwt
-
 from app.core.config import settings
 
+# bcrypt and jose (which pulls in cryptography) are imported on first use so
+# that importing the app — every worker start and --reload — doesn't pay for
+# them.  After the first call the import is a dict lookup in sys.modules.
+
 
 def hash_password(password: str) -> str:
+    import bcrypt
+
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    import bcrypt
+
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
 def create_access_token(subject: Any) -> str:
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
@@ -24,6 +31,8 @@ def create_access_token(subject: Any) -> str:
 
 
 def decode_token(token: str) -> str | None:
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -0,0 +1,79 @@
+"""
+Static file serving with cache headers and pre-compressed variants.
+
+Files produced by `python -m scripts.build_static` carry a content hash in
+their name (app.3f9c2a1b4d.js), so they never change under the same URL and
+can be cached forever.  Everything else — most importantly index.html — must
+be revalidated on every visit so a new deploy is picked up immediately.
+"""
+
+import mimetypes
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# name.<10 hex chars>.ext — the format written by scripts/build_static.py
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{10}\.[a-z0-9]+$")
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+# Preferred order when the client accepts several encodings
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that sets Cache-Control and serves .br/.gz siblings."""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+
+        response = self._precompressed_response(full_path, request_headers, status_code)
+        if response is None:
+            response = FileResponse(
+                full_path, status_code=status_code, stat_result=stat_result
+            )
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = (
+            CACHE_IMMUTABLE
+            if HASHED_NAME_RE.search(os.path.basename(full_path))
+            else CACHE_REVALIDATE
+        )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _precompressed_response(
+        full_path: str, request_headers: Headers, status_code: int
+    ) -> FileResponse | None:
+        accepted = request_headers.get("accept-encoding", "")
+        for encoding, suffix in _ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            response = FileResponse(
+                full_path + suffix,
+                status_code=status_code,
+                stat_result=compressed_stat,
+                # Content type must describe the decoded body, not the archive
+                media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+            )
+            response.headers["Content-Encoding"] = encoding
+            return response
+        return None
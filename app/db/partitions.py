@@ -0,0 +1,219 @@
+"""
+Yearly partitions of the transactions table.
+
+PostgreSQL partitions `transactions` natively (PARTITION BY RANGE (date), one
+partition per year plus a DEFAULT one, see the migration) and prunes them
+itself, so nothing here applies to it beyond `ensure_pg_partitions()`.
+
+SQLite has no partitioning, so with TRANSACTION_PARTITIONING=true closed
+years live in plain tables `transactions_<year>`, created and filled by
+`roll_over()` (python -m scripts.partitions).  `transactions` stays the
+default partition: every insert lands there, and so does a row from a
+closed year when it is edited (`promote()`), until the next roll-over.
+
+Readers go through `transactions(db, start, end)`: it returns the
+Transaction entity itself when there is nothing to prune, or an alias over
+a UNION ALL of the default table and the yearly tables overlapping
+[start, end], which queries use exactly like Transaction.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    Table,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models.transaction import Transaction
+
+PREFIX = "transactions_"
+
+_metadata = MetaData()
+_tables: dict[int, Table] = {}
+
+
+def partition_name(year: int) -> str:
+    return f"{PREFIX}{year}"
+
+
+def partition_table(year: int) -> Table:
+    """The `transactions_<year>` table: Transaction's columns, no FKs."""
+    table = _tables.get(year)
+    if table is None:
+        name = partition_name(year)
+        table = _tables[year] = Table(
+            name,
+            _metadata,
+            *(
+                Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+                for c in Transaction.__table__.columns
+            ),
+            Index(f"ix_{name}_account_date", "account_id", "date"),
+            Index(f"ix_{name}_category_date", "category_id", "date"),
+        )
+    return table
+
+
+def enabled(db: Session) -> bool:
+    """Whether this app manages SQLite partition tables."""
+    return settings.TRANSACTION_PARTITIONING and db.get_bind().dialect.name == "sqlite"
+
+
+def partition_years(db: Session) -> list[int]:
+    names = db.execute(
+        text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name GLOB 'transactions_[0-9][0-9][0-9][0-9]'"
+        )
+    ).scalars()
+    return sorted(int(name[len(PREFIX) :]) for name in names)
+
+
+def tables(
+    db: Session,
+    start: datetime | date | None = None,
+    end: datetime | date | None = None,
+) -> list[Table]:
+    """The default table plus every partition that can hold dates in [start, end]."""
+    found = [Transaction.__table__]
+    if enabled(db):
+        found += [
+            partition_table(year)
+            for year in partition_years(db)
+            if (start is None or year >= start.year)
+            and (end is None or year <= end.year)
+        ]
+    return found
+
+
+def transactions(
+    db: Session,
+    start: datetime | date | None = None,
+    end: datetime | date | None = None,
+):
+    """
+    Entity to query transactions dated in [start, end] with.
+
+    Date predicates must still be applied by the caller; `start`/`end` only
+    decide which partitions are read.  SQLite pushes those predicates into
+    each arm of the union, so every partition is searched by its own index.
+    """
+    sources = tables(db, start, end)
+    if len(sources) == 1:
+        return Transaction
+    union = union_all(*(select(t) for t in sources)).subquery("transactions")
+    return aliased(Transaction, union)
+
+
+def promote(db: Session, tx_id: int, account_ids: list[int]) -> bool:
+    """Move a partitioned transaction back into the default table to edit it."""
+    if not enabled(db) or not account_ids:
+        return False
+    partitions = tables(db)[1:]
+    if not partitions:
+        return False
+    year = db.execute(
+        union_all(
+            *(
+                select(literal(int(t.name[len(PREFIX) :]))).where(
+                    t.c.id == tx_id, t.c.account_id.in_(account_ids)
+                )
+                for t in partitions
+            )
+        )
+    ).scalar()
+    if year is None:
+        return False
+    source = partition_table(year)
+    db.execute(
+        insert(Transaction.__table__).from_select(
+            [c.name for c in source.columns], select(source).where(source.c.id == tx_id)
+        )
+    )
+    db.execute(delete(source).where(source.c.id == tx_id))
+    return True
+
+
+def delete_by_column(db: Session, column: str, values: list[int]) -> None:
+    """Delete partitioned rows whose `column` is in `values` (ids, account ids)."""
+    if not enabled(db) or not values:
+        return
+    for table in tables(db)[1:]:
+        db.execute(delete(table).where(table.c[column].in_(values)))
+
+
+def roll_over(db: Session, today: date) -> dict[int, int]:
+    """
+    Move every closed year out of the default table into its partition.
+
+    Returns {year: rows moved}.  Each year is moved and committed on its
+    own, so an interrupted run leaves no row in two places.
+    """
+    hot = Transaction.__table__
+    oldest = db.execute(select(func.min(hot.c.date))).scalar()
+    moved: dict[int, int] = {}
+    if oldest is None:
+        return moved
+    for year in range(oldest.year, today.year):
+        lo, hi = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        in_year = (hot.c.date >= lo, hot.c.date < hi)
+        if not db.execute(select(hot.c.id).where(*in_year).limit(1)).first():
+            continue
+        table = partition_table(year)
+        table.create(db.connection(), checkfirst=True)
+        db.execute(
+            insert(table).from_select(
+                [c.name for c in hot.columns], select(hot).where(*in_year)
+            )
+        )
+        moved[year] = db.execute(delete(hot).where(*in_year)).rowcount
+        db.commit()
+    return moved
+
+
+def ensure_pg_partitions(conn: Connection, years) -> list[int]:
+    """
+    Create the yearly PostgreSQL partitions that don't exist yet.
+
+    Rows already in the DEFAULT partition for a new year are moved into it
+    before it is attached, which PostgreSQL requires.  Returns the years
+    created.
+    """
+    created = []
+    for year in years:
+        name = partition_name(year)
+        if conn.execute(text("SELECT to_regclass(:n)"), {"n": name}).scalar():
+            continue
+        bounds = f"FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        conn.execute(
+            text(
+                f"CREATE TABLE {name} "
+                "(LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM transactions_default "
+                f"WHERE date >= '{year}-01-01' AND date < '{year + 1}-01-01' "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE transactions ATTACH PARTITION {name} FOR VALUES {bounds}"
+            )
+        )
+        created.append(year)
+    return created
@@ -1,16 +1,62 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import TimedQueuePool
 
-# connect_args is SQLite-specific: allows the same connection across threads
-# (FastAPI uses a thread pool, so this is required for SQLite)
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_db_engine(url: str) -> Engine:
+    """Create an engine with the options this app needs for `url`."""
+    parsed = make_url(url)
+    kwargs = {}
+    if parsed.get_backend_name() == "sqlite":
+        # connect_args is SQLite-specific: allows the same connection across
+        # threads (FastAPI uses a thread pool, so this is required for SQLite)
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if parsed.database not in (None, "", ":memory:"):
+            kwargs["poolclass"] = TimedQueuePool
+    else:
+        kwargs["poolclass"] = TimedQueuePool
+    return create_engine(url, **kwargs)
+
+
+engine = create_db_engine(settings.DATABASE_URL)
+
+# Sharded mode (SHARDS non-empty): DATABASE_URL keeps `users`, their refresh
+# tokens and shared reference data; every other table lives on the user's
+# `shard`
+shard_engines: dict[str, Engine] = {
+    name: create_db_engine(url) for name, url in settings.SHARDS.items()
+}
+GLOBAL_TABLES = frozenset({"users", "refresh_tokens", "fx_rates"})
+# Bookkeeping every database keeps for itself; owned by no user, never moved
+LOCAL_TABLES = frozenset({"maintenance_leases"})
+
+
+class ShardedSession(Session):
+    """
+    Session that sends `users` to the global engine and everything else to
+    the shard in `info["shard"]` (set by get_current_user).  Users not yet
+    placed on a shard (shard None) are still served from the global engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if mapper is not None and mapper.persist_selectable.name in GLOBAL_TABLES:
+            return engine
+        shard = self.info.get("shard")
+        return engine if shard is None else shard_engines[shard]
+
+
+# Objects stay loaded after commit: responses are built from what the
+# write (or its RETURNING clause) produced, without a refresh SELECT
+SessionLocal = sessionmaker(
+    class_=ShardedSession if shard_engines else Session,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
 
 
 class Base(DeclarativeBase):
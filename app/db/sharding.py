@@ -0,0 +1,53 @@
+"""
+Placement of users on shards.
+
+`users.shard` is the directory: it names the shard holding a user's data
+and is what requests are routed by.  New users are placed with a consistent
+hash ring over the configured shard names, keyed by user id, so adding a
+shard only moves the users whose ring position now falls on it —
+`app.services.rebalance` moves them and updates the directory.
+"""
+
+import bisect
+import hashlib
+
+from app.db.session import shard_engines
+
+VNODES = 64  # ring points per shard; more points, more even spread
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+
+class HashRing:
+    def __init__(self, nodes, vnodes: int = VNODES):
+        if not nodes:
+            raise ValueError("a hash ring needs at least one node")
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key) -> str:
+        i = bisect.bisect(self._hashes, _hash(str(key))) % len(self._hashes)
+        return self._nodes[i]
+
+
+_rings: dict[tuple[str, ...], HashRing] = {}
+
+
+def ring() -> HashRing | None:
+    names = tuple(sorted(shard_engines))
+    if not names:
+        return None
+    if names not in _rings:
+        _rings[names] = HashRing(names)
+    return _rings[names]
+
+
+def assign_shard(user_id: int) -> str | None:
+    """Shard a user belongs on, or None when sharding is off."""
+    current = ring()
+    return current.node_for(user_id) if current else None
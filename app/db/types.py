@@ -0,0 +1,105 @@
+"""
+Compact column encodings.
+
+Python code and the JSON API see Decimal amounts and datetimes; what the
+database stores is decided here, so integer sums and range scans come
+without any conversion in routes or services.
+
+* Money — integer minor units (cents) on every dialect.  SUM() is an exact
+  int64 sum and a sum's result type is still Money, so aggregates come back
+  as Decimal too.
+* Timestamp — on SQLite, integer microseconds since the epoch (UTC)
+  instead of ISO strings: half the bytes per row and index entry, and
+  range predicates compare integers.  PostgreSQL's timestamptz already is
+  an int64 of microseconds, so it is kept there (it is also the partition
+  key, which cannot change type).
+
+Arithmetic between these columns and plain numbers in SQL would bind the
+number through the type (5 → 500 cents); use `type_coerce(column,
+BigInteger)` for raw cents.  `epoch_day()` gives a timestamp's day number
+on either dialect.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from sqlalchemy import BigInteger, DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MICROS_PER_DAY = 86_400_000_000
+
+
+def to_micros(value: datetime | date) -> int:
+    """Microseconds since the epoch; aware values are taken in UTC."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def to_cents(value) -> int:
+    return int((Decimal(str(value)) * 100).to_integral_value(ROUND_HALF_EVEN))
+
+
+class Money(TypeDecorator):
+    """Decimal with two places, stored as integer cents."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else Decimal(int(value)).scaleb(-2)
+
+
+class Timestamp(TypeDecorator):
+    """datetime, stored as integer microseconds since the epoch on SQLite."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return to_micros(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return from_micros(value)
+
+
+class epoch_day(FunctionElement):
+    """Days since 1970-01-01 of a Timestamp column, as an integer."""
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(epoch_day, "sqlite")
+def _epoch_day_sqlite(element, compiler, **kw):
+    micros = compiler.process(element.clauses, **kw)
+    # Integer division truncates toward zero: step back a day before 1970
+    return f"({micros} / {_MICROS_PER_DAY} - ({micros} % {_MICROS_PER_DAY} < 0))"
+
+
+@compiles(epoch_day)
+def _epoch_day_default(element, compiler, **kw):
+    value = compiler.process(element.clauses, **kw)
+    return f"CAST(FLOOR(EXTRACT(EPOCH FROM {value}) / 86400) AS BIGINT)"
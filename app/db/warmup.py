@@ -0,0 +1,81 @@
+"""
+Optional start-up warm-up (WARMUP_ON_STARTUP=true).
+
+The first request on a fresh worker otherwise pays for mapper configuration,
+opening database connections and compiling the SQL of every hot query.  The
+warm-up does all three before the worker accepts traffic: it fills the pool
+and runs each hot route's query shape once for a user id that cannot exist,
+which populates SQLAlchemy's compiled-statement cache without reading data.
+Shards skip the `users` lookups: users live in the global database only.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, configure_mappers
+
+from app.models.account import Account
+from app.models.budget import Budget
+from app.models.transaction import Category, Transaction
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_NO_USER = -1
+
+
+def _prime_hot_queries(db: Session, users: bool) -> None:
+    """Execute the statement shapes used by the hot routes."""
+    if users:
+        db.get(User, _NO_USER)
+        db.query(User).filter(User.email == "").first()
+    db.query(Account).filter(Account.owner_id == _NO_USER).all()
+    db.query(Account.id).filter(Account.owner_id == _NO_USER).all()
+    db.query(Category).filter(Category.owner_id == _NO_USER).all()
+    db.query(Budget).filter(Budget.owner_id == _NO_USER).all()
+
+    owned = db.query(Transaction).filter(Transaction.account_id.in_([_NO_USER]))
+    owned.order_by(Transaction.date.desc()).offset(0).limit(50).all()
+    for kind in ("income", "expense"):
+        owned.filter(Transaction.transaction_type == kind).with_entities(
+            func.coalesce(func.sum(Transaction.amount), 0)
+        ).scalar()
+
+    month = datetime(2000, 1, 1)
+    db.query(Budget, Category.name).join(
+        Category, Category.id == Budget.category_id
+    ).filter(Budget.owner_id == _NO_USER, Budget.year == 2000, Budget.month == 1).all()
+    db.query(Transaction.category_id, func.sum(Transaction.amount)).join(
+        Account, Account.id == Transaction.account_id
+    ).filter(
+        Account.owner_id == _NO_USER,
+        Transaction.category_id.in_([_NO_USER]),
+        Transaction.transaction_type == "expense",
+        Transaction.date >= month,
+        Transaction.date < month,
+    ).group_by(Transaction.category_id).all()
+
+
+def warm_up(engine: Engine, connections: int, users: bool = True) -> float:
+    """
+    Fill the pool and prime the statement cache; returns seconds taken.
+    `users=False` for a shard, which holds no `users` rows.
+    """
+    started = time.perf_counter()
+    configure_mappers()
+
+    # Hold N connections at once so the pool really opens N of them
+    held = [engine.connect() for _ in range(max(connections, 1))]
+    try:
+        with Session(bind=held[0]) as db:
+            _prime_hot_queries(db, users)
+    finally:
+        for conn in held:
+            conn.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info("warm-up finished in %.3fs (%d connections)", elapsed, len(held))
+    return elapsed
@@ -0,0 +1,119 @@
+"""
+Single-statement ORM writes.
+
+Routes build their responses from the instance these return, and sessions
+don't expire on commit, so a create or update costs one statement: no
+SELECT for uniqueness beforehand and no refresh afterwards.  On dialects
+without RETURNING (SQLite < 3.35) they fall back to flush-based writes
+with the same results.  `advance_ids()` keeps a table's id generator ahead
+of ids written explicitly.
+"""
+
+from sqlalchemy import Connection, Table, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_returning(
+    db: Session, model, values: dict, conflict: list[str] | None = None
+):
+    """
+    INSERT one row and return it as a loaded instance.
+
+    With `conflict` — the columns of a unique constraint — a duplicate row
+    is not inserted and None is returned (ON CONFLICT DO NOTHING), so the
+    constraint does the uniqueness check.
+    """
+    dialect = db.get_bind(model.__mapper__).dialect
+    if not dialect.insert_returning:
+        obj = model(**values)
+        try:
+            with db.begin_nested():
+                db.add(obj)
+        except IntegrityError:
+            if conflict is None:
+                raise
+            return None
+        return obj
+
+    stmt = _UPSERT_INSERTS.get(dialect.name, insert)(model).values(**values)
+    if conflict is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict)
+    return db.scalars(stmt.returning(model)).one_or_none()
+
+
+def update_returning(db: Session, model, values: dict, *where):
+    """
+    UPDATE the row matching `where` and return it as a loaded instance, or
+    None when nothing matched (e.g. someone else's row).  An instance
+    already in the session is refreshed from the returned row.
+    """
+    dialect = db.get_bind(model.__mapper__).dialect
+    if not values or not dialect.update_returning:
+        obj = db.scalars(select(model).where(*where)).one_or_none()
+        if obj is not None:
+            for field, value in values.items():
+                setattr(obj, field, value)
+            db.flush()
+        return obj
+
+    stmt = update(model).where(*where).values(**values).returning(model)
+    return db.scalars(
+        stmt,
+        execution_options={"populate_existing": True, "synchronize_session": False},
+    ).one_or_none()
+
+
+def upsert(
+    db: Session, model, rows: list[dict], conflict: list[str], set_: dict | None = None
+) -> None:
+    """
+    INSERT `rows` in one statement; rows whose `conflict` columns already
+    exist are updated instead (ON CONFLICT DO UPDATE) — with `set_`, or by
+    default with the new row's other columns.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind(model.__mapper__).dialect
+    stmt = _UPSERT_INSERTS[dialect.name](model).values(rows)
+    if set_ is None:
+        set_ = {name: stmt.excluded[name] for name in rows[0] if name not in conflict}
+    db.execute(stmt.on_conflict_do_update(index_elements=conflict, set_=set_))
+
+
+def advance_ids(conn: Connection, table: Table, at_least: int) -> None:
+    """
+    Make the ids `table` generates from now on greater than `at_least` — for
+    rows inserted with explicit ids, which PostgreSQL sequences don't see,
+    or ids kept elsewhere that must not be handed out again.  SQLite tables
+    without AUTOINCREMENT always continue after their largest id, so only
+    ids still in the table are protected there.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                f"GREATEST(:at_least, 1, (SELECT MAX(id) FROM {table.name})))"
+            ),
+            {"table": table.name, "at_least": at_least},
+        )
+    elif (
+        conn.dialect.name == "sqlite"
+        and table.dialect_options["sqlite"]["autoincrement"]
+    ):
+        params = {"table": table.name, "at_least": at_least}
+        if not conn.execute(
+            text(
+                "UPDATE sqlite_sequence SET seq = MAX(seq, :at_least) WHERE name = :table"
+            ),
+            params,
+        ).rowcount:
+            conn.execute(
+                text(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES (:table, :at_least)"
+                ),
+                params,
+            )
@@ -1,16 +1,58 @@
+import asyncio
+import logging
+import os
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 
-from app.api.routes import accounts, auth, budgets, imports, transactions, users
+from app.api.routes import (
+    accounts,
+    auth,
+    budgets,
+    dashboard,
+    events,
+    imports,
+    recurring,
+    reports,
+    transactions,
+    users,
+)
+from app.core import metrics, query_log
+from app.core.events import EventStreamGZipMiddleware
+from app.core.profiling import ProfilingMiddleware
 from app.core.config import settings
+from app.core.static import CachedStaticFiles
+from app.db.session import engine, shard_engines
+from app.db.warmup import warm_up
+from app.services.maintenance import Scheduler
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Tables are managed by Alembic — run `alembic upgrade head` before starting.
+    if settings.WARMUP_ON_STARTUP:
+        elapsed = 0.0
+        targets = {"main": engine, **shard_engines}
+        for name, target in targets.items():
+            try:
+                elapsed += await anyio.to_thread.run_sync(
+                    warm_up, target, settings.WARMUP_CONNECTIONS, target is engine
+                )
+            except Exception:
+                # A cold engine still works; warm the others regardless
+                logger.exception("warm-up of %s failed; continuing without it", name)
+        metrics.APP_WARMUP.set(elapsed)
+    maintenance = None
+    if settings.MAINTENANCE_ENABLED:
+        scheduler = Scheduler({"main": engine, **shard_engines})
+        maintenance = asyncio.create_task(scheduler.run())
     yield
+    if maintenance is not None:
+        maintenance.cancel()
 
 
 app = FastAPI(
@@ -20,12 +62,38 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Compresses JSON responses above the threshold; pre-compressed static files
+# already carry Content-Encoding and are passed through untouched, and so is
+# the event stream, whose frames must not wait in the compressor.
+app.add_middleware(EventStreamGZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.PROFILING_DIR,
+        token=settings.PROFILING_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+        trace_memory=settings.PROFILING_TRACEMALLOC,
+    )
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(query_log.QueryLogMiddleware)
+    query_log.install_sqlalchemy_hooks()
+if settings.METRICS_ENABLED:
+    # Added last so it wraps everything and times the full request
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.install_sqlalchemy_hooks()
+    metrics.watch_pool(engine.pool, *(e.pool for e in shard_engines.values()))
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(accounts.router)
 app.include_router(transactions.router)
 app.include_router(budgets.router)
 app.include_router(imports.router)
+app.include_router(dashboard.router)
+app.include_router(recurring.router)
+app.include_router(reports.router)
+app.include_router(events.router)
 
 
 @app.get("/health", tags=["health"])
@@ -33,5 +101,17 @@ def health():
     return {"status": "ok"}
 
 
-# Static mount must come last — it acts as a catch-all
-app.mount("/", StaticFiles(directory="app/static", html=True), name="static")
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(
+            metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
+
+
+# Static mount must come last — it acts as a catch-all.
+# Prefer the hashed build from `python -m scripts.build_static` when present.
+_static_dist = os.path.join(settings.STATIC_DIR, "dist")
+_static_dir = _static_dist if os.path.isdir(_static_dist) else settings.STATIC_DIR
+app.mount("/", CachedStaticFiles(directory=_static_dir, html=True), name="static")
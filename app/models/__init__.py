@@ -1,6 +1,12 @@
 # Import all models here so Base.metadata is fully populated
 # whenever anyone calls Base.metadata.create_all()
 from app.models.account import Account  # noqa: F401
+from app.models.archive import TransactionArchive  # noqa: F401
 from app.models.budget import Budget  # noqa: F401
+from app.models.fx import FxRate  # noqa: F401
+from app.models.ledger import LedgerCheckpoint  # noqa: F401
+from app.models.maintenance import MaintenanceLease  # noqa: F401
+from app.models.recurring import RecurringSeries, RecurringWatermark  # noqa: F401
+from app.models.token import RefreshToken  # noqa: F401
 from app.models.transaction import Category, Transaction  # noqa: F401
 from app.models.user import User  # noqa: F401
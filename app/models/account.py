@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
+from app.db.types import Money
 
 
 class Account(Base):
@@ -12,22 +14,27 @@ class Account(Base):
     __tablename__ = "accounts"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    owner_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
-    )
+    # No FK to users: in sharded mode they live in the global database and
+    # this table on a shard.  Every query filters on owner_id instead.
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     # ACCOUNT_TYPES: checking | savings | credit | investment | cash
     account_type: Mapped[str] = mapped_column(
         String, nullable=False, default="checking"
     )
-    # Stored as NUMERIC to avoid floating-point rounding errors
-    balance: Mapped[float] = mapped_column(Numeric(precision=15, scale=2), default=0.0)
+    # Stored as integer cents to avoid floating-point rounding errors
+    balance: Mapped[Decimal] = mapped_column(Money, default=Decimal(0))
+    # Balance before any transaction; None for accounts created before ledger
+    # checkpoints existed, until their first reconciliation sets it
+    opening_balance: Mapped[Decimal | None] = mapped_column(Money, nullable=True)
     currency: Mapped[str] = mapped_column(String(3), default="USD")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
-    owner: Mapped["User"] = relationship(back_populates="accounts")  # noqa: F821
+    owner: Mapped["User"] = relationship(  # noqa: F821
+        back_populates="accounts", primaryjoin="User.id == foreign(Account.owner_id)"
+    )
     transactions: Mapped[list["Transaction"]] = relationship(  # noqa: F821
         back_populates="account", cascade="all, delete-orphan"
     )
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class TransactionArchive(Base):
+    """
+    Where a user's archive file ends and what it covers.
+
+    `file_bytes` is the committed length: segments past it belong to an
+    archiving run that never committed and are ignored (then truncated).
+    """
+
+    __tablename__ = "transaction_archives"
+
+    # A users.id, not enforced — see Account.owner_id
+    owner_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Every transaction dated before this was moved to the archive
+    archived_before: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    file_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
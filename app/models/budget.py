@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
+from app.db.types import Money
 
 
 class Budget(Base):
@@ -13,23 +15,24 @@ class Budget(Base):
     __table_args__ = (
         # One budget per user/category/month combination
         UniqueConstraint("owner_id", "category_id", "year", "month", name="uq_budget"),
+        # Listing and status read one user's month
+        Index("ix_budgets_owner_period", "owner_id", "year", "month"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    owner_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
-    )
+    # A users.id, not enforced — see Account.owner_id
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False)
     category_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("categories.id"), nullable=False
     )
-    amount: Mapped[float] = mapped_column(
-        Numeric(precision=15, scale=2), nullable=False
-    )
+    amount: Mapped[Decimal] = mapped_column(Money, nullable=False)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
     month: Mapped[int] = mapped_column(Integer, nullable=False)  # 1–12
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
-    owner: Mapped["User"] = relationship()  # noqa: F821
+    owner: Mapped["User"] = relationship(  # noqa: F821
+        primaryjoin="User.id == foreign(Budget.owner_id)"
+    )
     category: Mapped["Category"] = relationship()  # noqa: F821
@@ -0,0 +1,17 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class FxRate(Base):
+    """Units of `currency` per one FX_BASE_CURRENCY on `day` (e.g. ECB rates)."""
+
+    __tablename__ = "fx_rates"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
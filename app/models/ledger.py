@@ -0,0 +1,40 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+from app.db.types import Money
+
+
+class LedgerCheckpoint(Base):
+    """
+    Sum and count of one account's transactions in one (UTC) month.
+
+    Every write that changes a month's transactions marks its checkpoint
+    `dirty`; reconciliation recomputes only those, and the account's
+    expected balance is its opening balance plus the sum of its checkpoints.
+    """
+
+    __tablename__ = "ledger_checkpoints"
+
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("accounts.id"), primary_key=True
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day
+    total: Mapped[Decimal] = mapped_column(Money, nullable=False, default=Decimal(0))
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dirty: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    verified_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+# The nightly run starts from the few accounts with changed months
+Index(
+    "ix_ledger_checkpoints_dirty",
+    LedgerCheckpoint.account_id,
+    sqlite_where=LedgerCheckpoint.dirty == True,  # noqa: E712 — matches queries
+    postgresql_where=LedgerCheckpoint.dirty,
+)
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class MaintenanceLease(Base):
+    """
+    One row per maintenance task in each database: who may run it now and
+    how its last run went.
+
+    A worker runs a task only after claiming the lease with a conditional
+    UPDATE, so with several workers each task runs once per interval.
+    """
+
+    __tablename__ = "maintenance_leases"
+
+    task: Mapped[str] = mapped_column(String, primary_key=True)
+    holder: Mapped[str | None] = mapped_column(String, nullable=True)
+    # A crashed holder's lease simply runs out
+    expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_duration_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_result: Mapped[str | None] = mapped_column(Text, nullable=True)
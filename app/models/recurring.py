@@ -0,0 +1,47 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+from app.db.types import Money
+
+
+class RecurringSeries(Base):
+    """
+    Running state of one payee/amount group of a user's transactions.
+
+    Every group is kept, recurring or not, so a new transaction only has to
+    update its own group; `period` is set once the spacing is consistent.
+    """
+
+    __tablename__ = "recurring_series"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # A users.id, not enforced — see Account.owner_id
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    payee: Mapped[str] = mapped_column(String, nullable=False)  # normalized
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)  # latest
+    transaction_type: Mapped[str] = mapped_column(String, nullable=False)
+    # Amounts are stored unsigned; transaction_type carries the direction
+    last_amount: Mapped[Decimal] = mapped_column(Money, nullable=False)
+    amount_total: Mapped[Decimal] = mapped_column(Money, nullable=False)
+    occurrences: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_date: Mapped[date] = mapped_column(Date, nullable=False)
+    last_date: Mapped[date] = mapped_column(Date, nullable=False)
+    # "weekly" | "monthly" | "yearly" — spacing of the latest interval
+    period: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Consecutive intervals that matched `period`
+    streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class RecurringWatermark(Base):
+    """Highest transaction id already folded into a user's series."""
+
+    __tablename__ = "recurring_watermarks"
+
+    # A users.id, not enforced — see Account.owner_id
+    owner_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_transaction_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -1,15 +1,24 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
+from app.db.types import Money, Timestamp
 
 
 class Transaction(Base):
     """A single financial movement (income or expense) tied to an account."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Every read is per account (or category) over a date range
+        Index("ix_transactions_account_date", "account_id", "date"),
+        Index("ix_transactions_category_date", "category_id", "date"),
+        # Never reuse ids: rows leave this table for partitions and the archive
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     account_id: Mapped[int] = mapped_column(
@@ -20,16 +29,14 @@ class Transaction(Base):
     )
 
     # Positive = income, Negative = expense (single column keeps queries simple)
-    amount: Mapped[float] = mapped_column(
-        Numeric(precision=15, scale=2), nullable=False
-    )
+    amount: Mapped[Decimal] = mapped_column(Money, nullable=False)
     # Redundant but useful for quick filtering without checking sign of amount
     transaction_type: Mapped[str] = mapped_column(
         String, nullable=False
     )  # "income" | "expense"
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     date: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        Timestamp, default=lambda: datetime.now(timezone.utc)
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -45,9 +52,8 @@ class Category(Base):
     __tablename__ = "categories"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    owner_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
-    )
+    # A users.id, not enforced — see Account.owner_id
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     # "income" or "expense" — lets the UI pre-filter category suggestions
     category_type: Mapped[str] = mapped_column(
@@ -57,5 +63,8 @@ class Category(Base):
         String(7), nullable=True
     )  # hex color e.g. "#FF5733"
 
-    owner: Mapped["User"] = relationship(back_populates="categories")  # noqa: F821
+    owner: Mapped["User"] = relationship(  # noqa: F821
+        back_populates="categories",
+        primaryjoin="User.id == foreign(Category.owner_id)",
+    )
     transactions: Mapped[list["Transaction"]] = relationship(back_populates="category")
@@ -14,14 +14,26 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
     full_name: Mapped[str] = mapped_column(String, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Bumped on every change to the user's transactions/categories; derived
+    # data (analytics frames) is cached per version
+    data_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Shard holding the user's data (sharded mode); None = the global database
+    shard: Mapped[str | None] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
     # Relationships — lazy="dynamic" replaced with select (SQLAlchemy 2.x style)
+    # Joined on owner_id without a foreign key (see Account.owner_id)
     accounts: Mapped[list["Account"]] = relationship(  # noqa: F821
-        back_populates="owner", cascade="all, delete-orphan"
+        back_populates="owner",
+        cascade="all, delete-orphan",
+        primaryjoin="User.id == foreign(Account.owner_id)",
     )
     categories: Mapped[list["Category"]] = relationship(  # noqa: F821
-        back_populates="owner", cascade="all, delete-orphan"
+        back_populates="owner",
+        cascade="all, delete-orphan",
+        primaryjoin="User.id == foreign(Category.owner_id)",
     )
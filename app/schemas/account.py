@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 from pydantic import BaseModel
@@ -29,3 +29,26 @@ class AccountRead(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class MonthCheckRead(BaseModel):
+    month: date
+    total: Decimal
+    count: int
+    recorded_total: Decimal
+    recorded_count: int
+
+    model_config = {"from_attributes": True}
+
+
+class ReconciliationRead(BaseModel):
+    account_id: int
+    balance: Decimal
+    expected_balance: Decimal
+    drift: Decimal
+    months_checked: int
+    full: bool
+    repaired: bool
+    mismatched_months: list[MonthCheckRead]
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+from app.schemas.account import AccountRead
+from app.schemas.budget import BudgetStatus
+from app.schemas.transaction import CategoryRead, SummaryRead, TransactionRead
+
+
+class DashboardRead(BaseModel):
+    """Everything the dashboard page renders, in one response."""
+
+    period: str  # YYYY-MM
+    accounts: list[AccountRead]
+    categories: list[CategoryRead]
+    summary: SummaryRead
+    recent: list[TransactionRead]
+    budgets: list[BudgetStatus]
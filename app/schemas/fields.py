@@ -0,0 +1,54 @@
+"""
+Sparse fieldsets for list endpoints: `?fields=date,amount`.
+
+`fields_param(Schema)` is the route dependency: it returns the requested
+names in the schema's order, or None when the parameter is absent, and
+rejects unknown names with a 422.  The route then selects only
+`columns(entity, fields)` — plain column tuples, no ORM entities — and
+serializes them through `partial(Schema, fields)`, a copy of the schema
+with just those fields.
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+def fields_param(schema: type[BaseModel]) -> Callable[..., tuple[str, ...] | None]:
+    allowed = tuple(schema.model_fields)
+
+    def dependency(
+        fields: str | None = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}"
+        ),
+    ) -> tuple[str, ...] | None:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",")} - {""}
+        unknown = requested - set(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        if not requested:
+            raise HTTPException(status_code=422, detail="No fields requested")
+        return tuple(name for name in allowed if name in requested)
+
+    return dependency
+
+
+@lru_cache
+def partial(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """`schema` reduced to `fields`; reads rows by attribute or dict key."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+def columns(entity, fields: tuple[str, ...]) -> list:
+    """The mapped columns of `entity` (a model or an alias) for `fields`."""
+    return [getattr(entity, name) for name in fields]
@@ -0,0 +1,17 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class RecurringRead(BaseModel):
+    payee: str
+    description: str | None
+    transaction_type: str
+    period: str  # "weekly" | "monthly" | "yearly"
+    occurrences: int
+    average_amount: Decimal
+    first_date: date
+    last_date: date
+    next_date: date
+    next_amount: Decimal  # the latest amount — price changes carry forward
@@ -0,0 +1,45 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class ReportTotals(BaseModel):
+    income: Decimal
+    expenses: Decimal
+    net: Decimal
+    savings_rate: float | None  # % of income kept; None without income
+    average_daily_spend: Decimal
+
+
+class MonthReport(BaseModel):
+    month: str  # YYYY-MM
+    income: Decimal
+    expenses: Decimal
+    net: Decimal
+    savings_rate: float | None
+    expenses_change: Decimal | None  # vs the previous month
+    cumulative_net: Decimal  # running net since period start
+
+
+class CategoryTrend(BaseModel):
+    category_id: int
+    category_name: str
+    total: Decimal
+    months: list[Decimal]  # expenses per month, aligned with ReportsRead.months
+
+
+class RollingSpend(BaseModel):
+    date: date
+    average: Decimal
+
+
+class ReportsRead(BaseModel):
+    period_start: date
+    period_end: date
+    transactions: int
+    totals: ReportTotals
+    months: list[MonthReport]
+    categories: list[CategoryTrend]
+    rolling_spend: list[RollingSpend]  # trailing-window average daily spend
+    currency: str | None = None  # the requested currency, if any
@@ -63,3 +63,4 @@ class SummaryRead(BaseModel):
     net: Decimal
     period_start: datetime | None
     period_end: datetime | None
+    currency: str | None = None
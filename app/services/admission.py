@@ -0,0 +1,213 @@
+"""
+Admission control for the expensive routes.
+
+Two kinds of limit, both attached to routes as dependencies:
+
+* RateLimit — a token bucket per (route group, user).  Unauthenticated
+  routes (login, register) are keyed by client address instead, and login
+  also by the name being logged into, so guesses at one account spread
+  over many addresses still share a bucket.  Requests over the limit get
+  429 with Retry-After.
+* ConcurrencyLimit — at most `limit` requests of a group run at once and at
+  most `queue_size` wait, each for up to `timeout` seconds.  Anything beyond
+  that gets 503 with Retry-After instead of piling up in the thread pool.
+
+Limits of 0 disable the corresponding check; ADMISSION_ENABLED=false
+disables all of them.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Depends, Form, HTTPException, Request, status
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.user import User
+from app.services.auth import get_current_user
+
+# Buckets idle long enough to be full again are dropped beyond this many keys
+_MAX_BUCKETS = 10_000
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, rate: float, burst: float, now: float) -> float:
+        """Consume one token; returns 0 on success, else seconds until one is free."""
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+def _reject(code: int, group: str, reason: str, retry_after: float, detail: str):
+    metrics.ADMISSION_REJECTED.inc(group=group, reason=reason)
+    raise HTTPException(
+        status_code=code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimit:
+    def __init__(self, group: str, per_minute: float, burst: int):
+        self.group = group
+        self.per_minute = per_minute
+        self.burst = burst
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, key: str) -> None:
+        if not settings.ADMISSION_ENABLED or self.per_minute <= 0:
+            return
+        rate, burst = self.per_minute / 60, max(self.burst, 1)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(burst, now)
+                self._evict(now, rate, burst)
+            else:
+                self._buckets.move_to_end(key)
+            wait = bucket.take(rate, burst, now)
+        if wait:
+            _reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                self.group,
+                "rate",
+                wait,
+                "Too many requests, retry later",
+            )
+
+    def _evict(self, now: float, rate: float, burst: float) -> None:
+        # Oldest first; a bucket that has refilled carries no state worth keeping
+        while len(self._buckets) > _MAX_BUCKETS:
+            key, oldest = next(iter(self._buckets.items()))
+            if oldest.tokens + (now - oldest.updated) * rate < burst:
+                break
+            del self._buckets[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def by_user(self, current_user: User = Depends(get_current_user)) -> None:
+        """Dependency: one bucket per authenticated user."""
+        self.check(f"user:{current_user.id}")
+
+    def by_client(self, request: Request) -> None:
+        """Dependency: one bucket per client address (for anonymous routes)."""
+        host = request.client.host if request.client else "unknown"
+        self.check(f"ip:{host}")
+
+    def by_login_name(self, username: str = Form("")) -> None:
+        """Dependency: one bucket per name logged into, from any address."""
+        self.check(f"name:{username.strip().lower()}")
+
+
+class ConcurrencyLimit:
+    def __init__(self, group: str, limit: int, queue_size: int, timeout: float):
+        self.group = group
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(limit, 1))
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        """
+        Dependency holding a slot for the whole request.
+
+        A plain (sync) generator, so FastAPI runs the wait in the thread
+        pool and never blocks the event loop.
+        """
+        if not settings.ADMISSION_ENABLED or self.limit <= 0:
+            yield
+            return
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.queue_size:
+                    full = True
+                else:
+                    full = False
+                    self._waiting += 1
+                    metrics.ADMISSION_QUEUE_DEPTH.set(self._waiting, group=self.group)
+            if full:
+                _reject(
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                    self.group,
+                    "queue_full",
+                    self.timeout,
+                    "Server busy, retry later",
+                )
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+                    metrics.ADMISSION_QUEUE_DEPTH.set(self._waiting, group=self.group)
+            if not acquired:
+                _reject(
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                    self.group,
+                    "timeout",
+                    self.timeout,
+                    "Server busy, retry later",
+                )
+
+        metrics.ADMISSION_IN_FLIGHT.inc(group=self.group)
+        try:
+            yield
+        finally:
+            metrics.ADMISSION_IN_FLIGHT.dec(group=self.group)
+            self._slots.release()
+
+
+# ── Route groups ────────────────────────────────────────────────────────────
+
+auth_rate = RateLimit(
+    "auth", settings.RATE_LIMIT_AUTH_PER_MINUTE, settings.RATE_LIMIT_AUTH_BURST
+)
+login_name_rate = RateLimit(
+    "login_name",
+    settings.RATE_LIMIT_LOGIN_NAME_PER_MINUTE,
+    settings.RATE_LIMIT_LOGIN_NAME_BURST,
+)
+import_rate = RateLimit(
+    "import", settings.RATE_LIMIT_IMPORT_PER_MINUTE, settings.RATE_LIMIT_IMPORT_BURST
+)
+report_rate = RateLimit(
+    "report", settings.RATE_LIMIT_REPORT_PER_MINUTE, settings.RATE_LIMIT_REPORT_BURST
+)
+
+auth_slots = ConcurrencyLimit(
+    "auth",
+    settings.AUTH_CONCURRENCY,
+    settings.ADMISSION_QUEUE_SIZE,
+    settings.ADMISSION_QUEUE_TIMEOUT,
+)
+import_slots = ConcurrencyLimit(
+    "import",
+    settings.IMPORT_CONCURRENCY,
+    settings.ADMISSION_QUEUE_SIZE,
+    settings.ADMISSION_QUEUE_TIMEOUT,
+)
+
+
+def reset() -> None:
+    """Forget all bucket state (tests start every case with full buckets)."""
+    for limit in (auth_rate, login_name_rate, import_rate, report_rate):
+        limit.reset()
@@ -0,0 +1,260 @@
+"""
+Vectorized reports over a user's transactions.
+
+`load_frame()` reads the filtered transactions — live rows and archived
+ones alike — once into columnar NumPy arrays — amounts as int64 cents, dates as datetime64[D], category and
+account as small integer codes — and `compute_reports()` derives every
+report from those arrays with bincount group-bys, cumulative sums and
+rolling windows; no per-row Decimal arithmetic.
+
+Frames are cached in an LRU keyed by (user, User.data_version, filters).
+Every write bumps data_version, so a cached frame is never stale — old
+versions simply age out of the LRU.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.db import partitions
+from app.db.types import epoch_day
+from app.models.account import Account
+from app.services import archive
+
+# numpy is imported where it is used: importing the app doesn't load it
+if TYPE_CHECKING:
+    import numpy as np
+
+# The archive's own code, so archived category columns are used as they are
+UNCATEGORIZED = archive.NO_CATEGORY
+CENT = Decimal("0.01")
+
+_frames = MemoryCache(settings.ANALYTICS_FRAME_CACHE_SIZE)
+_FRAME_TTL = 24 * 3600.0  # versions make frames exact; TTL only bounds idle memory
+
+
+@dataclass(frozen=True)
+class Frame:
+    cents: "np.ndarray"  # int64, signed: income > 0, expense < 0
+    days: "np.ndarray"  # datetime64[D]
+    income: "np.ndarray"  # bool, transaction_type == "income"
+    category: "np.ndarray"  # int32 index into category_ids, UNCATEGORIZED if none
+    account: "np.ndarray"  # int32 index into account_ids
+    category_ids: "np.ndarray"
+    account_ids: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+
+def load_frame(
+    db: Session,
+    user_id: int,
+    data_version: int,
+    start: date,
+    end: date,
+    account_id: int | None = None,
+) -> Frame:
+    """Transactions dated in [start, end] as a Frame (cached per data_version)."""
+    key = f"{user_id}:{data_version}:{start}:{end}:{account_id}"
+    frame = _frames.get(key)
+    if frame is None:
+        frame = _query_frame(db, user_id, start, end, account_id)
+        _frames.set(key, frame, _FRAME_TTL)
+    return frame
+
+
+def _query_frame(db, user_id, start, end, account_id) -> Frame:
+    import numpy as np
+
+    lo = datetime.combine(start, time())
+    hi = datetime.combine(end + timedelta(days=1), time())
+    Tx = partitions.transactions(db, start, end)
+    stmt = (
+        select(
+            # Raw cents and day numbers: rows arrive as plain ints that
+            # NumPy converts in bulk
+            type_coerce(Tx.amount, BigInteger),
+            epoch_day(Tx.date),
+            Tx.transaction_type == "income",
+            Tx.category_id,
+            Tx.account_id,
+        )
+        .join(Account, Account.id == Tx.account_id)
+        .where(
+            Account.owner_id == user_id,
+            Tx.date >= lo,
+            Tx.date < hi,
+        )
+    )
+    if account_id is not None:
+        stmt = stmt.where(Tx.account_id == account_id)
+        owned = [account_id]
+    else:
+        owned = list(db.scalars(select(Account.id).where(Account.owner_id == user_id)))
+
+    rows = db.execute(stmt).all()
+    archived = archive.matching_columns(
+        db,
+        user_id,
+        archive.ArchiveFilter(owned, None, lo, hi - timedelta.resolution),
+    )
+    if not rows and not len(archived["cents"]):
+        empty = np.array([], dtype=np.int64)
+        return Frame(
+            cents=empty,
+            days=np.array([], dtype="datetime64[D]"),
+            income=np.array([], dtype=bool),
+            category=empty.astype(np.int32),
+            account=empty.astype(np.int32),
+            category_ids=empty,
+            account_ids=empty,
+        )
+
+    cents, days, income, categories, accounts = (
+        zip(*rows, strict=True) if rows else [()] * 5
+    )
+    raw_categories = np.concatenate(
+        (
+            np.array(
+                [UNCATEGORIZED if c is None else c for c in categories], dtype=np.int64
+            ),
+            archived["category_id"],
+        )
+    )
+    category_ids, category = np.unique(raw_categories, return_inverse=True)
+    if category_ids[0] == UNCATEGORIZED:  # keep -1 as the "no category" code
+        category = category - 1
+        category_ids = category_ids[1:]
+    account_ids, account = np.unique(
+        np.concatenate((np.array(accounts, dtype=np.int64), archived["account_id"])),
+        return_inverse=True,
+    )
+    return Frame(
+        cents=np.concatenate((np.array(cents, dtype=np.int64), archived["cents"])),
+        days=np.concatenate((np.array(days, dtype="datetime64[D]"), archived["day"])),
+        income=np.concatenate((np.array(income, dtype=bool), archived["income"])),
+        category=category.astype(np.int32),
+        account=account.astype(np.int32),
+        category_ids=category_ids,
+        account_ids=account_ids,
+    )
+
+
+def clear_cache() -> None:
+    _frames.clear()
+
+
+# ── Reports ─────────────────────────────────────────────────────────────────
+
+
+def _money(cents) -> Decimal:
+    return Decimal(int(cents)) / 100
+
+
+def _rate(numerator, denominator) -> float | None:
+    return (
+        round(float(numerator) / float(denominator) * 100, 1) if denominator else None
+    )
+
+
+def compute_reports(frame: Frame, start: date, end: date, window: int = 7) -> dict:
+    """
+    Every report for the period in one pass over the frame's columns.
+
+    Returns plain data ready for the ReportsRead schema: totals, per-month
+    figures with month-over-month change and running net, per-category
+    monthly expense trends, and a `window`-day rolling average of spend.
+    """
+    import numpy as np
+
+    if end < start:
+        raise ValueError("end must not be before start")
+    first_day = np.datetime64(start, "D")
+    n_days = (np.datetime64(end, "D") - first_day).astype(int) + 1
+    first_month = first_day.astype("datetime64[M]")
+    n_months = (np.datetime64(end, "M") - first_month).astype(int) + 1
+
+    expense = ~frame.income
+    spend = np.where(expense, -frame.cents, 0)  # positive cents spent
+    earned = np.where(frame.income, frame.cents, 0)
+    day_idx = (frame.days - first_day).astype(np.int64)
+    month_idx = (frame.days.astype("datetime64[M]") - first_month).astype(np.int64)
+
+    # Group-by month / day: weighted bincounts (float64 is exact below 2**53 cents)
+    income_m = np.bincount(month_idx, weights=earned, minlength=n_months).astype(
+        np.int64
+    )
+    spend_m = np.bincount(month_idx, weights=spend, minlength=n_months).astype(np.int64)
+    spend_d = np.bincount(day_idx, weights=spend, minlength=n_days).astype(np.int64)
+    net_m = income_m - spend_m
+    cumulative_net = np.cumsum(net_m)
+
+    # Rolling average via the cumulative-sum difference trick
+    padded = np.concatenate(([0], np.cumsum(spend_d)))
+    lo = np.maximum(np.arange(1, n_days + 1) - window, 0)
+    rolling = (padded[1:] - padded[lo]) / np.minimum(np.arange(1, n_days + 1), window)
+
+    # Category × month expense matrix in one bincount
+    n_cat = len(frame.category_ids)
+    categorized = expense & (frame.category != UNCATEGORIZED)
+    cat_matrix = (
+        np.bincount(
+            frame.category[categorized].astype(np.int64) * n_months
+            + month_idx[categorized],
+            weights=spend[categorized],
+            minlength=n_cat * n_months,
+        )
+        .astype(np.int64)
+        .reshape(n_cat, n_months)
+    )
+
+    months = np.arange(first_month, first_month + n_months)
+    total_income, total_spend = int(income_m.sum()), int(spend_m.sum())
+    return {
+        "period_start": start,
+        "period_end": end,
+        "transactions": len(frame),
+        "totals": {
+            "income": _money(total_income),
+            "expenses": _money(total_spend),
+            "net": _money(total_income - total_spend),
+            "savings_rate": _rate(total_income - total_spend, total_income),
+            "average_daily_spend": (_money(total_spend) / n_days).quantize(CENT),
+        },
+        "months": [
+            {
+                "month": str(months[i]),
+                "income": _money(income_m[i]),
+                "expenses": _money(spend_m[i]),
+                "net": _money(net_m[i]),
+                "savings_rate": _rate(net_m[i], income_m[i]),
+                "expenses_change": _money(spend_m[i] - spend_m[i - 1]) if i else None,
+                "cumulative_net": _money(cumulative_net[i]),
+            }
+            for i in range(n_months)
+        ],
+        "categories": sorted(
+            (
+                {
+                    "category_id": int(frame.category_ids[c]),
+                    "total": _money(cat_matrix[c].sum()),
+                    "months": [_money(v) for v in cat_matrix[c]],
+                }
+                for c in range(n_cat)
+                if cat_matrix[c].any()
+            ),
+            key=lambda row: row["total"],
+            reverse=True,
+        ),
+        "rolling_spend": [
+            {"date": str(first_day + i), "average": _money(int(round(rolling[i])))}
+            for i in range(n_days)
+        ],
+    }
@@ -0,0 +1,449 @@
+"""
+Columnar archive for cold transaction history.
+
+`archive_user()` moves a user's transactions dated before a cutoff out of
+the `transactions` table into ARCHIVE_DIR/user_<id>.ftarc, an append-only
+file of segments.  Each archiving run appends one segment:
+
+    header        magic "FTARC001", rows (u64), heap bytes (u64)
+    id            int64[rows]
+    account_id    int64[rows]
+    category_id   int64[rows]   (-1 = none)
+    date          int64[rows]   microseconds since the epoch, UTC
+    created_at    int64[rows]
+    cents         int64[rows]   signed like Transaction.amount
+    flags         uint8[rows]   bit 0 income, bit 1 no description
+    desc_offsets  int64[rows + 1] into the heap
+    heap          UTF-8 descriptions, back to back
+
+All little-endian, every block padded to 8 bytes, so readers mmap the file
+and view each column with np.frombuffer — no parsing and no copies.  Only
+the first TransactionArchive.file_bytes bytes are trusted: that length is
+committed in the same transaction that deletes the archived rows, so a
+segment from a run that crashed before committing is ignored and truncated
+by the next run.
+
+Archived transactions are read-only.  The list, summary and single-item
+reads merge them with hot rows through `latest()`, `totals()` and `find()`.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import partitions
+from app.db.types import from_micros, to_cents, to_micros
+from app.models.account import Account
+from app.models.archive import TransactionArchive
+from app.models.transaction import Transaction
+from app.services.versions import bump_data_version
+
+# numpy is imported where it is used: importing the app doesn't load it
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"FTARC001"
+HEADER = struct.Struct("<8sQQ")
+_INT_COLUMNS = ("id", "account_id", "category_id", "date", "created_at", "cents")
+FLAG_INCOME = 1
+FLAG_NO_DESCRIPTION = 2
+NO_CATEGORY = -1
+
+_DELETE_BATCH = 500
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def archive_path(user_id: int) -> Path:
+    return Path(settings.ARCHIVE_DIR) / f"user_{user_id}.ftarc"
+
+
+# ── Segment format ──────────────────────────────────────────────────────────
+
+
+def encode_segment(rows) -> bytes:
+    """
+    Serialize rows of (id, account_id, category_id, date, created_at, amount,
+    transaction_type, description) into one segment.
+    """
+    import numpy as np
+
+    n = len(rows)
+    columns = {name: np.empty(n, dtype="<i8") for name in _INT_COLUMNS}
+    flags = np.zeros(n, dtype="u1")
+    offsets = np.zeros(n + 1, dtype="<i8")
+    heap = bytearray()
+
+    for i, (
+        tx_id,
+        account_id,
+        category_id,
+        when,
+        created,
+        amount,
+        kind,
+        text,
+    ) in enumerate(rows):
+        columns["id"][i] = tx_id
+        columns["account_id"][i] = account_id
+        columns["category_id"][i] = NO_CATEGORY if category_id is None else category_id
+        columns["date"][i] = to_micros(when)
+        columns["created_at"][i] = to_micros(created or when)
+        columns["cents"][i] = to_cents(amount)
+        if kind == "income":
+            flags[i] |= FLAG_INCOME
+        if text is None:
+            flags[i] |= FLAG_NO_DESCRIPTION
+        else:
+            heap += text.encode()
+        offsets[i + 1] = len(heap)
+
+    parts = [HEADER.pack(MAGIC, n, len(heap))]
+    parts += [columns[name].tobytes() for name in _INT_COLUMNS]
+    parts.append(flags.tobytes() + bytes(_pad(n)))
+    parts.append(offsets.tobytes())
+    parts.append(bytes(heap) + bytes(_pad(len(heap))))
+    return b"".join(parts)
+
+
+@dataclass
+class Segment:
+    id: "np.ndarray"
+    account_id: "np.ndarray"
+    category_id: "np.ndarray"
+    date: "np.ndarray"
+    created_at: "np.ndarray"
+    cents: "np.ndarray"
+    flags: "np.ndarray"
+    offsets: "np.ndarray"
+    heap: memoryview
+
+    def row(self, i: int) -> dict:
+        """One transaction, shaped like TransactionRead."""
+        flags = int(self.flags[i])
+        category_id = int(self.category_id[i])
+        description = None
+        if not flags & FLAG_NO_DESCRIPTION:
+            start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+            description = bytes(self.heap[start:end]).decode()
+        return {
+            "id": int(self.id[i]),
+            "account_id": int(self.account_id[i]),
+            "category_id": None if category_id == NO_CATEGORY else category_id,
+            "amount": Decimal(int(self.cents[i])).scaleb(-2),
+            "transaction_type": "income" if flags & FLAG_INCOME else "expense",
+            "description": description,
+            "date": from_micros(self.date[i]),
+            "created_at": from_micros(self.created_at[i]),
+        }
+
+
+def _segments(buffer, length: int, path: Path) -> list[Segment]:
+    """Views of every segment in buffer[:length] (writable if buffer is)."""
+    import numpy as np
+
+    segments = []
+    pos = 0
+    while pos < length:
+        magic, n, heap_len = HEADER.unpack_from(buffer, pos)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: bad segment header at byte {pos}")
+        pos += HEADER.size
+        columns = {}
+        for name in _INT_COLUMNS:
+            columns[name] = np.frombuffer(buffer, "<i8", n, pos)
+            pos += 8 * n
+        flags = np.frombuffer(buffer, "u1", n, pos)
+        pos += n + _pad(n)
+        offsets = np.frombuffer(buffer, "<i8", n + 1, pos)
+        pos += 8 * (n + 1)
+        heap = memoryview(buffer)[pos : pos + heap_len]
+        pos += heap_len + _pad(heap_len)
+        segments.append(Segment(**columns, flags=flags, offsets=offsets, heap=heap))
+    return segments
+
+
+class ArchiveFile:
+    """Zero-copy, read-only view of the first `length` bytes of an archive."""
+
+    def __init__(self, path: Path, length: int):
+        self.length = length
+        self.segments: list[Segment] = []
+        if length == 0:
+            return
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+        self.segments = _segments(self._map, length, path)
+
+
+_open_files: dict[int, ArchiveFile] = {}
+_open_lock = threading.Lock()
+
+
+def _open(user_id: int, length: int) -> ArchiveFile:
+    """Mapped archive of `user_id`, remapped when the committed length grows."""
+    with _open_lock:
+        archive = _open_files.get(user_id)
+        if archive is None or archive.length != length:
+            archive = _open_files[user_id] = ArchiveFile(archive_path(user_id), length)
+        return archive
+
+
+def clear_cache() -> None:
+    with _open_lock:
+        _open_files.clear()
+
+
+# ── Queries ─────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class ArchiveFilter:
+    account_ids: list[int]
+    transaction_type: str | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    category_id: int | None = None
+
+
+def _archive_for(db: Session, user_id: int, f: ArchiveFilter) -> ArchiveFile | None:
+    """The user's archive, or None when it cannot hold a matching row."""
+    state = db.get(TransactionArchive, user_id)
+    if state is None or not state.rows or not f.account_ids:
+        return None
+    if f.start is not None and to_micros(f.start) >= to_micros(state.archived_before):
+        return None
+    return _open(user_id, state.file_bytes)
+
+
+def _masks(archive: ArchiveFile, f: ArchiveFilter):
+    import numpy as np
+
+    owned = np.asarray(f.account_ids, dtype=np.int64)
+    start = None if f.start is None else to_micros(f.start)
+    end = None if f.end is None else to_micros(f.end)
+    for seg in archive.segments:
+        mask = np.isin(seg.account_id, owned)
+        if f.category_id is not None:
+            mask &= seg.category_id == f.category_id
+        if f.transaction_type is not None:
+            income = (seg.flags & FLAG_INCOME) != 0
+            if f.transaction_type == "income":
+                mask &= income
+            elif f.transaction_type == "expense":
+                mask &= ~income
+            else:
+                mask[:] = False
+        if start is not None:
+            mask &= seg.date >= start
+        if end is not None:
+            mask &= seg.date <= end
+        yield seg, mask
+
+
+def latest(db: Session, user_id: int, f: ArchiveFilter, limit: int) -> list[dict]:
+    """Up to `limit` matching archived transactions, newest first."""
+    import numpy as np
+
+    archive = _archive_for(db, user_id, f)
+    if archive is None or limit <= 0:
+        return []
+    candidates = []
+    for seg, mask in _masks(archive, f):
+        idx = np.flatnonzero(mask)
+        if len(idx) > limit:
+            idx = idx[np.argpartition(-seg.date[idx], limit - 1)[:limit]]
+        candidates += [(int(seg.date[i]), int(seg.id[i]), seg, i) for i in idx]
+    candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+    return [seg.row(i) for _, _, seg, i in candidates[:limit]]
+
+
+def totals(db: Session, user_id: int, f: ArchiveFilter) -> tuple[Decimal, Decimal]:
+    """(income, expenses) of matching archived rows; expenses are negative."""
+    income = expenses = 0
+    archive = _archive_for(db, user_id, f)
+    if archive is not None:
+        for seg, mask in _masks(archive, f):
+            is_income = (seg.flags & FLAG_INCOME) != 0
+            income += int(seg.cents[mask & is_income].sum())
+            expenses += int(seg.cents[mask & ~is_income].sum())
+    return Decimal(income).scaleb(-2), Decimal(expenses).scaleb(-2)
+
+
+def matching_columns(db: Session, user_id: int, f: ArchiveFilter) -> dict:
+    """
+    account_id, category_id (NO_CATEGORY if none), day (datetime64[D]),
+    cents and income columns of matches.
+    """
+    import numpy as np
+
+    columns: dict[str, list] = {
+        "account_id": [],
+        "category_id": [],
+        "day": [],
+        "cents": [],
+        "income": [],
+    }
+    archive = _archive_for(db, user_id, f)
+    if archive is not None:
+        for seg, mask in _masks(archive, f):
+            columns["account_id"].append(seg.account_id[mask])
+            columns["category_id"].append(seg.category_id[mask])
+            columns["day"].append(seg.date[mask])
+            columns["cents"].append(seg.cents[mask])
+            columns["income"].append((seg.flags[mask] & FLAG_INCOME) != 0)
+    dtypes = {
+        "account_id": "<i8",
+        "category_id": "<i8",
+        "day": "<i8",
+        "cents": "<i8",
+        "income": bool,
+    }
+    out = {
+        name: np.concatenate(parts) if parts else np.array([], dtype=dtypes[name])
+        for name, parts in columns.items()
+    }
+    out["day"] = out["day"].astype("datetime64[us]").astype("datetime64[D]")
+    return out
+
+
+def oldest_first(db: Session, user_id: int, f: ArchiveFilter) -> list[dict]:
+    """Every matching archived transaction, oldest first."""
+    import numpy as np
+
+    archive = _archive_for(db, user_id, f)
+    if archive is None:
+        return []
+    candidates = [
+        (int(seg.date[i]), int(seg.id[i]), seg, i)
+        for seg, mask in _masks(archive, f)
+        for i in np.flatnonzero(mask)
+    ]
+    candidates.sort(key=lambda c: (c[0], c[1]))
+    return [seg.row(i) for _, _, seg, i in candidates]
+
+
+def find(db: Session, user_id: int, tx_id: int, account_ids: list[int]) -> dict | None:
+    import numpy as np
+
+    archive = _archive_for(db, user_id, ArchiveFilter(account_ids))
+    if archive is None:
+        return None
+    for seg, mask in _masks(archive, ArchiveFilter(account_ids)):
+        hits = np.flatnonzero((seg.id == tx_id) & mask)
+        if len(hits):
+            return seg.row(int(hits[0]))
+    return None
+
+
+# ── Archiving job ───────────────────────────────────────────────────────────
+
+
+def cutoff_for(now: datetime, months: int) -> datetime:
+    """First day of the month `months` months before `now` (naive UTC)."""
+    index = now.year * 12 + now.month - 1 - months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def archive_user(db: Session, user_id: int, cutoff: datetime) -> int:
+    """Move the user's transactions dated before `cutoff`; returns rows moved."""
+    state = db.get(TransactionArchive, user_id)
+    committed = state.file_bytes if state else 0
+    path = archive_path(user_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    size = path.stat().st_size if path.exists() else 0
+    if size < committed:
+        raise RuntimeError(f"{path} is shorter than its committed length")
+    if size > committed:
+        # A previous run appended but never committed: its rows are still hot
+        os.truncate(path, committed)
+
+    Tx = partitions.transactions(db, end=cutoff)
+    rows = db.execute(
+        select(
+            Tx.id,
+            Tx.account_id,
+            Tx.category_id,
+            Tx.date,
+            Tx.created_at,
+            Tx.amount,
+            Tx.transaction_type,
+            Tx.description,
+        )
+        .join(Account, Account.id == Tx.account_id)
+        .where(Account.owner_id == user_id, Tx.date < cutoff)
+        .order_by(Tx.date, Tx.id)
+    ).all()
+    if not rows:
+        return 0
+
+    segment = encode_segment(rows)
+    with open(path, "ab") as f:
+        f.write(segment)
+        f.flush()
+        os.fsync(f.fileno())
+
+    ids = [row[0] for row in rows]
+    for i in range(0, len(ids), _DELETE_BATCH):
+        db.execute(
+            delete(Transaction).where(Transaction.id.in_(ids[i : i + _DELETE_BATCH]))
+        )
+        partitions.delete_by_column(db, "id", ids[i : i + _DELETE_BATCH])
+
+    if state is None:
+        state = TransactionArchive(owner_id=user_id, rows=0, file_bytes=0)
+        db.add(state)
+    if state.archived_before is None or state.archived_before < cutoff:
+        state.archived_before = cutoff
+    state.rows += len(rows)
+    state.file_bytes = committed + len(segment)
+    state.updated_at = datetime.now(timezone.utc)
+    bump_data_version(db, user_id)
+    db.commit()
+    return len(rows)
+
+
+def rekey(
+    user_id: int, length: int, accounts: dict[int, int], categories: dict[int, int]
+) -> Path:
+    """
+    Copy of the user's archive with account and category ids mapped through
+    `accounts`/`categories` (for a user moving shards, where both get new
+    ids).  Written next to the archive; the caller swaps it in.
+    """
+    import numpy as np
+
+    path = archive_path(user_id)
+    data = bytearray(path.read_bytes()[:length])
+    for seg in _segments(data, length, path):
+        for column, mapping in (
+            (seg.account_id, accounts),
+            (seg.category_id, categories),
+        ):
+            values, inverse = np.unique(column, return_inverse=True)
+            column[:] = np.array(
+                [mapping.get(int(v), int(v)) for v in values], dtype="<i8"
+            )[inverse]
+    moved = path.with_suffix(".moving")
+    moved.write_bytes(data)
+    return moved
+
+
+def max_id(user_id: int, length: int) -> int:
+    """Highest transaction id in the first `length` bytes of the user's archive."""
+    return max(
+        (int(seg.id.max()) for seg in _open(user_id, length).segments), default=0
+    )
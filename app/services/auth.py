@@ -28,4 +28,6 @@ def get_current_user(
     if user is None or not user.is_active:
         raise credentials_exception
 
+    # Route the rest of this request's queries to the user's shard
+    db.info["shard"] = user.shard
     return user
@@ -0,0 +1,102 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import partitions
+from app.models.account import Account
+from app.models.budget import Budget
+from app.models.transaction import Category
+from app.schemas.budget import BudgetStatus
+
+
+def month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    """[start, end) of a calendar month."""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def budgets_with_names(
+    db: Session, user_id: int, year: int, month: int
+) -> list[tuple[Budget, str]]:
+    # Category names come with the budgets — no lazy load per row
+    return (
+        db.query(Budget, Category.name)
+        .join(Category, Category.id == Budget.category_id)
+        .filter(
+            Budget.owner_id == user_id,
+            Budget.year == year,
+            Budget.month == month,
+        )
+        .all()
+    )
+
+
+def build_status(
+    budgets: list[tuple[Budget, str]], spent_by_category: dict
+) -> list[BudgetStatus]:
+    """Combine budgets with the month's (negative) expense sums per category."""
+    result = []
+    for b, category_name in budgets:
+        budget_amt = b.amount
+        spent = abs(spent_by_category.get(b.category_id) or Decimal(0))
+        remaining = budget_amt - spent
+        percent_used = float(spent / budget_amt * 100) if budget_amt > 0 else 0.0
+
+        result.append(
+            BudgetStatus(
+                category_id=b.category_id,
+                category_name=category_name,
+                budget=budget_amt,
+                spent=spent,
+                remaining=remaining,
+                percent_used=round(percent_used, 1),
+                over_budget=spent > budget_amt,
+            )
+        )
+    return result
+
+
+def crossed_thresholds(
+    db: Session, user_id: int, category_id: int, when: datetime, amount: Decimal
+) -> list[tuple[Budget, float]]:
+    """
+    (budget, threshold) pairs for each BUDGET_ALERT_THRESHOLDS share of the
+    month's budget that a new expense of `amount` pushed spending past.
+    """
+    budget = (
+        db.query(Budget)
+        .filter(
+            Budget.owner_id == user_id,
+            Budget.year == when.year,
+            Budget.month == when.month,
+            Budget.category_id == category_id,
+        )
+        .first()
+    )
+    if budget is None or budget.amount <= 0:
+        return []
+
+    start, end = month_bounds(when.year, when.month)
+    Tx = partitions.transactions(db, start, end)
+    spent = abs(
+        db.query(func.coalesce(func.sum(Tx.amount), 0))
+        .join(Account, Account.id == Tx.account_id)
+        .filter(
+            Account.owner_id == user_id,
+            Tx.category_id == category_id,
+            Tx.transaction_type == "expense",
+            Tx.date >= start,
+            Tx.date < end,
+        )
+        .scalar()
+    )
+    before = spent - abs(amount)
+    return [
+        (budget, share)
+        for share in settings.BUDGET_ALERT_THRESHOLDS
+        if before < budget.amount * Decimal(str(share)) <= spent
+    ]
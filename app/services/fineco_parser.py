@@ -14,8 +14,6 @@ Actual column names (row 13 in the file):
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 
-import openpyxl
-
 
 _COL_DATE = "data_operazione"
 _COL_INCOME = "entrate"
@@ -61,6 +59,9 @@ def parse_fineco_excel(file_bytes: bytes) -> list[dict]:
     """
     import io
 
+    # openpyxl is heavy to import and only needed here — load it on first use
+    import openpyxl
+
     wb = openpyxl.load_workbook(io.BytesIO(file_bytes), data_only=True)
     ws = wb.active
 
@@ -98,18 +99,22 @@ def parse_fineco_excel(file_bytes: bytes) -> list[dict]:
         description = str(row[col_map[desc_col]] or "").strip() or None
 
         if income is not None:
-            transactions.append({
-                "date": date,
-                "amount": income,
-                "transaction_type": "income",
-                "description": description,
-            })
+            transactions.append(
+                {
+                    "date": date,
+                    "amount": income,
+                    "transaction_type": "income",
+                    "description": description,
+                }
+            )
         else:
-            transactions.append({
-                "date": date,
-                "amount": expense,
-                "transaction_type": "expense",
-                "description": description,
-            })
+            transactions.append(
+                {
+                    "date": date,
+                    "amount": expense,
+                    "transaction_type": "expense",
+                    "description": description,
+                }
+            )
 
     return transactions
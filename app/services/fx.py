@@ -0,0 +1,237 @@
+"""
+Currency conversion over a cached, date-indexed FX rate table.
+
+Rates are units of a currency per one FX_BASE_CURRENCY, the convention of
+the ECB reference rates `load_csv()` imports.  `rate_table()` reads the
+whole table once into per-currency NumPy arrays (days sorted, rates
+aligned) and keeps it in memory for FX_CACHE_TTL_SECONDS.
+
+Conversion is columnar: callers aggregate per (key, currency, day) in SQL
+and hand `sum_converted()` the resulting columns.  Every amount is converted
+at the latest rate on or before its day — the earliest known rate for days
+before the table starts — with one `searchsorted` per currency, then summed
+per key with a bincount.  No per-row lookups.
+"""
+
+import csv
+import threading
+import time
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.fx import FxRate
+
+# numpy is imported where it is used: importing the app doesn't load it
+if TYPE_CHECKING:
+    import numpy as np
+
+CENT = Decimal("0.01")
+
+
+class RateTable:
+    def __init__(self, rows):
+        """`rows` of (day, currency, rate), sorted by currency then day."""
+        import numpy as np
+
+        days: dict[str, list] = {}
+        rates: dict[str, list] = {}
+        for day, currency, rate in rows:
+            days.setdefault(currency, []).append(day)
+            rates.setdefault(currency, []).append(float(rate))
+        self._days = {c: np.array(d, dtype="datetime64[D]") for c, d in days.items()}
+        self._rates = {c: np.array(r, dtype=np.float64) for c, r in rates.items()}
+
+    def __contains__(self, currency: str) -> bool:
+        return currency == settings.FX_BASE_CURRENCY or currency in self._days
+
+    def rates(self, currency: str, days: "np.ndarray") -> "np.ndarray":
+        """Rate of `currency` in effect on each of `days`."""
+        import numpy as np
+
+        if currency == settings.FX_BASE_CURRENCY:
+            return np.ones(len(days))
+        if currency not in self._days:
+            raise HTTPException(
+                status_code=422, detail=f"No exchange rates for {currency}"
+            )
+        idx = np.searchsorted(self._days[currency], days, side="right") - 1
+        return self._rates[currency][np.maximum(idx, 0)]
+
+
+_table: RateTable | None = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def rate_table(db: Session) -> RateTable:
+    global _table, _loaded_at
+    with _lock:
+        if (
+            _table is None
+            or time.monotonic() - _loaded_at > settings.FX_CACHE_TTL_SECONDS
+        ):
+            rows = db.execute(
+                select(FxRate.day, FxRate.currency, FxRate.rate).order_by(
+                    FxRate.currency, FxRate.day
+                )
+            ).all()
+            _table, _loaded_at = RateTable(rows), time.monotonic()
+        return _table
+
+
+def clear_cache() -> None:
+    global _table
+    with _lock:
+        _table = None
+
+
+def needs_conversion(currencies, target: str | None) -> bool:
+    """Whether amounts in `currencies` must be converted to report in `target`."""
+    return target is not None and bool(set(currencies) - {target})
+
+
+def convert(
+    db: Session,
+    currencies: "np.ndarray",
+    days: "np.ndarray",
+    amounts: "np.ndarray",
+    target: str,
+) -> "np.ndarray":
+    """`amounts` (in `currencies`) expressed in `target` at each day's rate."""
+    import numpy as np
+
+    table = rate_table(db)
+    if target not in table:
+        raise HTTPException(status_code=422, detail=f"No exchange rates for {target}")
+    out = amounts * table.rates(target, days)
+    for currency in np.unique(currencies):
+        mask = currencies == currency
+        out[mask] /= table.rates(str(currency), days[mask])
+    return out
+
+
+def sum_converted(
+    db: Session,
+    keys: "np.ndarray",
+    currencies: "np.ndarray",
+    days: "np.ndarray",
+    amounts: "np.ndarray",
+    target: str,
+) -> dict:
+    """Converted `amounts` summed per key, as Decimals rounded to the cent."""
+    import numpy as np
+
+    if len(keys) == 0:
+        return {}
+    converted = convert(db, currencies, days, amounts, target)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=converted, minlength=len(unique))
+    return {
+        key: Decimal(repr(float(total))).quantize(CENT)
+        for key, total in zip(unique, sums, strict=True)
+    }
+
+
+def columns(rows) -> "tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]":
+    """Rows of (key, currency, day, amount) → the four columns as arrays."""
+    import numpy as np
+
+    if not rows:
+        return (
+            np.array([], dtype=object),
+            np.array([], dtype=object),
+            np.array([], dtype="datetime64[D]"),
+            np.array([], dtype=np.float64),
+        )
+    keys, currencies, days, amounts = zip(*rows, strict=True)
+    return (
+        np.array(keys, dtype=object),
+        np.array(currencies, dtype=object),
+        np.array(days, dtype="datetime64[D]"),
+        np.array(amounts, dtype=np.float64),
+    )
+
+
+def convert_frame(db: Session, frame, currency_of: dict[int, str], target: str):
+    """An analytics Frame with `cents` converted to `target`."""
+    import numpy as np
+
+    if len(frame) == 0:
+        return frame
+    per_account = np.array(
+        [currency_of.get(int(a), target) for a in frame.account_ids], dtype=object
+    )
+    cents = convert(
+        db,
+        per_account[frame.account],
+        frame.days,
+        frame.cents.astype(np.float64),
+        target,
+    )
+    return replace(frame, cents=np.rint(cents).astype(np.int64))
+
+
+# ── Loading ─────────────────────────────────────────────────────────────────
+
+
+def _parse_csv(path: Path):
+    """
+    (day, currency, rate) from either an ECB-style wide file (Date,USD,JPY,…
+    one row per day; blank or N/A for missing) or a long one with the
+    columns date,currency,rate.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        long_format = [h.lower() for h in header[:3]] == ["date", "currency", "rate"]
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            day = date.fromisoformat(row[0].strip())
+            if long_format:
+                yield day, row[1].strip().upper(), Decimal(row[2].strip())
+                continue
+            for currency, value in zip(header[1:], row[1:], strict=False):
+                value = value.strip()
+                if currency and value and value.upper() != "N/A":
+                    yield day, currency.upper(), Decimal(value)
+
+
+def load_csv(db: Session, path: Path, batch_size: int = 5000) -> int:
+    """Upsert every rate in the file; returns the number of rates loaded."""
+    if db.get_bind(FxRate.__mapper__).dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    loaded = 0
+    batch = []
+
+    def flush():
+        stmt = insert(FxRate).values(batch)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["day", "currency"], set_={"rate": stmt.excluded.rate}
+            )
+        )
+
+    for day, currency, rate in _parse_csv(path):
+        batch.append({"day": day, "currency": currency, "rate": rate})
+        if len(batch) == batch_size:
+            flush()
+            loaded += len(batch)
+            batch = []
+    if batch:
+        flush()
+        loaded += len(batch)
+    db.commit()
+    clear_cache()
+    return loaded
@@ -0,0 +1,330 @@
+"""
+Ledger reconciliation: is `Account.balance` still the account's opening
+balance plus the sum of its transactions?
+
+The balance is a cached value adjusted by several write paths.  Checking it
+against SUM(amount) would read every transaction, so sums and counts are
+kept per account and (UTC) month in `ledger_checkpoints`.  Writes that
+change a month's transactions call `mark()`, which flags its checkpoint in
+the same transaction; `reconcile()` recomputes only the flagged months —
+live rows, partitions and the archive — and compares the balance with the
+opening balance plus every checkpoint.  `full=True` recomputes all months,
+and also reports months whose rows changed without going through `mark()`.
+
+Accounts created before checkpoints existed have no opening balance yet:
+their first reconciliation is a full one that takes the current balance as
+correct.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, delete, func, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from app.db import partitions
+from app.db.types import epoch_day
+from app.db.writes import upsert
+from app.models.account import Account
+from app.models.ledger import LedgerCheckpoint
+from app.services import archive
+
+_EPOCH_DAY = date(1970, 1, 1)
+
+
+@dataclass
+class MonthCheck:
+    month: date
+    total: Decimal
+    count: int
+    recorded_total: Decimal
+    recorded_count: int
+
+
+@dataclass
+class Reconciliation:
+    account_id: int
+    balance: Decimal
+    expected_balance: Decimal
+    months_checked: int
+    full: bool
+    repaired: bool = False
+    # Months whose rows changed without being marked (full runs only)
+    mismatched_months: list[MonthCheck] = field(default_factory=list)
+
+    @property
+    def drift(self) -> Decimal:
+        return self.balance - self.expected_balance
+
+
+def month_of(when: datetime) -> date:
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc)
+    return date(when.year, when.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def mark(db: Session, changes: Iterable[tuple[int, datetime]]) -> None:
+    """
+    Flag the months of (account_id, date) pairs as changed (call before
+    committing).  One statement, however many pairs.
+    """
+    months = sorted({(account_id, month_of(when)) for account_id, when in changes})
+    upsert(
+        db,
+        LedgerCheckpoint,
+        [
+            {"account_id": a, "month": m, "total": 0, "count": 0, "dirty": True}
+            for a, m in months
+        ],
+        ["account_id", "month"],
+        {"dirty": True},
+    )
+
+
+def forget(db: Session, account_id: int) -> None:
+    """Drop an account's checkpoints (before deleting the account)."""
+    db.execute(
+        delete(LedgerCheckpoint).where(LedgerCheckpoint.account_id == account_id)
+    )
+
+
+# ── Month sums ──────────────────────────────────────────────────────────────
+
+
+def _month_sums(
+    db: Session, account: Account, start: date | None = None, end: date | None = None
+) -> dict[date, list[int]]:
+    """{month: [cents, rows]} of the account's transactions in [start, end)."""
+    import numpy as np
+
+    lo = None if start is None else datetime.combine(start, datetime.min.time())
+    hi = None if end is None else datetime.combine(end, datetime.min.time())
+    Tx = partitions.transactions(db, lo, hi)
+    q = select(
+        epoch_day(Tx.date), func.sum(type_coerce(Tx.amount, BigInteger)), func.count()
+    ).where(Tx.account_id == account.id)
+    if lo is not None:
+        q = q.where(Tx.date >= lo)
+    if hi is not None:
+        q = q.where(Tx.date < hi)
+
+    sums: dict[date, list[int]] = defaultdict(lambda: [0, 0])
+    for day, cents, rows in db.execute(q.group_by(epoch_day(Tx.date))):
+        month = _EPOCH_DAY + timedelta(days=day)
+        sums[month.replace(day=1)][0] += cents
+        sums[month.replace(day=1)][1] += rows
+
+    archived = archive.matching_columns(
+        db,
+        account.owner_id,
+        archive.ArchiveFilter(
+            [account.id], None, lo, None if hi is None else hi - timedelta.resolution
+        ),
+    )
+    if len(archived["cents"]):
+        months, inverse = np.unique(
+            archived["day"].astype("datetime64[M]"), return_inverse=True
+        )
+        cents = np.zeros(len(months), dtype=np.int64)
+        np.add.at(cents, inverse, archived["cents"])
+        for month, total, rows in zip(
+            months.astype(object), cents, np.bincount(inverse)
+        ):
+            sums[month][0] += int(total)
+            sums[month][1] += int(rows)
+    return sums
+
+
+# ── Reconciliation ──────────────────────────────────────────────────────────
+
+
+def _claim_dirty(db: Session, account_id: int) -> list[date]:
+    """Clear and return the account's flagged months."""
+    claim = (
+        update(LedgerCheckpoint)
+        .where(LedgerCheckpoint.account_id == account_id, LedgerCheckpoint.dirty)
+        .values(dirty=False)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind(LedgerCheckpoint.__mapper__).dialect.update_returning:
+        return list(db.scalars(claim.returning(LedgerCheckpoint.month)))
+    months = list(
+        db.scalars(
+            select(LedgerCheckpoint.month).where(
+                LedgerCheckpoint.account_id == account_id, LedgerCheckpoint.dirty
+            )
+        )
+    )
+    db.execute(claim)
+    return months
+
+
+def reconcile(
+    db: Session, account_id: int, full: bool = False, repair: bool = False
+) -> Reconciliation:
+    """
+    Bring the account's checkpoints up to date and compare its balance with
+    them; with `repair`, a drifted balance is reset to the expected one.
+    The caller commits.
+    """
+    # Lock the account before the checkpoints, in the write paths' order.  A
+    # no-op UPDATE is a row lock on PostgreSQL and takes the database write
+    # lock on SQLite, so the balance and the sums are read consistently.
+    db.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(balance=Account.balance)
+        .execution_options(synchronize_session=False)
+    )
+    account = db.execute(
+        select(Account).where(Account.id == account_id),
+        execution_options={"populate_existing": True},
+    ).scalar_one()
+    full = full or account.opening_balance is None
+
+    recorded = {}
+    if full:
+        recorded = {
+            c.month: (int(c.total.scaleb(2)), c.count)
+            for c in db.scalars(
+                select(LedgerCheckpoint).where(
+                    LedgerCheckpoint.account_id == account_id
+                )
+            )
+        }
+    claimed = set(_claim_dirty(db, account_id))
+    sums: dict[date, list[int]] = {}
+    if full:
+        sums = dict(_month_sums(db, account))
+        sums.update((month, [0, 0]) for month in recorded.keys() - sums.keys())
+        _store(db, account_id, sums)
+        months = set()
+    else:
+        months = claimed
+    # Then the flagged months — again if flagged meanwhile (PostgreSQL)
+    while months:
+        for month in months:
+            found = _month_sums(db, account, month, _next_month(month))
+            sums[month] = found.get(month, [0, 0])
+        _store(db, account_id, {month: sums[month] for month in months})
+        months = set(_claim_dirty(db, account_id))
+
+    result = Reconciliation(
+        account_id=account_id,
+        balance=account.balance,
+        expected_balance=account.balance,
+        months_checked=len(sums),
+        full=full,
+    )
+    if full and account.opening_balance is not None:
+        for month, (cents, rows) in sorted(sums.items()):
+            old_cents, old_rows = recorded.get(month, (0, 0))
+            if month not in claimed and (cents, rows) != (old_cents, old_rows):
+                result.mismatched_months.append(
+                    MonthCheck(
+                        month,
+                        Decimal(cents).scaleb(-2),
+                        rows,
+                        Decimal(old_cents).scaleb(-2),
+                        old_rows,
+                    )
+                )
+
+    total = db.scalar(
+        select(func.coalesce(func.sum(LedgerCheckpoint.total), 0)).where(
+            LedgerCheckpoint.account_id == account_id
+        )
+    )
+    if account.opening_balance is None:
+        # First reconciliation: the current balance is the baseline
+        account.opening_balance = account.balance - total
+    result.expected_balance = account.opening_balance + total
+    if repair and result.drift:
+        account.balance = result.expected_balance
+        result.repaired = True
+    db.flush()
+    return result
+
+
+def _store(db: Session, account_id: int, sums: dict[date, list[int]]) -> None:
+    empty = [month for month, (_, rows) in sums.items() if not rows]
+    if empty:
+        db.execute(
+            delete(LedgerCheckpoint).where(
+                LedgerCheckpoint.account_id == account_id,
+                LedgerCheckpoint.month.in_(empty),
+            )
+        )
+    now = datetime.now(timezone.utc)
+    upsert(
+        db,
+        LedgerCheckpoint,
+        [
+            {
+                "account_id": account_id,
+                "month": month,
+                "total": Decimal(cents).scaleb(-2),
+                "count": rows,
+                "dirty": False,
+                "verified_at": now,
+            }
+            for month, (cents, rows) in sorted(sums.items())
+            if rows
+        ],
+        ["account_id", "month"],
+    )
+
+
+def reconcile_all(db: Session, repair: bool = False) -> list[Reconciliation]:
+    """
+    Reconcile every account in the database; returns the drifted ones.
+
+    Only accounts with flagged months (or no opening balance yet) have
+    transactions read; every other balance is compared with its checkpoints
+    in a single query.  Each account is committed on its own.
+    """
+    pending = set(
+        db.scalars(
+            select(LedgerCheckpoint.account_id).where(LedgerCheckpoint.dirty).distinct()
+        )
+    )
+    pending.update(
+        db.scalars(select(Account.id).where(Account.opening_balance.is_(None)))
+    )
+    drifted = []
+    for account_id in sorted(pending):
+        result = reconcile(db, account_id, repair=repair)
+        db.commit()
+        if result.drift:
+            drifted.append(result)
+
+    totals = (
+        select(
+            LedgerCheckpoint.account_id, func.sum(LedgerCheckpoint.total).label("total")
+        )
+        .group_by(LedgerCheckpoint.account_id)
+        .subquery()
+    )
+    suspects = db.scalars(
+        select(Account.id)
+        .outerjoin(totals, totals.c.account_id == Account.id)
+        .where(
+            Account.balance
+            != Account.opening_balance + func.coalesce(totals.c.total, 0)
+        )
+    ).all()
+    for account_id in suspects:
+        if account_id in pending:
+            continue
+        result = reconcile(db, account_id, repair=repair)
+        db.commit()
+        if result.drift:
+            drifted.append(result)
+    return drifted
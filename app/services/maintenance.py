@@ -0,0 +1,336 @@
+"""
+Background database maintenance (MAINTENANCE_ENABLED=true).
+
+Every worker runs a `Scheduler` from the app's lifespan.  Each tick it looks
+for tasks whose interval has passed on a database (the main one and every
+shard) and runs them, provided:
+
+* the database is quiet — no request holds a pooled connection and none
+  returned one in the last MAINTENANCE_QUIET_SECONDS;
+* this worker wins the task's lease row in `maintenance_leases`, a
+  conditional UPDATE that only one worker's statement can match.  A worker
+  that dies mid-task leaves a lease that runs out after
+  MAINTENANCE_LEASE_SECONDS.
+
+Tasks keep write locks short: `PRAGMA optimize` analyses at most
+`analysis_limit` rows per index, the WAL checkpoint is PASSIVE (it never
+waits for or blocks writers) and incremental vacuum frees a few hundred
+pages per transaction, pausing in between.  Each run's duration and result
+are stored on its lease row and exported as `maintenance_task_seconds`.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import anyio.to_thread
+from sqlalchemy import event, insert, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.maintenance import MaintenanceLease
+from app.services import ledger, tokens
+
+logger = logging.getLogger(__name__)
+
+_leases = MaintenanceLease.__table__
+
+# Leftovers of an interrupted shard move (archive.rekey) older than this go
+_STALE_MOVE_SECONDS = 86_400
+# Pause between incremental-vacuum steps so queued writers get the lock
+_VACUUM_PAUSE = 0.05
+
+
+# ── Tasks ───────────────────────────────────────────────────────────────────
+
+
+def optimize(target: Engine, deadline: float) -> str:
+    """Refresh planner statistics for tables whose contents have changed."""
+    if target.dialect.name == "sqlite":
+        with target.connect() as conn:
+            conn.exec_driver_sql("PRAGMA analysis_limit = 400")
+            conn.exec_driver_sql("PRAGMA optimize")
+        return "optimized"
+    with target.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return "analyzed"
+
+
+def wal_checkpoint(target: Engine, deadline: float) -> str:
+    """Copy the write-ahead log back into the database file (SQLite WAL mode)."""
+    if target.dialect.name != "sqlite":
+        return "skipped: not sqlite"
+    with target.connect() as conn:
+        mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        if mode != "wal":
+            return f"skipped: journal_mode={mode}"
+        busy, log, done = conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)").one()
+    return f"checkpointed {done}/{log} frames" + (" (busy)" if busy else "")
+
+
+def incremental_vacuum(target: Engine, deadline: float) -> str:
+    """Return free pages to the filesystem (SQLite auto_vacuum=INCREMENTAL)."""
+    if target.dialect.name != "sqlite":
+        return "skipped: not sqlite"
+    freed = 0
+    with target.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            return "skipped: auto_vacuum is not incremental"
+        free = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        while free and time.monotonic() < deadline:
+            # sqlite3's execute() steps this pragma once, freeing one page;
+            # executescript() runs it to completion, in its own transaction
+            conn.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({settings.MAINTENANCE_VACUUM_PAGES})"
+            )
+            left = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            freed += free - left
+            free = left
+            if free:
+                time.sleep(_VACUUM_PAUSE)
+    return f"freed {freed} pages, {free} left"
+
+
+def cleanup(target: Engine, deadline: float) -> str:
+    """Delete expired profiles and leftovers of interrupted archive rewrites."""
+    now = time.time()
+    expired = [
+        *_older_than(
+            Path(settings.PROFILING_DIR),
+            "*",
+            now - settings.MAINTENANCE_PROFILE_RETENTION_DAYS * 86_400,
+        ),
+        *_older_than(Path(settings.ARCHIVE_DIR), "*.moving", now - _STALE_MOVE_SECONDS),
+    ]
+    for path in expired:
+        path.unlink(missing_ok=True)
+    return f"removed {len(expired)} files"
+
+
+def reconcile(target: Engine, deadline: float) -> str:
+    """Check account balances against their ledger checkpoints (report only)."""
+    with Session(target) as db:
+        drifted = ledger.reconcile_all(db)
+    for result in drifted:
+        logger.warning(
+            "account %s: balance %s, ledger says %s",
+            result.account_id,
+            result.balance,
+            result.expected_balance,
+        )
+    return f"{len(drifted)} accounts drifted"
+
+
+def expire_tokens(target: Engine, deadline: float) -> str:
+    """Delete expired refresh tokens (they live in the main database)."""
+    return f"deleted {tokens.purge_expired(target)} tokens"
+
+
+def _older_than(directory: Path, pattern: str, cutoff: float) -> list[Path]:
+    if not directory.is_dir():
+        return []
+    return [
+        p for p in directory.glob(pattern) if p.is_file() and p.stat().st_mtime < cutoff
+    ]
+
+
+@dataclass(frozen=True)
+class Task:
+    run: Callable[[Engine, float], str]
+    # Tasks that don't depend on a database's contents run on the main one only
+    main_only: bool = False
+
+
+TASKS: dict[str, Task] = {
+    "optimize": Task(optimize),
+    "wal_checkpoint": Task(wal_checkpoint),
+    "incremental_vacuum": Task(incremental_vacuum),
+    "cleanup": Task(cleanup, main_only=True),
+    "reconcile": Task(reconcile),
+    "expire_tokens": Task(expire_tokens, main_only=True),
+}
+
+
+# ── Leases ──────────────────────────────────────────────────────────────────
+
+
+def acquire(
+    target: Engine,
+    task: str,
+    holder: str,
+    interval: float,
+    lease_seconds: float,
+    now: datetime | None = None,
+) -> bool:
+    """
+    Claim `task` on `target` for `lease_seconds` if nobody holds it and its
+    last run finished at least `interval` seconds ago.  True when claimed.
+    """
+    now = now or datetime.now(timezone.utc)
+    claim = {
+        "holder": holder,
+        "expires_at": now + timedelta(seconds=lease_seconds),
+        "last_started_at": now,
+    }
+    with target.begin() as conn:
+        claimed = conn.execute(
+            update(_leases)
+            .where(
+                _leases.c.task == task,
+                or_(_leases.c.expires_at.is_(None), _leases.c.expires_at <= now),
+                or_(
+                    _leases.c.last_finished_at.is_(None),
+                    _leases.c.last_finished_at <= now - timedelta(seconds=interval),
+                ),
+            )
+            .values(**claim)
+        ).rowcount
+        if claimed or conn.scalar(select(_leases.c.task).where(_leases.c.task == task)):
+            return bool(claimed)
+    # First run of this task on this database
+    try:
+        with target.begin() as conn:
+            conn.execute(insert(_leases).values(task=task, **claim))
+    except IntegrityError:
+        return False  # another worker inserted it first
+    return True
+
+
+def release(
+    target: Engine, task: str, holder: str, duration: float, result: str
+) -> None:
+    """Record the finished run and give up the lease."""
+    with target.begin() as conn:
+        conn.execute(
+            update(_leases)
+            .where(_leases.c.task == task, _leases.c.holder == holder)
+            .values(
+                holder=None,
+                expires_at=None,
+                last_finished_at=datetime.now(timezone.utc),
+                last_duration_ms=round(duration * 1000, 3),
+                last_result=result,
+            )
+        )
+
+
+# ── Activity ────────────────────────────────────────────────────────────────
+
+# Set on the scheduler's thread so its own connections don't count as traffic
+_maintenance_thread = threading.local()
+
+
+class Activity:
+    """Connections checked out by requests, and when one was last returned."""
+
+    def __init__(self, target: Engine):
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        event.listen(target, "checkout", self._checkout)
+        event.listen(target, "checkin", self._checkin)
+
+    def _checkout(self, dbapi_conn, record, proxy) -> None:
+        if not getattr(_maintenance_thread, "active", False):
+            record.info["maintenance_counted"] = True
+            self.in_use += 1
+
+    def _checkin(self, dbapi_conn, record) -> None:
+        if record.info.pop("maintenance_counted", False):
+            self.in_use -= 1
+            self.last_used = time.monotonic()
+
+    def quiet_for(self, seconds: float) -> bool:
+        return self.in_use <= 0 and time.monotonic() - self.last_used >= seconds
+
+
+# ── Scheduler ───────────────────────────────────────────────────────────────
+
+
+class Scheduler:
+    """Runs due TASKS on `engines` ({"main": engine, <shard>: engine, ...})."""
+
+    def __init__(
+        self,
+        engines: dict[str, Engine],
+        intervals: dict[str, float] | None = None,
+        quiet_seconds: float | None = None,
+        lease_seconds: float | None = None,
+    ):
+        self.engines = engines
+        self.intervals = (
+            settings.MAINTENANCE_INTERVALS if intervals is None else intervals
+        )
+        self.quiet_seconds = (
+            settings.MAINTENANCE_QUIET_SECONDS
+            if quiet_seconds is None
+            else quiet_seconds
+        )
+        self.lease_seconds = (
+            settings.MAINTENANCE_LEASE_SECONDS
+            if lease_seconds is None
+            else lease_seconds
+        )
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self.activity = {name: Activity(target) for name, target in engines.items()}
+
+    def tick(self) -> list[tuple[str, str, str]]:
+        """Run every due task once; returns (database, task, result) per run."""
+        runs = []
+        _maintenance_thread.active = True
+        try:
+            for database, target in self.engines.items():
+                for name, task in TASKS.items():
+                    interval = self.intervals.get(name, 0)
+                    if interval <= 0 or (task.main_only and database != "main"):
+                        continue
+                    if not self.activity[database].quiet_for(self.quiet_seconds):
+                        break
+                    result = self._run(database, target, name, task, interval)
+                    if result is not None:
+                        runs.append((database, name, result))
+        finally:
+            _maintenance_thread.active = False
+        return runs
+
+    def _run(self, database, target, name, task, interval) -> str | None:
+        if not acquire(target, name, self.holder, interval, self.lease_seconds):
+            return None
+        started = time.monotonic()
+        # Stop well before the lease runs out and another worker takes over
+        deadline = started + self.lease_seconds / 2
+        try:
+            result = task.run(target, deadline)
+            outcome = "ok"
+        except Exception as exc:
+            logger.exception("maintenance task %s failed on %s", name, database)
+            result = f"error: {exc}"
+            outcome = "error"
+        duration = time.monotonic() - started
+        release(target, name, self.holder, duration, result)
+        metrics.MAINTENANCE_DURATION.observe(duration, task=name, database=database)
+        metrics.MAINTENANCE_RUNS.inc(task=name, outcome=outcome)
+        logger.info(
+            "maintenance %s on %s: %s (%.3fs)", name, database, result, duration
+        )
+        return result
+
+    async def run(self, tick_seconds: float | None = None) -> None:
+        """Tick forever (until cancelled), sleeping `tick_seconds` in between."""
+        tick_seconds = tick_seconds or settings.MAINTENANCE_TICK_SECONDS
+        while True:
+            await asyncio.sleep(tick_seconds)
+            try:
+                await anyio.to_thread.run_sync(self.tick)
+            except Exception:
+                # Lease or database unavailable: try again next tick
+                logger.exception("maintenance tick failed")
@@ -0,0 +1,240 @@
+"""
+Moving users between shards.
+
+`move_user()` copies every row a user owns from one database to another,
+flips the user's directory entry, then deletes the originals.  Accounts and
+categories get fresh ids on the target (the source's ids may already be
+taken there) and every reference to them — transactions, budgets and the
+columnar archive — is rewritten on the way.  Transactions keep their ids,
+which archived rows share an id space with: the target's sequence is first
+moved past the user's hot and archived ids, and only a row whose id another
+user already holds there gets a fresh one, beyond all of them.  Other ids
+are not referenced across tables and are simply reassigned; the recurring
+watermark is not copied, so detection rebuilds on the target.
+
+A user's leftovers on the target from an interrupted move are deleted
+before copying, so a move can simply be retried.  Writes the user makes
+while being moved may be lost: rebalance when traffic is low.
+"""
+
+import os
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Table,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+)
+
+from app.core import cache
+from app.db import partitions
+from app.db.session import GLOBAL_TABLES, LOCAL_TABLES, Base, engine, shard_engines
+from app.db.sharding import assign_shard
+from app.db.writes import advance_ids
+from app.models.account import Account
+from app.models.archive import TransactionArchive
+from app.models.recurring import RecurringWatermark
+from app.models.user import User
+from app.services import archive
+
+# Tables whose new ids must be tracked because other moved rows point at them
+_REKEYED = ("accounts", "categories")
+# Tables whose ids are copied as is: the archive holds ids of the same space
+_KEPT = ("transactions",)
+# Derived state that the target rebuilds instead
+_SKIPPED = (RecurringWatermark.__tablename__,)
+_BATCH = 1000
+
+
+@dataclass
+class Move:
+    user_id: int
+    source: str | None
+    target: str | None
+    rows: int = 0
+
+
+def engine_for(shard: str | None) -> Engine:
+    return engine if shard is None else shard_engines[shard]
+
+
+def _user_tables() -> list[Table]:
+    return [
+        t
+        for t in Base.metadata.sorted_tables
+        if t.name not in GLOBAL_TABLES | LOCAL_TABLES
+    ]
+
+
+def _partition_tables(conn: Connection) -> list[Table]:
+    return [
+        partitions.partition_table(int(name[len(partitions.PREFIX) :]))
+        for name in inspect(conn).get_table_names()
+        if name.startswith(partitions.PREFIX)
+        and name[len(partitions.PREFIX) :].isdigit()
+    ]
+
+
+def _sources(conn: Connection, table: Table) -> list[Table]:
+    """`table` plus, for transactions, the yearly partitions present in `conn`."""
+    if table.name == "transactions":
+        return [table, *_partition_tables(conn)]
+    return [table]
+
+
+def _owned_by(table: Table, user_id: int, account_ids: list[int]):
+    if "owner_id" in table.c:
+        return table.c.owner_id == user_id
+    return table.c.account_id.in_(account_ids)
+
+
+def _account_ids(conn: Connection, user_id: int) -> list[int]:
+    return list(conn.scalars(select(Account.id).where(Account.owner_id == user_id)))
+
+
+def _delete_user_rows(conn: Connection, user_id: int) -> None:
+    account_ids = _account_ids(conn, user_id)
+    for table in reversed(_user_tables()):
+        for source in _sources(conn, table):
+            conn.execute(delete(source).where(_owned_by(source, user_id, account_ids)))
+
+
+def _reserve_kept_ids(
+    src: Connection,
+    dst: Connection,
+    table: Table,
+    owned: list,
+    archived_max_id: int,
+) -> None:
+    """Move the target's id sequence past every id the user's rows keep."""
+    highest = [
+        src.scalar(select(func.max(source.c.id)).where(where))
+        for source, where in owned
+    ]
+    advance_ids(dst, table, max([archived_max_id, *filter(None, highest)]))
+
+
+def _insert_batch(dst: Connection, table: Table, rows: list[dict]) -> None:
+    """Insert `rows`; a kept id another user holds on the target is renumbered."""
+    if table.name not in _KEPT:
+        dst.execute(insert(table), rows)
+        return
+    ids = [row["id"] for row in rows]
+    taken = {
+        id_
+        for target in _sources(dst, table)
+        for id_ in dst.scalars(select(target.c.id).where(target.c.id.in_(ids)))
+    }
+    kept = [row for row in rows if row["id"] not in taken]
+    renumbered = [
+        {name: value for name, value in row.items() if name != "id"}
+        for row in rows
+        if row["id"] in taken
+    ]
+    for batch in (kept, renumbered):
+        if batch:
+            dst.execute(insert(table), batch)
+
+
+def _copy_user_rows(
+    src: Connection, dst: Connection, user_id: int, archived_max_id: int = 0
+) -> tuple[int, dict]:
+    """Copy the user's rows; returns (rows copied, {table: {old id: new id}})."""
+    account_ids = _account_ids(src, user_id)
+    keys: dict[str, dict[int, int]] = {name: {} for name in _REKEYED}
+    copied = 0
+    for table in _user_tables():
+        if table.name in _SKIPPED:
+            continue
+        rekeyed_fks = [
+            (fk.parent.name, keys[fk.column.table.name])
+            for fk in table.foreign_keys
+            if fk.column.table.name in keys
+        ]
+        owned = [
+            (source, _owned_by(source, user_id, account_ids))
+            for source in _sources(src, table)
+        ]
+        new_ids = table.name not in _KEPT and "id" in table.c and table.c.id.primary_key
+        if table.name in _KEPT:
+            _reserve_kept_ids(src, dst, table, owned, archived_max_id)
+        for source, where in owned:
+            rows = src.execute(select(source).where(where)).mappings()
+            batch = []
+            for row in rows:
+                values = dict(row)
+                for column, mapping in rekeyed_fks:
+                    if values[column] is not None:
+                        values[column] = mapping[values[column]]
+                old_id = values.pop("id") if new_ids else None
+                if table.name in keys:
+                    result = dst.execute(insert(table).values(values))
+                    keys[table.name][old_id] = result.inserted_primary_key[0]
+                else:
+                    batch.append(values)
+                    if len(batch) == _BATCH:
+                        _insert_batch(dst, table, batch)
+                        batch = []
+                copied += 1
+            if batch:
+                _insert_batch(dst, table, batch)
+    return copied, keys
+
+
+def move_user(user_id: int, source: str | None, target: str | None) -> int:
+    """Move one user's data from shard `source` to `target`; returns rows moved."""
+    with engine_for(source).connect() as src, engine_for(target).begin() as dst:
+        state = src.execute(
+            select(TransactionArchive.file_bytes).where(
+                TransactionArchive.owner_id == user_id
+            )
+        ).scalar()
+        _delete_user_rows(dst, user_id)
+        copied, keys = _copy_user_rows(
+            src, dst, user_id, archive.max_id(user_id, state) if state else 0
+        )
+        rekeyed_archive = (
+            archive.rekey(user_id, state, keys["accounts"], keys["categories"])
+            if state
+            else None
+        )
+
+    with engine.begin() as directory:
+        directory.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(shard=target, data_version=User.data_version + 1)
+        )
+    if rekeyed_archive is not None:
+        os.replace(rekeyed_archive, archive.archive_path(user_id))
+    archive.clear_cache()
+    cache.invalidate(user_id, "accounts", "categories", "budgets")
+
+    with engine_for(source).begin() as src:
+        _delete_user_rows(src, user_id)
+    return copied
+
+
+def plan() -> list[Move]:
+    """Users whose directory entry differs from their place on the ring."""
+    with engine.connect() as conn:
+        users = conn.execute(select(User.id, User.shard).order_by(User.id)).all()
+    return [
+        Move(user_id, current, target)
+        for user_id, current in users
+        if (target := assign_shard(user_id)) != current
+    ]
+
+
+def rebalance(dry_run: bool = False) -> list[Move]:
+    moves = plan()
+    if not dry_run:
+        for move in moves:
+            move.rows = move_user(move.user_id, move.source, move.target)
+    return moves
@@ -0,0 +1,294 @@
+"""
+Recurring payment and subscription detection.
+
+Transactions are grouped by normalized payee, direction and amount (within
+AMOUNT_TOLERANCE of the group's latest amount).  Each group keeps a small
+running state — last date, amounts, the period of its latest interval and
+how many consecutive intervals matched it — so folding in a transaction is
+O(1) and detection is a single scan over transactions sorted by date.
+
+The scan is incremental: RecurringWatermark records the highest transaction
+id already folded in, and `refresh()` only reads transactions above it.  A
+new transaction dated before its group's last date, or any update/delete
+(which call `reset()`), makes the next refresh rebuild the user's groups
+from scratch in one pass — over archived transactions too, merged in date
+order with the live ones.
+"""
+
+import calendar
+import heapq
+import re
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db import partitions
+from app.db.types import to_micros
+from app.models.account import Account
+from app.models.recurring import RecurringSeries, RecurringWatermark
+from app.services import archive
+
+# (period, min days, max days) between consecutive occurrences
+PERIODS = (("weekly", 6, 8), ("monthly", 26, 35), ("yearly", 355, 375))
+# Matching intervals needed before a group counts as recurring
+MIN_STREAK = {"weekly": 3, "monthly": 2, "yearly": 1}
+# A series is no longer reported once it is this late
+GRACE = {
+    "weekly": timedelta(days=4),
+    "monthly": timedelta(days=15),
+    "yearly": timedelta(days=45),
+}
+
+AMOUNT_TOLERANCE = Decimal("0.20")
+MIN_AMOUNT_TOLERANCE = Decimal("1.00")
+
+# Fineco prefixes that say how, not whom, a payment was made
+_PREFIXES = (
+    "PAGAMENTO VISA DEBIT",
+    "PAGAMENTO CARTA",
+    "PAGAMENTO",
+    "ADDEBITO SDD",
+    "ADDEBITO DIRETTO",
+    "BONIFICO SEPA DA",
+    "BONIFICO SEPA A",
+    "BONIFICO SEPA",
+    "BONIFICO DA",
+    "BONIFICO A",
+    "BONIFICO",
+)
+# Card numbers, operation dates and references vary per transaction
+_TAIL = re.compile(r"\b(CARTA N|DATA OPERAZIONE|DATA OP|RIF|CRO|TRN)\b.*$")
+_SEPARATORS = re.compile(r"[^A-Z0-9&.]+")
+_MAX_PAYEE_WORDS = 4
+
+
+def normalize_payee(description: str | None) -> str:
+    """'Pagamento Visa Debit NETFLIX.COM Carta N.****1234' → 'NETFLIX.COM'."""
+    text = _TAIL.sub("", (description or "").upper())
+    for prefix in _PREFIXES:
+        if text.startswith(prefix):
+            text = text[len(prefix) :]
+            break
+    words = [
+        w
+        for w in _SEPARATORS.split(text)
+        if w.strip(".") and not any(c.isdigit() for c in w)
+    ]
+    return " ".join(words[:_MAX_PAYEE_WORDS]) or "?"
+
+
+def classify_interval(days: int) -> str | None:
+    for period, low, high in PERIODS:
+        if low <= days <= high:
+            return period
+    return None
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    year, month = d.year + month // 12, month % 12 + 1
+    return d.replace(
+        year=year, month=month, day=min(d.day, calendar.monthrange(year, month)[1])
+    )
+
+
+def next_date(series: RecurringSeries) -> date:
+    if series.period == "weekly":
+        return series.last_date + timedelta(days=7)
+    if series.period == "monthly":
+        return _add_months(series.last_date, 1)
+    return _add_months(series.last_date, 12)
+
+
+def is_recurring(series: RecurringSeries) -> bool:
+    return series.period is not None and series.streak >= MIN_STREAK[series.period]
+
+
+class _Backdated(Exception):
+    """A new transaction predates its group's state; rebuild instead."""
+
+
+class _Folder:
+    def __init__(self, db: Session, owner_id: int, series: list[RecurringSeries]):
+        self.db = db
+        self.owner_id = owner_id
+        self.groups: dict[tuple[str, str], list[RecurringSeries]] = {}
+        for s in series:
+            self.groups.setdefault((s.payee, s.transaction_type), []).append(s)
+
+    def _match(self, candidates, amount: Decimal) -> RecurringSeries | None:
+        best, best_diff = None, None
+        for s in candidates:
+            last = s.last_amount
+            diff = abs(last - amount)
+            if diff <= max(MIN_AMOUNT_TOLERANCE, last * AMOUNT_TOLERANCE) and (
+                best_diff is None or diff < best_diff
+            ):
+                best, best_diff = s, diff
+        return best
+
+    def fold(self, day: date, amount, transaction_type: str, description) -> None:
+        amount = abs(Decimal(str(amount)))
+        key = (normalize_payee(description), transaction_type)
+        candidates = self.groups.setdefault(key, [])
+        series = self._match(candidates, amount)
+
+        if series is None:
+            series = RecurringSeries(
+                owner_id=self.owner_id,
+                payee=key[0],
+                description=description,
+                transaction_type=transaction_type,
+                last_amount=amount,
+                amount_total=amount,
+                occurrences=1,
+                first_date=day,
+                last_date=day,
+                period=None,
+                streak=0,
+            )
+            self.db.add(series)
+            candidates.append(series)
+            return
+
+        if day < series.last_date:
+            raise _Backdated
+        if day > series.last_date:  # same-day repeats don't change the spacing
+            period = classify_interval((day - series.last_date).days)
+            if period is not None and period == series.period:
+                series.streak += 1
+            else:
+                series.period, series.streak = period, 1 if period else 0
+            series.last_date = day
+        series.occurrences += 1
+        series.amount_total += amount
+        series.last_amount = amount
+        series.description = description
+
+
+def _live_rows(db: Session, owner_id: int, after_id: int):
+    """(id, date, amount, type, description) of live rows with id > after_id."""
+    Tx = partitions.transactions(db)
+    return db.execute(
+        select(
+            Tx.id,
+            Tx.date,
+            Tx.amount,
+            Tx.transaction_type,
+            Tx.description,
+        )
+        .join(Account, Account.id == Tx.account_id)
+        .where(Account.owner_id == owner_id, Tx.id > after_id)
+        .order_by(Tx.date, Tx.id)
+        .execution_options(yield_per=5000)
+    )
+
+
+def _fold_all(folder: _Folder, rows, after_id: int) -> int:
+    """Fold `rows` (sorted by date) into `folder`; returns the max id seen."""
+    last_id = after_id
+    for tx_id, when, amount, kind, description in rows:
+        folder.fold(when.date(), amount, kind, description)
+        last_id = max(last_id, tx_id)
+    return last_id
+
+
+def _scan(db: Session, owner_id: int, folder: _Folder, after_id: int) -> int:
+    """Fold the owner's live transactions with id > after_id; returns the max id."""
+    return _fold_all(folder, _live_rows(db, owner_id, after_id), after_id)
+
+
+def _rebuild(db: Session, owner_id: int) -> int:
+    db.query(RecurringSeries).filter(RecurringSeries.owner_id == owner_id).delete(
+        synchronize_session=False
+    )
+    # SQLite may hand the deleted ids to the new rows; drop the stale objects
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, RecurringSeries):
+            db.expunge(obj)
+    owned = list(db.scalars(select(Account.id).where(Account.owner_id == owner_id)))
+    archived = (
+        (r["id"], r["date"], r["amount"], r["transaction_type"], r["description"])
+        for r in archive.oldest_first(db, owner_id, archive.ArchiveFilter(owned))
+    )
+    # Archived times are naive UTC, live ones may be aware: compare as micros
+    rows = heapq.merge(
+        archived, _live_rows(db, owner_id, 0), key=lambda r: (to_micros(r[1]), r[0])
+    )
+    return _fold_all(_Folder(db, owner_id, []), rows, after_id=0)
+
+
+def refresh(db: Session, owner_id: int) -> None:
+    """Fold any transactions added since the last refresh into the series."""
+    watermark = db.get(RecurringWatermark, owner_id)
+    previous = watermark.last_transaction_id if watermark else None
+
+    if previous is None:
+        last_id = _rebuild(db, owner_id)
+    else:
+        series = (
+            db.query(RecurringSeries).filter(RecurringSeries.owner_id == owner_id).all()
+        )
+        try:
+            last_id = _scan(db, owner_id, _Folder(db, owner_id, series), previous)
+        except _Backdated:
+            db.rollback()
+            last_id = _rebuild(db, owner_id)
+        if last_id == previous:
+            db.rollback()
+            return
+
+    now = datetime.now(timezone.utc)
+    try:
+        if previous is None:
+            db.add(
+                RecurringWatermark(
+                    owner_id=owner_id, last_transaction_id=last_id, updated_at=now
+                )
+            )
+            db.flush()
+        else:
+            # Only advance from the watermark we started from; a concurrent
+            # refresh that got there first has already stored the same series
+            moved = db.execute(
+                update(RecurringWatermark)
+                .where(
+                    RecurringWatermark.owner_id == owner_id,
+                    RecurringWatermark.last_transaction_id == previous,
+                )
+                .values(last_transaction_id=last_id, updated_at=now)
+            ).rowcount
+            if not moved:
+                db.rollback()
+                return
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+
+
+def reset(db: Session, owner_id: int) -> None:
+    """Force a rebuild on the next refresh (call before committing an edit)."""
+    db.query(RecurringWatermark).filter(
+        RecurringWatermark.owner_id == owner_id
+    ).delete()
+
+
+def recurring_series(
+    db: Session, owner_id: int, today: date | None = None, include_inactive=False
+) -> list[RecurringSeries]:
+    refresh(db, owner_id)
+    today = today or datetime.now(timezone.utc).date()
+    found = [
+        s
+        for s in db.query(RecurringSeries)
+        .filter(
+            RecurringSeries.owner_id == owner_id, RecurringSeries.period.is_not(None)
+        )
+        .all()
+        if is_recurring(s)
+        and (include_inactive or today <= next_date(s) + GRACE[s.period])
+    ]
+    return sorted(found, key=next_date)
@@ -0,0 +1,114 @@
+"""
+Refresh tokens: new access tokens without a password, hence without bcrypt.
+
+A token is `<selector>.<secret>`, both random.  The selector is stored as
+is and looked up through its unique index; the secret is stored as its
+SHA-256 and compared in constant time — a fast hash is enough for 256
+random bits.  Every refresh uses its token up and issues the next one of
+the same family (rotation); a used or revoked token coming back means it
+leaked, so the whole family is revoked and that login must start over.
+"""
+
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.token import RefreshToken
+from app.models.user import User
+
+
+def _hash(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def issue(db: Session, user_id: int, family: str | None = None) -> str:
+    """Store a new refresh token for the user and return it (caller commits)."""
+    selector, secret = secrets.token_urlsafe(12), secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            selector=selector,
+            secret_hash=_hash(secret),
+            user_id=user_id,
+            family=family or secrets.token_urlsafe(12),
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return f"{selector}.{secret}"
+
+
+def _find(db: Session, token: str):
+    """The stored row matching `token`, or None."""
+    selector, _, secret = token.partition(".")
+    row = db.execute(
+        select(
+            RefreshToken.id,
+            RefreshToken.user_id,
+            RefreshToken.family,
+            RefreshToken.secret_hash,
+        ).where(RefreshToken.selector == selector)
+    ).first()
+    if row is None or not hmac.compare_digest(row.secret_hash, _hash(secret)):
+        return None
+    return row
+
+
+def _revoke_family(db: Session, family: str, now: datetime) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family == family, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rotate(db: Session, token: str) -> tuple[User, str] | None:
+    """
+    Use `token` up and return its user with the next token of the family;
+    None if it is unknown, expired or reused (the caller commits either way:
+    a reuse revokes the family).
+    """
+    row = _find(db, token)
+    if row is None:
+        return None
+    now = datetime.now(timezone.utc)
+    # Conditional UPDATE: of two requests racing with the same token, one wins
+    used = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == row.id,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    user = db.get(User, row.user_id) if used else None
+    if user is None or not user.is_active:
+        _revoke_family(db, row.family, now)
+        return None
+    return user, issue(db, user.id, row.family)
+
+
+def revoke(db: Session, token: str) -> None:
+    """Log out: revoke the token's whole family (caller commits)."""
+    row = _find(db, token)
+    if row is not None:
+        _revoke_family(db, row.family, datetime.now(timezone.utc))
+
+
+def purge_expired(target: Engine) -> int:
+    """Delete expired tokens; a reused one is then merely unknown."""
+    with target.begin() as conn:
+        return conn.execute(
+            delete(RefreshToken).where(
+                RefreshToken.expires_at <= datetime.now(timezone.utc)
+            )
+        ).rowcount
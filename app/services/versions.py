@@ -0,0 +1,20 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """
+    Mark the user's transaction data as changed (call before committing).
+
+    Derived data keyed by `User.data_version` — e.g. the analytics frames —
+    is then recomputed on next use.  A SQL-side increment, so concurrent
+    writers never lose a bump.
+    """
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -2,7 +2,7 @@
 
 const BASE = "";
 
-async function api(method, path, body = null) {
+async function api(method, path, body = null, retry = true) {
   const token = localStorage.getItem("token");
   const res = await fetch(BASE + path, {
     method,
@@ -12,6 +12,10 @@ async function api(method, path, body = null) {
     },
     body: body ? JSON.stringify(body) : null,
   });
+  // Expired access token: trade the refresh token for a new one, once
+  if (res.status === 401 && retry && (await refreshToken())) {
+    return api(method, path, body, false);
+  }
   if (res.status === 204) return null;
   const data = await res.json();
   if (!res.ok) throw new Error(data.detail || "Errore sconosciuto");
@@ -28,7 +32,18 @@ function isLoggedIn() {
 }
 
 function logout() {
+  const refresh = localStorage.getItem("refreshToken");
+  if (refresh) {
+    fetch("/auth/logout", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ refresh_token: refresh }),
+    });
+  }
   localStorage.removeItem("token");
+  localStorage.removeItem("refreshToken");
+  disconnectEvents();
+  categoriesCache = null;
   show("auth-screen");
   hide("app-screen");
 }
@@ -42,7 +57,59 @@ async function login(email, password) {
   });
   const data = await res.json();
   if (!res.ok) throw new Error(data.detail || "Credenziali errate");
+  storeTokens(data);
+}
+
+function storeTokens(data) {
   localStorage.setItem("token", data.access_token);
+  localStorage.setItem("refreshToken", data.refresh_token);
+}
+
+let refreshing = null;
+
+async function refreshToken() {
+  const refresh = localStorage.getItem("refreshToken");
+  if (!refresh) return false;
+  // Concurrent 401s share one refresh: each refresh token works only once
+  refreshing ??= fetch("/auth/refresh", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refresh }),
+  })
+    .then(async (res) => {
+      if (!res.ok) return false;
+      storeTokens(await res.json());
+      if (eventSource) connectEvents();
+      return true;
+    })
+    .finally(() => (refreshing = null));
+  return refreshing;
+}
+
+// ── Live events ───────────────────────────────────────────────────────────────
+
+let eventSource = null;
+let reloadTimer = null;
+
+function connectEvents() {
+  disconnectEvents();
+  // EventSource can't send an Authorization header
+  const token = encodeURIComponent(localStorage.getItem("token"));
+  eventSource = new EventSource(`/events?access_token=${token}`);
+  ["transactions", "balance", "budget", "resync"].forEach((type) => {
+    eventSource.addEventListener(type, scheduleReload);
+  });
+}
+
+function disconnectEvents() {
+  if (eventSource) eventSource.close();
+  eventSource = null;
+}
+
+function scheduleReload() {
+  // A burst of events (an import) reloads the page once
+  clearTimeout(reloadTimer);
+  reloadTimer = setTimeout(() => loadPage(currentPage), 300);
 }
 
 // ── DOM helpers ───────────────────────────────────────────────────────────────
@@ -84,17 +151,11 @@ async function loadPage(name) {
 
 async function loadDashboard() {
   const now = new Date();
-  const y = now.getFullYear();
-  const m = String(now.getMonth() + 1).padStart(2, "0");
-  const lastDay = new Date(y, now.getMonth() + 1, 0).getDate();
-  const startDate = `${y}-${m}-01`;
-  const endDate   = `${y}-${m}-${String(lastDay).padStart(2, "0")}`;
+  const period = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, "0")}`;
 
-  const [accounts, summary, recent] = await Promise.all([
-    get("/accounts/"),
-    get(`/transactions/summary?start_date=${startDate}T00:00:00&end_date=${endDate}T23:59:59`),
-    get("/transactions?limit=5"),
-  ]);
+  // One round trip for everything on the page
+  const { accounts, categories, summary, recent } = await get(`/dashboard?period=${period}`);
+  categoriesCache = categories;
 
   const grid = $("#accounts-grid");
   grid.innerHTML = accounts.length
@@ -134,10 +195,19 @@ async function loadDashboard() {
 let allAccounts = [];
 let allCategories = [];
 
+// Categories only change through submitCategory, so fetch them once per
+// session and refresh after a create instead of before every form render
+let categoriesCache = null;
+
+async function getCategories(refresh = false) {
+  if (refresh || !categoriesCache) categoriesCache = await get("/categories");
+  return categoriesCache;
+}
+
 async function loadTransactions() {
   [allAccounts, allCategories] = await Promise.all([
     get("/accounts/"),
-    get("/categories"),
+    getCategories(),
   ]);
 
   $("#filter-account").innerHTML =
@@ -256,11 +326,8 @@ async function submitCategory(e) {
       category_type: $("#category-type").value,
     });
     hide("category-modal");
-    // Refresh the cached lists so the new category appears immediately in the tx modal
-    [allAccounts, allCategories] = await Promise.all([
-      get("/accounts/"),
-      get("/categories"),
-    ]);
+    // Refresh the cached list so the new category appears immediately in the tx modal
+    allCategories = await getCategories(true);
   } catch (err) {
     $("#category-error").textContent = err.message;
   }
@@ -269,10 +336,10 @@ async function submitCategory(e) {
 // ── Modal: Add Transaction ────────────────────────────────────────────────────
 
 async function openTxModal() {
-  // Always fetch fresh data so newly created accounts/categories appear
+  // Accounts are fetched fresh (balances change); categories come from the cache
   [allAccounts, allCategories] = await Promise.all([
     get("/accounts/"),
-    get("/categories"),
+    getCategories(),
   ]);
 
   if (!allAccounts.length) {
@@ -325,7 +392,7 @@ async function submitTransaction(e) {
 // ── Modal: Add Budget ─────────────────────────────────────────────────────────
 
 async function openBudgetModal() {
-  const cats = await get("/categories");
+  const cats = await getCategories();
   if (!cats.length) {
     alert("Devi prima creare almeno una categoria dalla pagina Transazioni.");
     return;
@@ -474,6 +541,7 @@ function init() {
       hide("auth-screen");
       show("app-screen");
       showPage("dashboard");
+      connectEvents();
     } catch (err) {
       $("#login-error").textContent = err.message;
     }
@@ -493,6 +561,7 @@ function init() {
       hide("auth-screen");
       show("app-screen");
       showPage("dashboard");
+      connectEvents();
     } catch (err) {
       $("#reg-error").textContent = err.message;
     }
@@ -564,6 +633,7 @@ function init() {
     hide("auth-screen");
     show("app-screen");
     showPage("dashboard");
+    connectEvents();
   }
 }
 
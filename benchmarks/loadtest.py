@@ -0,0 +1,519 @@
+"""
+Load test against a real server.
+
+benchmarks.run times routes one at a time in-process; it cannot show what
+happens under concurrency: thread-pool saturation, SQLite lock waits,
+logins starving behind bcrypt.  This seeds a temporary SQLite file with
+scripts.generate_data, starts uvicorn on it in a subprocess and drives it
+with an asyncio httpx client running weighted scenarios:
+
+    python -m benchmarks.loadtest --concurrency 50 --duration 60
+    python -m benchmarks.loadtest --rate 100 --workers 4 --output load.json
+    python -m benchmarks.loadtest --weights dashboard=1,import=0
+    python -m benchmarks.loadtest --url http://localhost:8000   # seeded server
+
+With --concurrency N virtual users each run one scenario after another
+(closed loop); with --rate R scenarios start as a Poisson process at R per
+second whatever the latency (open loop), up to --max-in-flight at once.
+Reports p50/p95/p99 latency, throughput and error rate per route, as a
+table and as JSON (--output).  Exits with status 1 when the overall error
+rate exceeds --max-error-rate.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine
+
+import app.models  # noqa: F401 — registers all ORM models with Base.metadata
+from app.db.session import Base
+from scripts.generate_data import (
+    DEFAULT_PASSWORD,
+    Volumes,
+    generate_database,
+    user_email,
+    write_statement,
+)
+
+DEFAULT_WEIGHTS = {
+    "login": 1,
+    "dashboard": 5,
+    "paging": 4,
+    "import": 1,
+    "budget_edit": 2,
+}
+
+
+# ── Recording ───────────────────────────────────────────────────────────────
+
+
+class Recorder:
+    """Latency samples and outcomes per route."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: dict[str, Counter] = defaultdict(Counter)
+        self.dropped = 0  # open loop: arrivals refused at --max-in-flight
+
+    def record(self, route: str, seconds: float, outcome: str) -> None:
+        self.samples[route].append(seconds)
+        self.outcomes[route][outcome] += 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {
+            route: _stats(self.samples[route], self.outcomes[route], elapsed)
+            for route in sorted(self.samples)
+        }
+        every = [s for samples in self.samples.values() for s in samples]
+        outcomes = sum(self.outcomes.values(), Counter())
+        return {
+            "duration_s": round(elapsed, 3),
+            "routes": routes,
+            "total": _stats(every, outcomes, elapsed),
+            "dropped_arrivals": self.dropped,
+        }
+
+
+def _stats(samples: list[float], outcomes: Counter, elapsed: float) -> dict:
+    ms = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (0, 0, 0)
+    errors = sum(n for outcome, n in outcomes.items() if outcome != "ok")
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2) if len(ms) else 0.0,
+        "outcomes": dict(sorted(outcomes.items())),
+    }
+
+
+async def _call(
+    client: httpx.AsyncClient,
+    rec: Recorder,
+    route: str,
+    method: str,
+    url: str,
+    **kwargs,
+) -> httpx.Response | None:
+    """One request, recorded under `route`; None when it failed."""
+    start = time.perf_counter()
+    try:
+        resp = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as exc:
+        rec.record(route, time.perf_counter() - start, type(exc).__name__)
+        return None
+    rec.record(
+        route,
+        time.perf_counter() - start,
+        "ok" if resp.status_code < 400 else str(resp.status_code),
+    )
+    return resp if resp.status_code < 400 else None
+
+
+# ── Scenarios ───────────────────────────────────────────────────────────────
+
+
+@dataclass
+class User:
+    email: str
+    token: str
+    account_id: int
+    budget_ids: list[int]
+    transactions: int  # for picking pages
+    rng: random.Random = field(default_factory=random.Random)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class Context:
+    workbook: bytes
+    period: str  # YYYY-MM of the seeded data's last month
+
+
+async def login(client, rec, user: User, ctx: Context) -> None:
+    form = {"username": user.email, "password": DEFAULT_PASSWORD}
+    resp = await _call(
+        client, rec, "POST /auth/login", "POST", "/auth/login", data=form
+    )
+    if resp is not None:
+        user.token = resp.json()["access_token"]
+
+
+async def dashboard(client, rec, user: User, ctx: Context) -> None:
+    await _call(
+        client,
+        rec,
+        "GET /dashboard",
+        "GET",
+        f"/dashboard?period={ctx.period}",
+        headers=user.headers,
+    )
+
+
+async def paging(client, rec, user: User, ctx: Context) -> None:
+    """A few consecutive pages from a random point of the history."""
+    offset = user.rng.randrange(max(1, user.transactions - 150))
+    for page in range(3):
+        await _call(
+            client,
+            rec,
+            "GET /transactions",
+            "GET",
+            f"/transactions?limit=50&offset={offset + page * 50}",
+            headers=user.headers,
+        )
+
+
+async def import_statement(client, rec, user: User, ctx: Context) -> None:
+    resp = await _call(
+        client,
+        rec,
+        "POST /import/preview",
+        "POST",
+        "/import/preview",
+        files={"file": ("movimenti.xlsx", ctx.workbook)},
+        headers=user.headers,
+    )
+    if resp is None:
+        return
+    await _call(
+        client,
+        rec,
+        "POST /import/confirm",
+        "POST",
+        "/import/confirm",
+        json={"account_id": user.account_id, "rows": resp.json()["rows"]},
+        headers=user.headers,
+    )
+
+
+async def budget_edit(client, rec, user: User, ctx: Context) -> None:
+    if not user.budget_ids:
+        return
+    budget_id = user.rng.choice(user.budget_ids)
+    amount = f"{user.rng.randrange(100, 1000)}.00"
+    await _call(
+        client,
+        rec,
+        "PATCH /budgets/{id}",
+        "PATCH",
+        f"/budgets/{budget_id}",
+        json={"amount": amount},
+        headers=user.headers,
+    )
+    await _call(
+        client,
+        rec,
+        "GET /budgets/status",
+        "GET",
+        f"/budgets/status?year={ctx.period[:4]}&month={int(ctx.period[5:])}",
+        headers=user.headers,
+    )
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, User, Context], Awaitable[None]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": login,
+    "dashboard": dashboard,
+    "paging": paging,
+    "import": import_statement,
+    "budget_edit": budget_edit,
+}
+
+
+# ── Driving ─────────────────────────────────────────────────────────────────
+
+
+async def _sign_in(
+    client: httpx.AsyncClient, users: int, transactions: int, period: str, seed: int
+) -> list[User]:
+    """Log every seeded user in once (not recorded) and find their ids."""
+    year, month = period.split("-")
+    signed_in = []
+    for n in range(users):
+        form = {"username": user_email(n), "password": DEFAULT_PASSWORD}
+        resp = (await client.post("/auth/login", data=form)).raise_for_status()
+        headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+        accounts = (await client.get("/accounts/?fields=id", headers=headers)).json()
+        budgets = (
+            await client.get(
+                f"/budgets/?year={year}&month={int(month)}&fields=id", headers=headers
+            )
+        ).json()
+        signed_in.append(
+            User(
+                email=user_email(n),
+                token=resp.json()["access_token"],
+                account_id=accounts[0]["id"],
+                budget_ids=[b["id"] for b in budgets],
+                transactions=transactions // users,
+                rng=random.Random(seed + n),
+            )
+        )
+    return signed_in
+
+
+async def drive(
+    base_url: str,
+    ctx: Context,
+    weights: dict[str, float],
+    duration: float,
+    concurrency: int,
+    rate: float | None,
+    max_in_flight: int,
+    timeout: float,
+    seed: int,
+    sign_in: Callable[[httpx.AsyncClient], Awaitable[list[User]]],
+) -> dict:
+    names = [name for name, weight in weights.items() if weight > 0]
+    cumulative = np.cumsum([weights[name] for name in names]).tolist()
+    rng = random.Random(seed)
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=max(concurrency, max_in_flight))
+
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits
+    ) as client:
+        users = await sign_in(client)
+
+        async def run_one(user: User) -> None:
+            [name] = rng.choices(names, cum_weights=cumulative)
+            await SCENARIOS[name](client, rec, user, ctx)
+
+        start = time.perf_counter()
+        deadline = start + duration
+        if rate is None:
+
+            async def virtual_user(n: int) -> None:
+                while time.perf_counter() < deadline:
+                    await run_one(users[n % len(users)])
+
+            await asyncio.gather(*(virtual_user(n) for n in range(concurrency)))
+        else:
+            in_flight: set[asyncio.Task] = set()
+            arrivals = 0
+            while (now := time.perf_counter()) < deadline:
+                if len(in_flight) >= max_in_flight:
+                    rec.dropped += 1
+                else:
+                    task = asyncio.create_task(run_one(users[arrivals % len(users)]))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                arrivals += 1
+                await asyncio.sleep(
+                    min(rng.expovariate(rate), max(0.0, deadline - now))
+                )
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        return rec.report(time.perf_counter() - start)
+
+
+# ── Server ──────────────────────────────────────────────────────────────────
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(database_url: str, workers: int, admission: bool) -> Iterator[str]:
+    """Run uvicorn on `database_url` until the block exits; yields its URL."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        # Rate limits would turn the test into a test of the limiter
+        "ADMISSION_ENABLED": "true" if admission else "false",
+        "MAINTENANCE_ENABLED": "false",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for(url, server)
+        yield url
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def _wait_for(url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server did not answer on {url} within {timeout:.0f}s")
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def parse_weights(spec: str | None) -> dict[str, float]:
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (spec or "").split(",")):
+        name, _, value = item.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}"
+            )
+        weights[name] = float(value)
+    if not any(weight > 0 for weight in weights.values()):
+        raise argparse.ArgumentTypeError("every scenario has weight 0")
+    return weights
+
+
+def print_report(report: dict) -> None:
+    header = f"{'route':<24} {'reqs':>7} {'rps':>8} {'err%':>6} "
+    print(header + f"{'p50':>9} {'p95':>9} {'p99':>9}")
+    rows = [*report["routes"].items(), ("total", report["total"])]
+    for route, s in rows:
+        print(
+            f"{route:<24} {s['requests']:>7} {s['throughput_rps']:>8.1f} "
+            f"{s['error_rate'] * 100:>6.1f} {s['p50_ms']:>9.1f} "
+            f"{s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}"
+        )
+    if report["dropped_arrivals"]:
+        print(f"dropped arrivals (--max-in-flight): {report['dropped_arrivals']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test a running server.")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    load.add_argument("--rate", type=float, help="scenario starts per second")
+    parser.add_argument("--max-in-flight", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--weights", type=parse_weights, default=DEFAULT_WEIGHTS)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--admission", action="store_true", help="keep rate limits")
+    parser.add_argument("--url", help="target a running server (seeded) instead")
+    parser.add_argument("--database-url", help="serve this seeded database instead")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--transactions", type=int, default=200_000)
+    parser.add_argument("--import-rows", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="write the report JSON here")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    volumes = Volumes(
+        users=args.users, accounts=args.accounts, transactions=args.transactions
+    )
+    period = date.today().strftime("%Y-%m")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        statement = Path(tmp) / "movimenti.xlsx"
+        write_statement(statement, args.import_rows, seed=args.seed)
+        ctx = Context(workbook=statement.read_bytes(), period=period)
+
+        database_url = args.database_url
+        if args.url is None and database_url is None:
+            database_url = f"sqlite:///{tmp}/load.db"
+            engine = create_engine(database_url)
+            Base.metadata.create_all(bind=engine)
+            start = time.perf_counter()
+            generate_database(engine, volumes, seed=args.seed)
+            engine.dispose()
+            print(f"seeded {volumes} in {time.perf_counter() - start:.1f}s")
+
+        def sign_in(client):
+            return _sign_in(client, args.users, args.transactions, period, args.seed)
+
+        def run(base_url: str) -> dict:
+            return asyncio.run(
+                drive(
+                    base_url,
+                    ctx,
+                    args.weights,
+                    args.duration,
+                    args.concurrency,
+                    args.rate,
+                    args.max_in_flight,
+                    args.timeout,
+                    args.seed,
+                    sign_in,
+                )
+            )
+
+        if args.url:
+            report = run(args.url)
+        else:
+            with serve(database_url, args.workers, args.admission) as url:
+                report = run(url)
+
+    report["config"] = {
+        "mode": "open" if args.rate else "closed",
+        "concurrency": None if args.rate else args.concurrency,
+        "rate": args.rate,
+        "workers": args.workers,
+        "weights": args.weights,
+        "volumes": vars(volumes),
+    }
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if report["total"]["error_rate"] > args.max_error_rate:
+        print(
+            f"error rate {report['total']['error_rate']:.2%} "
+            f"> {args.max_error_rate:.2%}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
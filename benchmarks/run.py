@@ -0,0 +1,195 @@
+"""
+Endpoint benchmarks against a seeded database.
+
+Seeds a temporary SQLite file with scripts.generate_data, then times the hot
+routes in-process through TestClient and compares the medians against a
+stored JSON baseline:
+
+    python -m benchmarks.run                          # default volumes
+    python -m benchmarks.run --transactions 100000 --repeat 3
+    python -m benchmarks.run --update-baseline        # accept current numbers
+
+Exits with status 1 when any route is slower than its baseline by more than
+--threshold (a fraction, 0.25 = 25%), or has no baseline entry.  Without a
+baseline file it refuses to run: record one with --update-baseline on the
+machine that compares against it, since timings don't travel.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 — registers all ORM models with Base.metadata
+from app.core.config import settings
+from app.db.session import Base, get_db
+from app.main import app
+from scripts.generate_data import (
+    DEFAULT_PASSWORD,
+    Volumes,
+    generate_database,
+    user_email,
+    write_statement,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def _ok(resp):
+    if resp.status_code >= 400:
+        raise RuntimeError(f"{resp.request.url}: {resp.status_code} {resp.text}")
+    return resp
+
+
+def run_benchmarks(
+    client: TestClient, volumes: Volumes, repeat: int, workbook: bytes
+) -> dict[str, dict[str, float]]:
+    login_form = {"username": user_email(0), "password": DEFAULT_PASSWORD}
+    token = _ok(client.post("/auth/login", data=login_form)).json()["access_token"]
+    client.headers.update({"Authorization": f"Bearer {token}"})
+
+    # Deep page: ~90% into the first user's share of the transactions
+    deep_offset = int(volumes.transactions / volumes.users * 0.9)
+    account_id = client.get("/accounts/").json()[0]["id"]
+
+    def preview():
+        files = {"file": ("movimenti.xlsx", workbook)}
+        return _ok(client.post("/import/preview", files=files)).json()
+
+    preview_rows = preview()["rows"]
+
+    scenarios: dict[str, Callable[[], object]] = {
+        "login": lambda: _ok(client.post("/auth/login", data=login_form)),
+        "transactions_first_page": lambda: _ok(client.get("/transactions?limit=50")),
+        "transactions_deep_page": lambda: _ok(
+            client.get(f"/transactions?limit=50&offset={deep_offset}")
+        ),
+        "summary": lambda: _ok(client.get("/transactions/summary")),
+        "budget_status": lambda: _ok(client.get("/budgets/status")),
+        "import_preview": preview,
+        "import_confirm": lambda: _ok(
+            client.post(
+                "/import/confirm",
+                json={"account_id": account_id, "rows": preview_rows},
+            )
+        ),
+    }
+    return {name: _time(fn, repeat) for name, fn in scenarios.items()}
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Return a description of every route whose median regressed."""
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            regressions.append(f"{name}: not in the baseline")
+            continue
+        before = baseline[name]["median_ms"]
+        after = stats["median_ms"]
+        if after > before * (1 + threshold):
+            regressions.append(
+                f"{name}: {after:.1f} ms vs baseline {before:.1f} ms "
+                f"(+{(after / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the hot API routes.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--import-rows", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    if not args.update_baseline and not args.baseline.exists():
+        parser.error(f"no baseline at {args.baseline}; run with --update-baseline")
+
+    volumes = Volumes(
+        users=args.users, accounts=args.accounts, transactions=args.transactions
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        generate_database(engine, volumes, seed=args.seed)
+        statement = Path(tmp) / "movimenti.xlsx"
+        write_statement(statement, args.import_rows, seed=args.seed)
+        print(f"seeded {volumes} in {time.perf_counter() - start:.1f}s")
+
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        # Benchmarks measure raw route cost; rate limits would skew the timings
+        settings.ADMISSION_ENABLED = False
+        try:
+            with TestClient(app) as client:
+                results = run_benchmarks(
+                    client, volumes, args.repeat, statement.read_bytes()
+                )
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    for name, stats in results.items():
+        print(f"{name:<26} median {stats['median_ms']:>10.1f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.threshold
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
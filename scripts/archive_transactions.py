@@ -0,0 +1,46 @@
+"""
+Move old transactions into the per-user columnar archive.
+
+Transactions dated before the first day of the month ARCHIVE_AFTER_MONTHS
+months ago leave the `transactions` table for ARCHIVE_DIR; the API keeps
+serving them (read-only) from there.  Safe to run repeatedly, e.g. nightly:
+
+    python -m scripts.archive_transactions
+    python -m scripts.archive_transactions --months 12 --user 3
+"""
+
+import argparse
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.archive import archive_user, cutoff_for
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive old transactions.")
+    parser.add_argument("--months", type=int, default=settings.ARCHIVE_AFTER_MONTHS)
+    parser.add_argument("--user", type=int, help="only archive this user id")
+    args = parser.parse_args()
+
+    cutoff = cutoff_for(datetime.now(timezone.utc), args.months)
+    with SessionLocal() as db:
+        users = select(User.id, User.shard).order_by(User.id)
+        if args.user:
+            users = users.where(User.id == args.user)
+        total = 0
+        for user_id, shard in db.execute(users).all():
+            db.info["shard"] = shard  # sharded mode: the user's data is there
+            moved = archive_user(db, user_id, cutoff)
+            if moved:
+                print(f"user {user_id}: archived {moved} transactions")
+            total += moved
+    print(f"archived {total} transactions dated before {cutoff:%Y-%m-%d}")
+
+
+if __name__ == "__main__":
+    main()
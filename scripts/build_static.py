@@ -0,0 +1,90 @@
+"""
+Build the frontend for production.
+
+Copies app/static into app/static/dist with content-hashed asset names,
+rewrites index.html to point at them and writes .gz (and .br, when the
+`brotli` package is installed) siblings next to every text file so the
+server never has to compress them at request time.
+
+    python -m scripts.build_static
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # brotli is optional — gzip alone is fine
+    brotli = None
+
+HASHED_ASSETS = ("app.js", "style.css")
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".css", ".json", ".svg", ".txt"}
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _compress(path: Path) -> None:
+    data = path.read_bytes()
+    # mtime=0 keeps the output byte-for-byte reproducible between builds
+    path.with_name(path.name + ".gz").write_bytes(
+        gzip.compress(data, compresslevel=9, mtime=0)
+    )
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+
+
+def build(src: Path, out: Path) -> dict[str, str]:
+    """Build `src` into `out` and return the {original: hashed} manifest."""
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    manifest: dict[str, str] = {}
+    for name in HASHED_ASSETS:
+        data = (src / name).read_bytes()
+        stem, suffix = name.rsplit(".", 1)
+        hashed = f"{stem}.{_content_hash(data)}.{suffix}"
+        (out / hashed).write_bytes(data)
+        manifest[name] = hashed
+
+    for path in src.iterdir():
+        if path.is_dir() or path.name in HASHED_ASSETS:
+            continue
+        if path.name == "index.html":
+            html = path.read_text(encoding="utf-8")
+            for name, hashed in manifest.items():
+                html = html.replace(f'"/{name}"', f'"/{hashed}"')
+            (out / path.name).write_text(html, encoding="utf-8")
+        else:
+            shutil.copy2(path, out / path.name)
+
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+
+    for path in out.iterdir():
+        if path.suffix in COMPRESSIBLE_SUFFIXES:
+            _compress(path)
+
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--src", type=Path, default=Path("app/static"))
+    parser.add_argument("--out", type=Path, default=Path("app/static/dist"))
+    args = parser.parse_args()
+
+    manifest = build(args.src, args.out)
+    for name, hashed in manifest.items():
+        print(f"{name} -> {hashed}")
+    if brotli is None:
+        print("brotli not installed — wrote gzip variants only")
+
+
+if __name__ == "__main__":
+    main()
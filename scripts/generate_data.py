@@ -0,0 +1,436 @@
+"""
+Deterministic synthetic data for load and scale testing.
+
+Two commands:
+
+    # Bulk-load users, accounts, categories, budgets and transactions
+    python -m scripts.generate_data db --users 10 --accounts 50 \\
+        --transactions 1000000 --database-url sqlite:///./load.db --create-schema
+
+    # Write a Fineco-format bank statement (.xlsx or .csv) of any size
+    python -m scripts.generate_data statement --rows 50000 --output movimenti.xlsx
+
+The same --seed and --end-date always produce the same data.  Movements are
+generated one account at a time and written in chunks (Core executemany for
+the database, openpyxl write-only mode and the csv module for statements),
+so memory is bounded by a single account's history.
+"""
+
+import argparse
+import calendar
+import csv
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.engine import Engine
+
+from app.core.security import hash_password
+
+DEFAULT_PASSWORD = "password123"
+CHUNK_SIZE = 20_000
+
+# Header block of a real Fineco export: the column names sit on row 13
+FINECO_PREAMBLE_ROWS = 12
+FINECO_HEADERS = [
+    "Data_Operazione",
+    "Data_Valuta",
+    "Entrate",
+    "Uscite",
+    "Descrizione",
+    "Descrizione_Completa",
+    "Stato",
+]
+
+
+@dataclass(frozen=True)
+class Merchant:
+    """A payee with a category and a log-normal amount distribution (euros)."""
+
+    category: str
+    kind: str  # "income" | "expense"
+    short: str
+    full: str
+    median: float
+    spread: float  # sigma of the log-normal; 0 = fixed amount
+    weight: int = 0  # relative frequency of one-off spending; 0 = recurring only
+
+
+RECURRING = (
+    # (merchant, day of month)
+    (Merchant("Salary", "income", "Bonifico", "Bonifico SEPA da ACME SPA Stipendio", 2100, 0.03), 27),
+    (Merchant("Rent", "expense", "Bonifico", "Bonifico SEPA a Immobiliare Rossi Affitto", 850, 0), 1),
+    (Merchant("Utilities", "expense", "Addebito SDD", "Addebito SDD ENEL ENERGIA bolletta", 70, 0.25), 12),
+    (Merchant("Subscriptions", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit NETFLIX.COM", 12.99, 0), 5),
+    (Merchant("Subscriptions", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit SPOTIFY AB", 10.99, 0), 18),
+    (Merchant("Phone", "expense", "Addebito SDD", "Addebito SDD ILIAD ITALIA", 9.99, 0), 8),
+)  # fmt: skip
+
+ONE_OFF = (
+    Merchant("Groceries", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit ESSELUNGA MILANO", 38, 0.6, 30),
+    Merchant("Groceries", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit CONAD SUPERSTORE", 24, 0.6, 20),
+    Merchant("Dining", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit BAR CENTRALE", 4.5, 0.5, 25),
+    Merchant("Dining", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit PIZZERIA DA MARIO", 28, 0.4, 8),
+    Merchant("Transport", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit ATM MILANO", 2.2, 0.2, 15),
+    Merchant("Transport", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit ENI STATION", 55, 0.3, 6),
+    Merchant("Shopping", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit AMAZON EU SARL", 35, 0.9, 10),
+    Merchant("Health", "expense", "Pagamento Visa Debit", "Pagamento Visa Debit FARMACIA COMUNALE", 15, 0.7, 4),
+    Merchant("Cash", "expense", "Prelievo", "Prelievo Bancomat ATM", 50, 0.5, 4),
+    Merchant("Refunds", "income", "Bonifico", "Bonifico SEPA rimborso", 40, 0.8, 1),
+)  # fmt: skip
+_ONE_OFF_WEIGHTS = [m.weight for m in ONE_OFF]
+
+CATEGORY_COLORS = {
+    "Salary": "#2E7D32",
+    "Rent": "#6A1B9A",
+    "Utilities": "#F9A825",
+    "Subscriptions": "#AD1457",
+    "Phone": "#00838F",
+    "Groceries": "#43A047",
+    "Dining": "#EF6C00",
+    "Transport": "#1565C0",
+    "Shopping": "#8E24AA",
+    "Health": "#C62828",
+    "Cash": "#757575",
+    "Refunds": "#00897B",
+}
+BUDGETED_CATEGORIES = {"Groceries": 350, "Dining": 150, "Transport": 120}
+
+
+@dataclass(frozen=True)
+class Movement:
+    date: datetime
+    merchant: Merchant
+    amount: Decimal  # always positive; the sign comes from merchant.kind
+
+
+def _amount(rng: random.Random, merchant: Merchant) -> Decimal:
+    value = merchant.median
+    if merchant.spread:
+        value = rng.lognormvariate(0, merchant.spread) * merchant.median
+    return Decimal(max(1, round(value * 100))) / 100
+
+
+def _months(start: date, end: date) -> Iterator[tuple[int, int]]:
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def generate_movements(
+    rng: random.Random, count: int, start: date, end: date, recurring: bool
+) -> list[Movement]:
+    """
+    `count` movements between start and end, newest first.
+
+    With `recurring`, the monthly salary, rent and subscriptions are placed
+    first (as the backbone of a real current account) and the remainder is
+    filled with weighted one-off spending at random days and times.
+    """
+    movements: list[Movement] = []
+    if recurring:
+        for year, month in _months(start, end):
+            last_day = calendar.monthrange(year, month)[1]
+            for merchant, day in RECURRING:
+                when = date(year, month, min(day, last_day))
+                if start <= when <= end and len(movements) < count:
+                    movements.append(
+                        Movement(
+                            datetime(when.year, when.month, when.day, 9),
+                            merchant,
+                            _amount(rng, merchant),
+                        )
+                    )
+
+    span_seconds = int((end - start).total_seconds()) + 86_400
+    origin = datetime(start.year, start.month, start.day)
+    merchants = rng.choices(ONE_OFF, _ONE_OFF_WEIGHTS, k=count - len(movements))
+    for merchant in merchants:
+        when = origin + timedelta(seconds=rng.randrange(span_seconds))
+        movements.append(Movement(when, merchant, _amount(rng, merchant)))
+
+    movements.sort(key=lambda m: m.date, reverse=True)
+    return movements
+
+
+# ── Database ────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Volumes:
+    users: int = 10
+    accounts: int = 50
+    transactions: int = 1_000_000
+    months: int = 36
+
+
+def user_email(n: int) -> str:
+    return f"user{n}@example.com"
+
+
+def _flush(conn, table, rows: list[dict]) -> None:
+    if rows:
+        conn.execute(insert(table), rows)
+        rows.clear()
+
+
+def generate_database(
+    engine: Engine,
+    volumes: Volumes,
+    seed: int = 42,
+    end: date | None = None,
+    password: str = DEFAULT_PASSWORD,
+) -> None:
+    """Bulk-load a full dataset into an empty schema."""
+    # Imported here so the statement command works without the ORM metadata
+    from app.db.writes import advance_ids
+    from app.models.account import Account
+    from app.models.budget import Budget
+    from app.models.transaction import Category, Transaction
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = date(end.year, end.month, 1) - timedelta(days=31 * (volumes.months - 1))
+    start = date(start.year, start.month, 1)
+    created_at = datetime(end.year, end.month, end.day, tzinfo=timezone.utc)
+    # One bcrypt hash shared by every user — hashing is deliberately slow
+    hashed = hash_password(password)
+
+    names = list(CATEGORY_COLORS)
+    per_account, remainder = divmod(volumes.transactions, volumes.accounts)
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "id": u + 1,
+                    "email": user_email(u),
+                    "hashed_password": hashed,
+                    "full_name": f"Test User {u}",
+                    "is_active": True,
+                    "created_at": created_at,
+                }
+                for u in range(volumes.users)
+            ],
+        )
+
+        category_ids: dict[tuple[int, str], int] = {}
+        categories, budgets = [], []
+        for u in range(1, volumes.users + 1):
+            for name in names:
+                category_ids[u, name] = len(categories) + 1
+                kind = "income" if name in ("Salary", "Refunds") else "expense"
+                categories.append(
+                    {
+                        "id": len(categories) + 1,
+                        "owner_id": u,
+                        "name": name,
+                        "category_type": kind,
+                        "color": CATEGORY_COLORS[name],
+                    }
+                )
+            for year, month in _months(start, end):
+                for name, limit in BUDGETED_CATEGORIES.items():
+                    budgets.append(
+                        {
+                            "owner_id": u,
+                            "category_id": category_ids[u, name],
+                            "amount": Decimal(limit),
+                            "year": year,
+                            "month": month,
+                            "created_at": created_at,
+                        }
+                    )
+        conn.execute(insert(Category), categories)
+        _flush(conn, Budget, budgets)
+
+        rows: list[dict] = []
+        for a in range(volumes.accounts):
+            owner = a % volumes.users + 1
+            # The first account of every user is the salary/current account
+            is_main = a < volumes.users
+            opening = Decimal(rng.randrange(0, 500_000)) / 100
+            conn.execute(
+                insert(Account),
+                {
+                    "id": a + 1,
+                    "owner_id": owner,
+                    "name": "Conto Fineco" if is_main else f"Carta {a}",
+                    "account_type": "checking" if is_main else "credit",
+                    "balance": opening,
+                    "currency": "EUR",
+                    "created_at": created_at,
+                },
+            )
+
+            total = Decimal(0)
+            count = per_account + (1 if a < remainder else 0)
+            for m in generate_movements(rng, count, start, end, recurring=is_main):
+                amount = m.amount if m.merchant.kind == "income" else -m.amount
+                total += amount
+                rows.append(
+                    {
+                        "account_id": a + 1,
+                        "category_id": category_ids[owner, m.merchant.category],
+                        "amount": amount,
+                        "transaction_type": m.merchant.kind,
+                        "description": m.merchant.full,
+                        "date": m.date.replace(tzinfo=timezone.utc),
+                        "created_at": created_at,
+                    }
+                )
+                if len(rows) >= CHUNK_SIZE:
+                    _flush(conn, Transaction, rows)
+
+            conn.execute(
+                update(Account)
+                .where(Account.id == a + 1)
+                .values(balance=opening + total)
+            )
+        _flush(conn, Transaction, rows)
+
+        # Explicit ids don't advance PostgreSQL's sequences: move them past
+        # the seeded rows, or the app's first inserts would collide
+        for model, seeded in (
+            (User, volumes.users),
+            (Category, len(categories)),
+            (Account, volumes.accounts),
+        ):
+            advance_ids(conn, model.__table__, seeded)
+
+
+# ── Statements ──────────────────────────────────────────────────────────────
+
+
+def format_italian(amount: Decimal) -> str:
+    """1234.5 -> '1.234,50', the way Fineco renders amounts."""
+    text = f"{amount:,.2f}"
+    return text.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _preamble(start: date, end: date) -> list[list[str]]:
+    rows = [
+        ["Risultato ricerca movimenti"],
+        [],
+        ["Conto Corrente: 1234567"],
+        ["Intestazione Conto Corrente: MARIO ROSSI"],
+        [],
+        [f"Periodo Dal: {start:%d/%m/%Y} Al: {end:%d/%m/%Y}"],
+    ]
+    return rows + [[]] * (FINECO_PREAMBLE_ROWS - len(rows))
+
+
+def _statement_rows(movements: list[Movement]) -> Iterator[tuple]:
+    for m in movements:
+        day = m.date.replace(hour=0, minute=0, second=0, microsecond=0)
+        value_date = day + timedelta(days=1 if m.merchant.kind == "income" else 0)
+        income = format_italian(m.amount) if m.merchant.kind == "income" else None
+        expense = None if income else "-" + format_italian(m.amount)
+        yield day, value_date, income, expense, m.merchant.short, m.merchant.full
+
+
+def write_statement(
+    path: Path, rows: int, seed: int = 42, end: date | None = None
+) -> None:
+    """Write a Fineco export with `rows` movements as .xlsx or .csv."""
+    rng = random.Random(seed)
+    end = end or date.today()
+    # Roughly 90 movements a month, like a busy current account
+    start = end - timedelta(days=max(30, rows // 3))
+    movements = generate_movements(rng, rows, start, end, recurring=True)
+
+    if path.suffix.lower() == ".csv":
+        with path.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh, delimiter=";")
+            writer.writerows(_preamble(start, end))
+            writer.writerow(FINECO_HEADERS)
+            for d, v, income, expense, short, full in _statement_rows(movements):
+                writer.writerow(
+                    [
+                        f"{d:%d/%m/%Y}",
+                        f"{v:%d/%m/%Y}",
+                        income or "",
+                        expense or "",
+                        short,
+                        full,
+                        "Contabilizzato",
+                    ]
+                )
+        return
+
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Movimenti")
+    for row in _preamble(start, end):
+        ws.append(row)
+    ws.append(FINECO_HEADERS)
+    for row in _statement_rows(movements):
+        ws.append([*row, "Contabilizzato"])
+    wb.save(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--end-date",
+        type=date.fromisoformat,
+        help="last day of generated history (default: today)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    db = commands.add_parser("db", help="bulk-load a database")
+    db.add_argument("--database-url", help="default: settings.DATABASE_URL")
+    db.add_argument("--users", type=int, default=10)
+    db.add_argument("--accounts", type=int, default=50)
+    db.add_argument("--transactions", type=int, default=1_000_000)
+    db.add_argument("--months", type=int, default=36)
+    db.add_argument("--password", default=DEFAULT_PASSWORD)
+    db.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="create tables with metadata.create_all instead of Alembic",
+    )
+
+    stmt = commands.add_parser("statement", help="write a Fineco statement")
+    stmt.add_argument("--rows", type=int, default=1_000)
+    stmt.add_argument("--output", type=Path, required=True, help=".xlsx or .csv")
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    if args.command == "statement":
+        write_statement(args.output, args.rows, seed=args.seed, end=args.end_date)
+        print(f"wrote {args.rows} movements to {args.output}", end="")
+    else:
+        from app.core.config import settings
+
+        engine = create_engine(args.database_url or settings.DATABASE_URL)
+        if args.create_schema:
+            import app.models  # noqa: F401 — registers all ORM models
+            from app.db.session import Base
+
+            Base.metadata.create_all(bind=engine)
+        volumes = Volumes(args.users, args.accounts, args.transactions, args.months)
+        generate_database(
+            engine, volumes, seed=args.seed, end=args.end_date, password=args.password
+        )
+        print(f"loaded {volumes} into {engine.url}", end="")
+
+    print(f" in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Load daily exchange rates into the fx_rates table.
+
+Accepts the ECB reference-rate CSV as downloaded (Date,USD,JPY,… one row
+per day, rates per EUR) or a long file with the columns date,currency,rate.
+Existing rates for the same day and currency are overwritten:
+
+    python -m scripts.import_fx_rates eurofxref-hist.csv
+"""
+
+import argparse
+from pathlib import Path
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.fx import load_csv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import daily FX rates.")
+    parser.add_argument("path", type=Path, help="CSV file of rates")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        loaded = load_csv(db, args.path)
+    print(f"loaded {loaded} rates (per {settings.FX_BASE_CURRENCY})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Measure worker cold-start cost.
+
+Reports how long `import app.main` takes (with the slowest modules from
+`python -X importtime`) and the time from spawning uvicorn until the first
+successful response on /health:
+
+    python -m scripts.measure_startup
+    python -m scripts.measure_startup --runs 5 --env WARMUP_ON_STARTUP=true
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+_IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def import_seconds(env: dict[str, str]) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict[str, str], top: int) -> list[tuple[int, str]]:
+    """(cumulative µs, package) for the `top` slowest top-level packages."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    packages: dict[str, int] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line.split("|"))
+        # Root packages only; submodules are already in their cumulative time
+        if "." in module or module == "app":
+            continue
+        packages[module] = max(packages.get(module, 0), int(cumulative))
+    return sorted(((us, name) for name, us in packages.items()), reverse=True)[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_request_seconds(env: dict[str, str], timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                time.sleep(0.01)
+        raise TimeoutError(f"server did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure worker cold start.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--env", action="append", default=[], help="extra KEY=VALUE for the app"
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ, **dict(kv.split("=", 1) for kv in args.env))
+
+    imports = [import_seconds(env) for _ in range(args.runs)]
+    print(f"import app.main      median {statistics.median(imports) * 1000:8.1f} ms")
+    for cumulative, module in slowest_imports(env, args.top):
+        print(f"  {module:<28} {cumulative / 1000:8.1f} ms")
+
+    first = [first_request_seconds(env) for _ in range(args.runs)]
+    print(f"time to first request median {statistics.median(first) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Roll transactions over into yearly partitions.
+
+Run after the start of every year (running it more often is harmless):
+
+    python -m scripts.partitions
+
+SQLite (TRANSACTION_PARTITIONING=true): moves every closed year still in
+`transactions` into its transactions_<year> table.  PostgreSQL: creates
+the partitions for this year and next, moving rows out of the DEFAULT
+partition where needed.
+"""
+
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import engine, shard_engines
+
+
+def main() -> None:
+    today = date.today()
+    # Every database holding transactions: the global one, then each shard
+    for name, target in {"(global)": engine, **shard_engines}.items():
+        if target.dialect.name == "postgresql":
+            with target.begin() as conn:
+                created = partitions.ensure_pg_partitions(
+                    conn, [today.year, today.year + 1]
+                )
+            print(f"{name}: created partitions for {created or 'no new years'}")
+            continue
+
+        if not settings.TRANSACTION_PARTITIONING:
+            raise SystemExit("TRANSACTION_PARTITIONING is off; nothing to do")
+        with Session(bind=target) as db:
+            moved = partitions.roll_over(db, today)
+        for year, rows in moved.items():
+            print(f"{name}: {partitions.partition_name(year)} +{rows} transactions")
+        print(f"{name}: rolled over {len(moved)} year(s)")
+
+
+if __name__ == "__main__":
+    main()
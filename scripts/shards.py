@@ -0,0 +1,78 @@
+"""
+Admin tooling for sharded mode (SHARDS in the environment).
+
+    python -m scripts.shards status              # users per shard
+    python -m scripts.shards migrate             # alembic upgrade head everywhere
+    python -m scripts.shards migrate -- -c alembic.ini downgrade -1
+    python -m scripts.shards rebalance --dry-run # who would move where
+    python -m scripts.shards rebalance           # move them
+
+`migrate` runs Alembic once against DATABASE_URL and once per shard; every
+database gets the full schema (shards simply leave `users` empty; no table
+holds a foreign key to it, so that is valid on any database).
+`rebalance` moves users whose directory entry differs from their place on
+the hash ring — after adding a shard, or when first enabling sharding on a
+database whose users have no shard yet.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from sqlalchemy import select
+
+import app.models  # noqa: F401 — registers all ORM models
+from app.core.config import settings
+from app.db.session import engine
+from app.models.user import User
+from app.services import rebalance
+
+
+def migrate(alembic_args: list[str]) -> None:
+    targets = {"(global)": settings.DATABASE_URL, **settings.SHARDS}
+    for name, url in targets.items():
+        print(f"== {name}")
+        subprocess.run(
+            [sys.executable, "-m", "alembic", *(alembic_args or ["upgrade", "head"])],
+            env=dict(os.environ, DATABASE_URL=url),
+            check=True,
+        )
+
+
+def status() -> None:
+    with engine.connect() as conn:
+        counts = Counter(conn.scalars(select(User.shard)))
+    for name in [None, *sorted(settings.SHARDS)]:
+        print(f"{name or '(global)':<20} {counts.get(name, 0):>8} users")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage database shards.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status")
+    migrate_cmd = commands.add_parser("migrate")
+    migrate_cmd.add_argument("alembic_args", nargs="*", help="default: upgrade head")
+    rebalance_cmd = commands.add_parser("rebalance")
+    rebalance_cmd.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate(args.alembic_args)
+    elif args.command == "status":
+        status()
+    else:
+        if not settings.SHARDS:
+            raise SystemExit("SHARDS is empty; nothing to rebalance")
+        moves = rebalance.rebalance(dry_run=args.dry_run)
+        for move in moves:
+            print(
+                f"user {move.user_id}: {move.source or '(global)'} -> {move.target}"
+                + ("" if args.dry_run else f" ({move.rows} rows)")
+            )
+        print(f"{len(moves)} user(s) {'to move' if args.dry_run else 'moved'}")
+
+
+if __name__ == "__main__":
+    main()
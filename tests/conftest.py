@@ -7,20 +7,30 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 import app.models  # noqa: F401 — registers all ORM models with Base.metadata
+from app.core import cache, events
 from app.db.session import Base, get_db
 from app.main import app
+from app.services import admission, analytics, archive, fx
 
 engine = create_engine(
     "sqlite://",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 @pytest.fixture(autouse=True)
 def setup_db():
     Base.metadata.create_all(bind=engine)
+    admission.reset()
+    cache.cache.clear()
+    analytics.clear_cache()
+    archive.clear_cache()
+    fx.clear_cache()
+    events.hub.clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -0,0 +1,103 @@
+"""Tests for rate limiting and bounded concurrency on expensive routes."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import metrics
+from app.services import admission
+from app.services.admission import ConcurrencyLimit, TokenBucket
+
+
+def _login(client, password="wrong", username="user@example.com"):
+    return client.post("/auth/login", data={"username": username, "password": password})
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(burst=2, now=0.0)
+    assert bucket.take(rate=1.0, burst=2, now=0.0) == 0
+    assert bucket.take(rate=1.0, burst=2, now=0.0) == 0
+    assert bucket.take(rate=1.0, burst=2, now=0.0) == pytest.approx(1.0)
+    assert bucket.take(rate=1.0, burst=2, now=1.0) == 0
+
+
+def test_login_is_rate_limited_per_client(client, monkeypatch):
+    monkeypatch.setattr(admission.auth_rate, "burst", 2)
+    assert _login(client).status_code == 401
+    assert _login(client).status_code == 401
+
+    resp = _login(client)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert 'admission_rejected_total{group="auth",reason="rate"}' in (
+        metrics.REGISTRY.render()
+    )
+
+
+def test_login_is_rate_limited_per_name_across_clients(client, monkeypatch):
+    # As if every attempt came from a different address
+    monkeypatch.setattr(admission.auth_rate, "per_minute", 0)
+    monkeypatch.setattr(admission.login_name_rate, "burst", 2)
+    assert _login(client).status_code == 401
+    assert _login(client, username=" USER@example.com").status_code == 401
+
+    resp = _login(client)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert 'admission_rejected_total{group="login_name",reason="rate"}' in (
+        metrics.REGISTRY.render()
+    )
+    # Other accounts are unaffected
+    assert _login(client, username="other@example.com").status_code == 401
+
+
+def test_report_limit_is_per_user(auth_client, monkeypatch):
+    monkeypatch.setattr(admission.report_rate, "burst", 1)
+    assert auth_client.get("/transactions/summary").status_code == 200
+    assert auth_client.get("/transactions/summary").status_code == 429
+
+    auth_client.post(
+        "/auth/register",
+        json={"email": "other@example.com", "password": "pw123456", "full_name": "O"},
+    )
+    token = auth_client.post(
+        "/auth/login", data={"username": "other@example.com", "password": "pw123456"}
+    ).json()["access_token"]
+    resp = auth_client.get(
+        "/transactions/summary", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resp.status_code == 200
+
+
+def test_concurrency_limit_rejects_when_queue_is_full():
+    limit = ConcurrencyLimit("test", limit=1, queue_size=0, timeout=0.01)
+    holder = limit()
+    next(holder)
+
+    with pytest.raises(HTTPException) as exc:
+        next(limit())
+    assert exc.value.status_code == 503
+    assert "Retry-After" in exc.value.headers
+
+    holder.close()  # releases the slot
+    waiter = limit()
+    next(waiter)
+    waiter.close()
+
+
+def test_concurrency_limit_times_out_waiting():
+    limit = ConcurrencyLimit("test", limit=1, queue_size=1, timeout=0.01)
+    holder = limit()
+    next(holder)
+
+    with pytest.raises(HTTPException) as exc:
+        next(limit())
+    assert exc.value.status_code == 503
+    assert 'admission_queue_depth{group="test"} 0' in metrics.REGISTRY.render()
+    holder.close()
+
+
+def test_disabled_admission_lets_everything_through(client, monkeypatch):
+    monkeypatch.setattr(admission.settings, "ADMISSION_ENABLED", False)
+    monkeypatch.setattr(admission.auth_rate, "burst", 1)
+    for _ in range(3):
+        assert _login(client).status_code == 401
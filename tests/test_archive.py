@@ -0,0 +1,174 @@
+"""Tests for the columnar transaction archive."""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.db import types
+from app.models.archive import TransactionArchive
+from app.services import archive
+from tests.conftest import TestingSessionLocal
+
+CUTOFF = datetime(2025, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _add(client, account_id, day, amount, kind="expense", description=None):
+    resp = client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "description": description,
+            "date": f"{day}T12:00:00",
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _archive(owner_id, cutoff=CUTOFF):
+    with TestingSessionLocal() as db:
+        return archive.archive_user(db, owner_id, cutoff)
+
+
+@pytest.fixture
+def account(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    _add(auth_client, acct["id"], "2024-03-01", 1500, "income", "Stipendio")
+    _add(auth_client, acct["id"], "2024-06-15", 42.5, description="Caffè ☕")
+    _add(auth_client, acct["id"], "2024-09-30", 10)
+    _add(auth_client, acct["id"], "2025-02-01", 20, description="Spesa")
+    _add(auth_client, acct["id"], "2025-03-01", 1500, "income", "Stipendio")
+    return acct
+
+
+def test_segment_round_trip(archive_dir):
+    rows = [
+        (7, 1, None, datetime(2024, 1, 2, 3, 4, 5), None, -12.34, "expense", None),
+        (8, 2, 5, datetime(2023, 5, 6), datetime(2023, 5, 7), 99, "income", "àé"),
+    ]
+    path = archive_dir / "seg.ftarc"
+    path.write_bytes(archive.encode_segment(rows))
+
+    [seg] = archive.ArchiveFile(path, path.stat().st_size).segments
+    first, second = seg.row(0), seg.row(1)
+    assert first["category_id"] is None
+    assert first["description"] is None
+    assert first["amount"] == Decimal("-12.34")
+    assert first["date"] == datetime(2024, 1, 2, 3, 4, 5)
+    assert second["transaction_type"] == "income"
+    assert second["description"] == "àé"
+    assert second["created_at"] == datetime(2023, 5, 7)
+
+
+def test_archive_moves_old_rows_and_keeps_them_listed(auth_client, account):
+    before = auth_client.get("/transactions").json()
+    assert _archive(account["owner_id"]) == 3
+    assert _archive(account["owner_id"]) == 0  # idempotent
+
+    with TestingSessionLocal() as db:
+        state = db.get(TransactionArchive, account["owner_id"])
+        assert state.rows == 3
+        assert state.archived_before == CUTOFF
+
+    after = auth_client.get("/transactions").json()
+    assert [t["id"] for t in after] == [t["id"] for t in before]
+    assert after[3]["description"] == "Caffè ☕"
+
+    page = auth_client.get("/transactions", params={"limit": 2, "offset": 1}).json()
+    assert [t["date"][:10] for t in page] == ["2025-02-01", "2024-09-30"]
+
+    incomes = auth_client.get(
+        "/transactions", params={"transaction_type": "income"}
+    ).json()
+    assert [t["date"][:10] for t in incomes] == ["2025-03-01", "2024-03-01"]
+
+    # Account balances are untouched by archiving
+    [acct] = auth_client.get("/accounts/").json()
+    assert Decimal(acct["balance"]) == Decimal("2927.5")
+
+
+def test_category_filter_covers_archived_rows(auth_client, account):
+    cat = auth_client.post("/categories", json={"name": "Bar"}).json()
+    for day in ("2024-07-01", "2025-04-01"):
+        tx = _add(auth_client, account["id"], day, 3)
+        auth_client.patch(f"/transactions/{tx['id']}", json={"category_id": cat["id"]})
+    _archive(account["owner_id"])
+
+    rows = auth_client.get("/transactions", params={"category_id": cat["id"]}).json()
+    assert [t["date"][:10] for t in rows] == ["2025-04-01", "2024-07-01"]
+    assert {t["category_id"] for t in rows} == {cat["id"]}
+
+
+def test_aware_hot_times_merge_with_archived_ones(auth_client, account, monkeypatch):
+    _archive(account["owner_id"])
+    # What PostgreSQL's timestamptz returns; archived times stay naive UTC
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(
+        types, "from_micros", lambda value: epoch + timedelta(microseconds=int(value))
+    )
+
+    rows = auth_client.get("/transactions").json()
+    assert [t["date"] for t in rows] == [
+        f"{day}T12:00:00Z"
+        for day in (
+            "2025-03-01",
+            "2025-02-01",
+            "2024-09-30",
+            "2024-06-15",
+            "2024-03-01",
+        )
+    ]
+
+
+def test_summary_includes_archived_rows(auth_client, account):
+    before = auth_client.get("/transactions/summary").json()
+    _archive(account["owner_id"])
+    assert auth_client.get("/transactions/summary").json() == before
+
+    recent = auth_client.get(
+        "/transactions/summary", params={"start_date": "2024-06-01T00:00:00"}
+    ).json()
+    assert Decimal(recent["total_income"]) == Decimal("1500")
+    assert Decimal(recent["total_expenses"]) == Decimal("72.5")
+
+
+def test_archived_rows_are_read_only(auth_client, account):
+    old = auth_client.get("/transactions").json()[-1]
+    _archive(account["owner_id"])
+
+    resp = auth_client.get(f"/transactions/{old['id']}")
+    assert resp.status_code == 200
+    assert resp.json()["description"] == "Stipendio"
+    assert auth_client.delete(f"/transactions/{old['id']}").status_code == 409
+    resp = auth_client.patch(f"/transactions/{old['id']}", json={"amount": 1})
+    assert resp.status_code == 409
+    assert auth_client.get("/transactions/99999").status_code == 404
+
+
+def test_uncommitted_tail_is_ignored_and_truncated(auth_client, account):
+    owner_id = account["owner_id"]
+    _archive(owner_id, datetime(2024, 5, 1))
+    path = archive.archive_path(owner_id)
+    committed = path.stat().st_size
+
+    # A crashed run left a segment behind without committing it
+    with open(path, "ab") as f:
+        f.write(archive.encode_segment([(999, 1, None, CUTOFF, None, 1, "x", None)]))
+    assert len(auth_client.get("/transactions").json()) == 5
+
+    _archive(owner_id)
+    with TestingSessionLocal() as db:
+        assert db.get(TransactionArchive, owner_id).rows == 3
+    ids = {t["id"] for t in auth_client.get("/transactions").json()}
+    assert 999 not in ids and len(ids) == 5
+    assert path.stat().st_size > committed
@@ -1,6 +1,12 @@
 """Integration tests for auth endpoints."""
 
+from datetime import datetime, timedelta, timezone
+
 import pytest  # noqa: F401 — fixtures injected via conftest
+from sqlalchemy import text
+
+from app.services import maintenance
+from tests.conftest import engine
 
 
 def test_register_and_login(client):
@@ -44,3 +50,80 @@ def test_wrong_password(client):
         data={"username": "carol@example.com", "password": "wrong"},
     )
     assert resp.status_code == 401
+
+
+def _login(client):
+    client.post(
+        "/auth/register",
+        json={"email": "dave@example.com", "password": "pw123", "full_name": "Dave"},
+    )
+    resp = client.post(
+        "/auth/login", data={"username": "dave@example.com", "password": "pw123"}
+    )
+    return resp.json()
+
+
+def test_refresh_rotates_without_bcrypt(client, monkeypatch):
+    tokens = _login(client)
+
+    def no_bcrypt(*args):
+        raise AssertionError("bcrypt on the refresh path")
+
+    monkeypatch.setattr("app.api.routes.auth.verify_password", no_bcrypt)
+    resp = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200
+    fresh = resp.json()
+    assert fresh["refresh_token"] != tokens["refresh_token"]
+    me = client.get(
+        "/users/me", headers={"Authorization": f"Bearer {fresh['access_token']}"}
+    )
+    assert me.json()["email"] == "dave@example.com"
+
+    # Stored hashed: the secret half never reaches the database
+    secret = fresh["refresh_token"].split(".")[1]
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT * FROM refresh_tokens")).all()
+    assert len(rows) == 2
+    assert not any(secret in str(value) for row in rows for value in row)
+
+
+def test_reused_refresh_token_revokes_the_family(client):
+    first = _login(client)["refresh_token"]
+    second = client.post("/auth/refresh", json={"refresh_token": first}).json()
+
+    # The old token comes back (e.g. stolen): both it and its successor die
+    assert (
+        client.post("/auth/refresh", json={"refresh_token": first}).status_code == 401
+    )
+    resp = client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    assert resp.status_code == 401
+
+    # Other logins are unaffected
+    other = _login(client)["refresh_token"]
+    assert (
+        client.post("/auth/refresh", json={"refresh_token": other}).status_code == 200
+    )
+
+
+def test_invalid_expired_and_logged_out_tokens(client):
+    token = _login(client)["refresh_token"]
+    selector = token.split(".")[0]
+    for bad in ("garbage", f"{selector}.wrong-secret", ""):
+        resp = client.post("/auth/refresh", json={"refresh_token": bad})
+        assert resp.status_code == 401
+
+    assert client.post("/auth/logout", json={"refresh_token": token}).status_code == 204
+    assert (
+        client.post("/auth/refresh", json={"refresh_token": token}).status_code == 401
+    )
+
+    token = _login(client)["refresh_token"]
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE refresh_tokens SET expires_at = :past"),
+            {"past": datetime.now(timezone.utc) - timedelta(seconds=1)},
+        )
+    assert (
+        client.post("/auth/refresh", json={"refresh_token": token}).status_code == 401
+    )
+    assert maintenance.expire_tokens(engine, 0) == "deleted 2 tokens"
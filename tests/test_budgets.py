@@ -0,0 +1,75 @@
+"""Integration tests for budgets and the monthly budget status."""
+
+import pytest  # noqa: F401 — fixtures injected via conftest
+
+from app.core.query_log import QueryRecorder
+
+
+def _setup_month(client, categories=5):
+    acct = client.post("/accounts/", json={"name": "Checking"}).json()
+    cats = []
+    for i in range(categories):
+        cat = client.post("/categories", json={"name": f"Cat {i}"}).json()
+        client.post(
+            "/budgets/",
+            json={
+                "category_id": cat["id"],
+                "amount": "100.00",
+                "year": 2026,
+                "month": 3,
+            },
+        )
+        for amount in ("30.00", "45.50"):
+            client.post(
+                "/transactions",
+                json={
+                    "account_id": acct["id"],
+                    "category_id": cat["id"],
+                    "amount": amount,
+                    "transaction_type": "expense",
+                    "date": "2026-03-10T12:00:00",
+                },
+            )
+        cats.append(cat)
+    # Outside the month: must not count
+    client.post(
+        "/transactions",
+        json={
+            "account_id": acct["id"],
+            "category_id": cats[0]["id"],
+            "amount": "500.00",
+            "transaction_type": "expense",
+            "date": "2026-04-01T00:00:00",
+        },
+    )
+    return cats
+
+
+def test_budget_status_sums_month_expenses(auth_client):
+    cats = _setup_month(auth_client, categories=2)
+
+    resp = auth_client.get("/budgets/status?year=2026&month=3")
+    assert resp.status_code == 200
+    status = {s["category_id"]: s for s in resp.json()}
+    first = status[cats[0]["id"]]
+    assert first["category_name"] == "Cat 0"
+    assert float(first["spent"]) == 75.5
+    assert float(first["remaining"]) == 24.5
+    assert first["percent_used"] == 75.5
+    assert first["over_budget"] is False
+
+
+def test_budget_status_has_no_n_plus_one(auth_client):
+    _setup_month(auth_client, categories=8)
+
+    with QueryRecorder() as queries:
+        resp = auth_client.get("/budgets/status?year=2026&month=3")
+    assert len(resp.json()) == 8
+    queries.assert_no_n_plus_one(threshold=1)
+
+
+def test_duplicate_budget_rejected(auth_client):
+    cat = auth_client.post("/categories", json={"name": "Food"}).json()
+    payload = {"category_id": cat["id"], "amount": "50.00", "year": 2026, "month": 1}
+    assert auth_client.post("/budgets/", json=payload).status_code == 201
+    assert auth_client.post("/budgets/", json=payload).status_code == 400
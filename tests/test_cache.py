@@ -0,0 +1,93 @@
+"""Tests for the per-user reference-data cache."""
+
+import time
+
+from app.core.cache import MemoryCache
+from app.core.query_log import QueryRecorder
+
+
+def _category_queries(queries: QueryRecorder) -> int:
+    return sum("FROM categories" in s for s in queries.statements)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(max_entries=10)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_category_list_is_served_from_cache_until_created(auth_client):
+    auth_client.get("/categories")
+    with QueryRecorder() as queries:
+        assert auth_client.get("/categories").json() == []
+    assert _category_queries(queries) == 0
+
+    auth_client.post("/categories", json={"name": "Food", "category_type": "expense"})
+    with QueryRecorder() as queries:
+        names = [c["name"] for c in auth_client.get("/categories").json()]
+    assert names == ["Food"]
+    assert _category_queries(queries) == 1
+
+
+def test_account_balance_is_fresh_after_transaction(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    assert float(auth_client.get("/accounts/").json()[0]["balance"]) == 0
+
+    auth_client.post(
+        "/transactions",
+        json={
+            "account_id": acct["id"],
+            "amount": 25,
+            "transaction_type": "income",
+            "date": "2026-01-10T00:00:00",
+        },
+    )
+    assert float(auth_client.get("/accounts/").json()[0]["balance"]) == 25
+
+    auth_client.delete(f"/accounts/{acct['id']}")
+    assert auth_client.get("/accounts/").json() == []
+
+
+def test_budget_list_filters_cached_copy(auth_client):
+    cat = auth_client.post(
+        "/categories", json={"name": "Food", "category_type": "expense"}
+    ).json()
+    for month in (1, 2):
+        auth_client.post(
+            "/budgets/",
+            json={
+                "category_id": cat["id"],
+                "year": 2026,
+                "month": month,
+                "amount": 100,
+            },
+        )
+    assert len(auth_client.get("/budgets/").json()) == 2
+    assert [b["month"] for b in auth_client.get("/budgets/?month=2").json()] == [2]
+
+
+def test_cache_is_per_user(auth_client):
+    auth_client.post("/categories", json={"name": "Food", "category_type": "expense"})
+    auth_client.get("/categories")
+
+    auth_client.post(
+        "/auth/register",
+        json={"email": "b@example.com", "password": "password123", "full_name": "B"},
+    )
+    token = auth_client.post(
+        "/auth/login", data={"username": "b@example.com", "password": "password123"}
+    ).json()["access_token"]
+    resp = auth_client.get("/categories", headers={"Authorization": f"Bearer {token}"})
+    assert resp.json() == []
@@ -0,0 +1,76 @@
+"""Integration tests for the consolidated dashboard endpoint."""
+
+import pytest  # noqa: F401 — fixtures injected via conftest
+
+from app.core.query_log import QueryRecorder
+
+
+def _seed(client):
+    acct = client.post("/accounts/", json={"name": "Main"}).json()
+    food = client.post(
+        "/categories", json={"name": "Food", "category_type": "expense"}
+    ).json()
+    client.post(
+        "/budgets/",
+        json={"category_id": food["id"], "year": 2026, "month": 3, "amount": 100},
+    )
+    for amount, kind, category, day in (
+        (2000, "income", None, "2026-03-01"),
+        (30, "expense", food["id"], "2026-03-05"),
+        (45, "expense", food["id"], "2026-03-20"),
+        (10, "expense", None, "2026-03-21"),
+        (99, "expense", food["id"], "2026-02-28"),  # previous month
+    ):
+        client.post(
+            "/transactions",
+            json={
+                "account_id": acct["id"],
+                "amount": amount,
+                "transaction_type": kind,
+                "category_id": category,
+                "date": f"{day}T12:00:00",
+            },
+        )
+    return acct, food
+
+
+def test_dashboard_combines_summary_recent_and_budgets(auth_client):
+    acct, food = _seed(auth_client)
+
+    resp = auth_client.get("/dashboard?period=2026-03")
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data["period"] == "2026-03"
+    assert [a["id"] for a in data["accounts"]] == [acct["id"]]
+    assert [c["name"] for c in data["categories"]] == ["Food"]
+    assert float(data["summary"]["total_income"]) == 2000
+    assert float(data["summary"]["total_expenses"]) == 85
+    assert float(data["summary"]["net"]) == 1915
+    assert len(data["recent"]) == 5
+    assert data["recent"][0]["date"].startswith("2026-03-21")
+
+    [status] = data["budgets"]
+    assert status["category_id"] == food["id"]
+    assert float(status["spent"]) == 75
+    assert status["over_budget"] is False
+
+
+def test_dashboard_matches_separate_endpoints(auth_client):
+    _seed(auth_client)
+    dashboard = auth_client.get("/dashboard?period=2026-03").json()
+    budgets = auth_client.get("/budgets/status?year=2026&month=3").json()
+    assert dashboard["budgets"] == budgets
+
+
+def test_dashboard_uses_few_queries_with_warm_cache(auth_client):
+    _seed(auth_client)
+    auth_client.get("/dashboard?period=2026-03")
+    with QueryRecorder() as queries:
+        auth_client.get("/dashboard?period=2026-03")
+    # user lookup + period totals + recent + budgets
+    assert queries.count <= 4
+
+
+def test_dashboard_rejects_bad_period(auth_client):
+    assert auth_client.get("/dashboard?period=2026-13").status_code == 422
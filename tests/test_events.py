@@ -0,0 +1,155 @@
+"""Tests for live change notifications (GET /events)."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core import events
+from app.core.config import settings
+from app.core.events import Event, Hub
+
+
+async def _collect(stream, count):
+    return [await anext(stream) for _ in range(count)]
+
+
+def test_event_encoding():
+    frame = Event(7, "balance", {"account_id": 3}).encode()
+    assert frame == b'id: 7\nevent: balance\ndata: {"account_id":3}\n\n'
+
+
+def test_published_events_reach_the_users_streams():
+    hub = Hub()
+
+    async def scenario():
+        mine, other = hub.stream(1, 8, 60), hub.stream(2, 8, 60)
+        await _collect(mine, 1)
+        await _collect(other, 1)
+        # Published from a worker thread, as sync routes do
+        thread = threading.Thread(
+            target=hub.publish, args=(1, "transactions"), kwargs={"count": 2}
+        )
+        thread.start()
+        thread.join()
+        [frame] = await _collect(mine, 1)
+        assert b"event: transactions" in frame and b'"count":2' in frame
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(anext(other), 0.05)
+        await mine.aclose()
+        await other.aclose()
+
+    asyncio.run(scenario())
+    assert not hub.has_subscribers(1) and not hub.has_subscribers(2)
+
+
+def test_slow_subscriber_gets_a_resync():
+    hub = Hub()
+
+    async def scenario():
+        stream = hub.stream(1, 2, 60)
+        await _collect(stream, 1)
+        for i in range(5):
+            hub.publish(1, "balance", account_id=i)
+        await asyncio.sleep(0)  # let the loop deliver the queued offers
+        [frame] = await _collect(stream, 1)
+        assert b"event: resync" in frame
+        # Events after the overflow arrive as usual
+        hub.publish(1, "budget", budget_id=1)
+        [frame] = await _collect(stream, 1)
+        assert b"event: budget" in frame
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_idle_stream_sends_heartbeats():
+    hub = Hub()
+
+    async def scenario():
+        stream = hub.stream(1, 8, 0.01)
+        first, ping = await _collect(stream, 2)
+        assert first.startswith(b"retry: ")
+        assert ping == b": ping\n\n"
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    hub = Hub()
+    hub.publish(1, "balance", account_id=1)
+    assert not hub.has_subscribers(1)
+
+
+def test_events_require_a_token(client):
+    assert client.get("/events").status_code == 401
+    assert client.get("/events?access_token=nope").status_code == 401
+
+
+def test_token_is_accepted_as_a_query_parameter(auth_client, monkeypatch):
+    opened = []
+
+    async def one_frame(user_id, maxsize, heartbeat):
+        opened.append((user_id, maxsize))
+        yield b": connected\n\n"
+
+    monkeypatch.setattr(events.hub, "stream", one_frame)
+    token = auth_client.headers["Authorization"].removeprefix("Bearer ")
+    resp = auth_client.get(
+        f"/events?access_token={token}", headers={"Authorization": ""}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.text == ": connected\n\n"
+    assert opened[0][1] == settings.EVENTS_QUEUE_SIZE
+
+
+def test_budget_thresholds_are_published(auth_client, monkeypatch):
+    monkeypatch.setattr(settings, "BUDGET_ALERT_THRESHOLDS", [0.8, 1.0])
+    monkeypatch.setattr(events.hub, "has_subscribers", lambda user_id: True)
+    published = []
+    monkeypatch.setattr(
+        events, "publish", lambda user_id, type, **data: published.append((type, data))
+    )
+    account = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    category = auth_client.post("/categories", json={"name": "Food"}).json()
+    auth_client.post(
+        "/budgets/",
+        json={"category_id": category["id"], "amount": 100, "year": 2026, "month": 3},
+    )
+
+    def spend(amount):
+        published.clear()
+        auth_client.post(
+            "/transactions",
+            json={
+                "account_id": account["id"],
+                "category_id": category["id"],
+                "amount": amount,
+                "transaction_type": "expense",
+                "date": "2026-03-10T12:00:00",
+            },
+        )
+        return [data["threshold"] for type, data in published if type == "budget"]
+
+    assert spend(50) == []
+    assert spend(35) == [0.8]
+    assert spend(5) == []
+    assert spend(30) == [1.0]
+
+
+def test_stream_is_never_gzipped(auth_client, monkeypatch):
+    # Above GZIP_MINIMUM_SIZE, through the app's whole middleware stack
+    frame = Event(1, "transactions", {"pad": "x" * 4096}).encode()
+
+    async def one_frame(user_id, maxsize, heartbeat):
+        yield frame
+
+    monkeypatch.setattr(events.hub, "stream", one_frame)
+    with auth_client.stream(
+        "GET", "/events", headers={"Accept-Encoding": "gzip"}
+    ) as resp:
+        assert resp.status_code == 200
+        assert "content-encoding" not in resp.headers
+        assert resp.read() == frame
@@ -0,0 +1,78 @@
+"""Tests for sparse fieldsets (`?fields=`) on list endpoints."""
+
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.query_log import QueryRecorder
+from app.services import archive
+from tests.conftest import TestingSessionLocal
+
+
+def _setup(client):
+    acct = client.post("/accounts/", json={"name": "Main", "balance": 10}).json()
+    cat = client.post("/categories", json={"name": "Food"}).json()
+    for day, amount in (("2026-01-05", 12.5), ("2026-02-07", 30)):
+        client.post(
+            "/transactions",
+            json={
+                "account_id": acct["id"],
+                "category_id": cat["id"],
+                "amount": amount,
+                "transaction_type": "expense",
+                "description": "Descrizione completa " * 20,
+                "date": f"{day}T12:00:00",
+            },
+        )
+    client.post(
+        "/budgets/",
+        json={"category_id": cat["id"], "amount": 100, "year": 2026, "month": 2},
+    )
+    return acct
+
+
+def test_transactions_select_only_the_requested_columns(auth_client):
+    _setup(auth_client)
+    with QueryRecorder() as queries:
+        resp = auth_client.get("/transactions?fields=amount,date")
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"amount": "-30.00", "date": "2026-02-07T12:00:00"},
+        {"amount": "-12.50", "date": "2026-01-05T12:00:00"},
+    ]
+    [listing] = [s for s in queries.statements if "ORDER BY" in s]
+    assert "description" not in listing and "created_at" not in listing
+
+
+def test_archived_rows_are_projected_too(auth_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    acct = _setup(auth_client)
+    with TestingSessionLocal() as db:
+        assert archive.archive_user(db, acct["owner_id"], datetime(2026, 2, 1)) == 1
+
+    # `date` orders the merge without being returned
+    resp = auth_client.get("/transactions?fields=id,amount")
+    assert [sorted(row) for row in resp.json()] == [["amount", "id"]] * 2
+    assert [row["amount"] for row in resp.json()] == ["-30.00", "-12.50"]
+
+
+def test_accounts_and_budgets(auth_client):
+    _setup(auth_client)
+    accounts = auth_client.get("/accounts/?fields=name,balance").json()
+    assert accounts == [{"name": "Main", "balance": "-32.50"}]
+
+    budgets = auth_client.get("/budgets/?fields=amount&month=2").json()
+    assert budgets == [{"amount": "100.00"}]
+    assert auth_client.get("/budgets/?fields=amount&month=3").json() == []
+
+
+def test_unknown_fields_are_rejected(auth_client):
+    resp = auth_client.get("/transactions?fields=amount,password,owner")
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "Unknown fields: owner, password"
+    assert auth_client.get("/accounts/?fields=,").status_code == 422
+
+
+def test_without_fields_the_full_schema_is_returned(auth_client):
+    _setup(auth_client)
+    [tx, _] = auth_client.get("/transactions").json()
+    assert set(tx) >= {"description", "created_at"}
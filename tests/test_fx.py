@@ -0,0 +1,163 @@
+"""Tests for FX rate loading and currency-converted summaries."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import archive, fx
+from tests.conftest import TestingSessionLocal
+
+ECB_CSV = """Date,USD,JPY,GBP,
+2026-01-05,1.2000,N/A,0.8600,
+2026-01-01,1.1000,160.00,0.8500,
+"""
+
+
+@pytest.fixture
+def rates(tmp_path):
+    path = tmp_path / "eurofxref.csv"
+    path.write_text(ECB_CSV)
+    with TestingSessionLocal() as db:
+        return fx.load_csv(db, path)
+
+
+def _add(client, account_id, day, amount, kind, category_id=None):
+    resp = client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "category_id": category_id,
+            "date": f"{day}T12:00:00",
+        },
+    )
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+@pytest.fixture
+def accounts(auth_client, rates):
+    eur = auth_client.post("/accounts/", json={"name": "Home", "currency": "EUR"})
+    usd = auth_client.post("/accounts/", json={"name": "Trip", "currency": "USD"})
+    eur, usd = eur.json(), usd.json()
+    _add(auth_client, eur["id"], "2026-01-02", 1000, "income")
+    _add(auth_client, usd["id"], "2026-01-03", 110, "expense")  # 100 EUR at 1.10
+    _add(auth_client, usd["id"], "2026-01-06", 240, "income")  # 200 EUR at 1.20
+    return eur, usd
+
+
+def _summary(client, **params):
+    resp = client.get("/transactions/summary", params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_load_csv_reads_wide_and_long_files(tmp_path, rates):
+    assert rates == 5  # N/A and the trailing empty column are skipped
+    long = tmp_path / "long.csv"
+    long.write_text("date,currency,rate\n2026-01-05,usd,1.25\n2026-01-05,CHF,0.93\n")
+    with TestingSessionLocal() as db:
+        assert fx.load_csv(db, long) == 2
+        table = fx.rate_table(db)
+    days = np.array(["2026-01-05"], dtype="datetime64[D]")
+    assert table.rates("USD", days)[0] == 1.25  # overwritten
+    assert "CHF" in table and "JPY" in table
+
+
+def test_rates_apply_as_of_each_day(rates):
+    days = np.array(
+        ["2025-06-01", "2026-01-01", "2026-01-04", "2026-01-05", "2026-03-01"],
+        dtype="datetime64[D]",
+    )
+    with TestingSessionLocal() as db:
+        table = fx.rate_table(db)
+    # Before the first rate the earliest one applies; gaps carry forward
+    assert list(table.rates("USD", days)) == [1.1, 1.1, 1.1, 1.2, 1.2]
+    assert list(table.rates(settings.FX_BASE_CURRENCY, days)) == [1.0] * 5
+
+
+def test_summary_converts_to_requested_currency(auth_client, accounts):
+    data = _summary(auth_client, currency="EUR")
+    assert data["currency"] == "EUR"
+    assert Decimal(data["total_income"]) == Decimal("1200")
+    assert Decimal(data["total_expenses"]) == Decimal("100")
+    assert Decimal(data["net"]) == Decimal("1100")
+
+    data = _summary(auth_client, currency="usd")
+    assert Decimal(data["total_income"]) == Decimal("1340")
+    assert Decimal(data["total_expenses"]) == Decimal("110")
+
+
+def test_summary_without_currency_is_unchanged(auth_client, accounts):
+    data = _summary(auth_client)
+    assert data["currency"] is None
+    assert Decimal(data["total_income"]) == Decimal("1240")
+
+
+def test_summary_single_currency_skips_rates(auth_client, accounts):
+    eur, _ = accounts
+    # Nothing to convert: the EUR account alone is summed as is
+    data = _summary(auth_client, account_id=eur["id"], currency="EUR")
+    assert Decimal(data["total_income"]) == Decimal("1000")
+
+
+def test_summary_rejects_currency_without_rates(auth_client, accounts):
+    resp = auth_client.get("/transactions/summary", params={"currency": "CHF"})
+    assert resp.status_code == 422
+    assert "CHF" in resp.json()["detail"]
+
+
+def test_summary_converts_archived_rows(auth_client, accounts, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    _, usd = accounts
+    _add(auth_client, usd["id"], "2025-06-01", 11, "expense")
+    me = auth_client.get("/users/me").json()
+    with TestingSessionLocal() as db:
+        assert archive.archive_user(db, me["id"], datetime(2026, 1, 1)) == 1
+
+    data = _summary(auth_client, currency="EUR")
+    assert Decimal(data["total_expenses"]) == Decimal("110")  # 100 + 11 / 1.10
+
+
+def test_budget_status_in_requested_currency(auth_client, accounts):
+    _, usd = accounts
+    travel = auth_client.post("/categories", json={"name": "Travel"}).json()
+    _add(auth_client, usd["id"], "2026-01-07", 60, "expense", travel["id"])
+    auth_client.post(
+        "/budgets/",
+        json={"category_id": travel["id"], "year": 2026, "month": 1, "amount": 100},
+    )
+    resp = auth_client.get(
+        "/budgets/status", params={"year": 2026, "month": 1, "currency": "EUR"}
+    )
+    assert resp.status_code == 200, resp.text
+    assert Decimal(resp.json()[0]["spent"]) == Decimal("50")
+
+
+def test_reports_convert_frame(auth_client, accounts):
+    resp = auth_client.get(
+        "/reports",
+        params={
+            "start_date": "2026-01-01",
+            "end_date": "2026-01-31",
+            "currency": "EUR",
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["currency"] == "EUR"
+    assert Decimal(data["totals"]["income"]) == Decimal("1200")
+    assert Decimal(data["totals"]["expenses"]) == Decimal("100")
+
+
+def test_rate_table_is_cached(rates):
+    with TestingSessionLocal() as db:
+        table = fx.rate_table(db)
+        assert fx.rate_table(db) is table
+    fx.clear_cache()
+    with TestingSessionLocal() as db:
+        assert fx.rate_table(db) is not table
@@ -0,0 +1,79 @@
+"""Integration tests for the Fineco import endpoints."""
+
+from datetime import date
+
+import pytest  # noqa: F401 — fixtures injected via conftest
+
+from app.core.query_log import QueryRecorder
+from scripts.generate_data import write_statement
+
+
+@pytest.fixture
+def statement(tmp_path):
+    path = tmp_path / "movimenti.xlsx"
+    write_statement(path, rows=200, seed=7, end=date(2026, 3, 31))
+    return path.read_bytes()
+
+
+def test_preview_generated_statement(auth_client, statement):
+    resp = auth_client.post(
+        "/import/preview", files={"file": ("movimenti.xlsx", statement)}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["rows"]) == 200
+    assert data["total_income"] > 0
+    assert data["total_expenses"] > 0
+
+
+def test_confirm_import_updates_balance(auth_client, statement):
+    acct = auth_client.post("/accounts/", json={"name": "Fineco"}).json()
+    preview = auth_client.post(
+        "/import/preview", files={"file": ("movimenti.xlsx", statement)}
+    ).json()
+
+    resp = auth_client.post(
+        "/import/confirm", json={"account_id": acct["id"], "rows": preview["rows"]}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["imported"] == 200
+
+    balance = float(auth_client.get(f"/accounts/{acct['id']}").json()["balance"])
+    expected = preview["total_income"] - preview["total_expenses"]
+    assert balance == pytest.approx(expected)
+
+
+def test_confirm_keeps_exact_cents(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Fineco"}).json()
+    rows = [
+        {
+            "date": "2026-03-02",
+            "description": None,
+            "amount": 0.1,
+            "transaction_type": "expense",
+        }
+    ] * 30 + [
+        {
+            "date": "2026-03-03",
+            "description": None,
+            "amount": 0.7,
+            "transaction_type": "income",
+        }
+    ]
+    with QueryRecorder() as queries:
+        auth_client.post(
+            "/import/confirm", json={"account_id": acct["id"], "rows": rows}
+        )
+    assert [s for s in queries.statements if s.startswith("UPDATE accounts")] == [
+        "UPDATE accounts SET balance=(accounts.balance + ?) WHERE accounts.id = ?"
+    ]
+
+    # 0.7 - 30 * 0.1 in floats is -2.3000000000000007
+    assert auth_client.get(f"/accounts/{acct['id']}").json()["balance"] == "-2.30"
+    drift = auth_client.get(f"/accounts/{acct['id']}/reconcile").json()["drift"]
+    assert drift == "0.00"
+
+
+def test_preview_rejects_non_excel(auth_client):
+    resp = auth_client.post("/import/preview", files={"file": ("notes.txt", b"hi")})
+    assert resp.status_code == 400
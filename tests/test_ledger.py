@@ -0,0 +1,148 @@
+"""Tests for ledger checkpoints and balance reconciliation."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services import archive, ledger
+from tests.conftest import TestingSessionLocal, engine
+
+
+def _add(client, account_id, day, amount, kind="expense"):
+    resp = client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "date": f"{day}T12:00:00",
+        },
+    )
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def _sql(statement, **params):
+    with engine.begin() as conn:
+        conn.execute(text(statement), params)
+
+
+@pytest.fixture
+def account(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main", "balance": 100}).json()
+    _add(auth_client, acct["id"], "2026-01-10", 1000, "income")
+    _add(auth_client, acct["id"], "2026-01-20", 30)
+    _add(auth_client, acct["id"], "2026-02-05", 45.5)
+    return acct
+
+
+def test_balanced_account(auth_client, account):
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert body["balance"] == body["expected_balance"] == "1024.50"
+    assert body["drift"] == "0.00"
+    assert body["months_checked"] == 2
+    assert body["full"] is False
+
+    # Nothing changed since: no month is read again
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert body["months_checked"] == 0
+    assert body["drift"] == "0.00"
+
+
+def test_only_changed_months_are_recomputed(auth_client, account):
+    auth_client.get(f"/accounts/{account['id']}/reconcile")
+    tx = _add(auth_client, account["id"], "2026-03-01", 5)
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert (body["months_checked"], body["drift"]) == (1, "0.00")
+
+    # A date change touches the old and the new month
+    auth_client.patch(f"/transactions/{tx['id']}", json={"date": "2026-01-15T00:00:00"})
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert (body["months_checked"], body["drift"]) == (2, "0.00")
+
+    auth_client.delete(f"/transactions/{tx['id']}")
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert (body["months_checked"], body["drift"]) == (1, "0.00")
+
+
+def test_drift_is_reported_and_repaired(auth_client, account):
+    auth_client.get(f"/accounts/{account['id']}/reconcile")
+    _sql("UPDATE accounts SET balance = balance + 500 WHERE id = :id", id=account["id"])
+
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert body["drift"] == "5.00"
+    assert body["repaired"] is False
+
+    body = auth_client.post(f"/accounts/{account['id']}/reconcile").json()
+    assert body["repaired"] is True
+    balance = auth_client.get(f"/accounts/{account['id']}").json()["balance"]
+    assert balance == "1024.50"
+
+
+def test_full_run_finds_unmarked_changes(auth_client, account):
+    auth_client.get(f"/accounts/{account['id']}/reconcile")
+    # Changed behind the API's back: balance and rows agree, checkpoints don't
+    _sql("DELETE FROM transactions WHERE amount = -4550")
+    _sql(
+        "UPDATE accounts SET balance = balance + 4550 WHERE id = :id", id=account["id"]
+    )
+
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert body["drift"] == "45.50"  # stale checkpoint
+
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile?full=true").json()
+    assert body["drift"] == "0.00"
+    assert body["mismatched_months"] == [
+        {
+            "month": "2026-02-01",
+            "total": "0.00",
+            "count": 0,
+            "recorded_total": "-45.50",
+            "recorded_count": 1,
+        }
+    ]
+
+
+def test_existing_account_gets_a_baseline(auth_client, account):
+    _sql("DELETE FROM ledger_checkpoints")
+    _sql("UPDATE accounts SET opening_balance = NULL")
+
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert body["full"] is True
+    assert body["drift"] == "0.00"
+    with engine.connect() as conn:
+        assert (
+            conn.execute(text("SELECT opening_balance FROM accounts")).scalar() == 10000
+        )
+
+
+def test_archived_rows_are_counted(auth_client, account, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    with TestingSessionLocal() as db:
+        assert archive.archive_user(db, account["owner_id"], datetime(2026, 2, 1)) == 2
+    # Backdated into an archived month
+    _add(auth_client, account["id"], "2026-01-25", 1)
+
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile").json()
+    assert (body["months_checked"], body["drift"]) == (2, "0.00")
+    body = auth_client.get(f"/accounts/{account['id']}/reconcile?full=true").json()
+    assert body["drift"] == "0.00"
+    assert body["mismatched_months"] == []
+
+
+def test_reconcile_all_reports_drifted_accounts(auth_client, account):
+    other = auth_client.post("/accounts/", json={"name": "Other"}).json()
+    _add(auth_client, other["id"], "2026-01-03", 7)
+    with TestingSessionLocal() as db:
+        assert ledger.reconcile_all(db) == []
+
+    _sql("UPDATE accounts SET balance = balance - 1 WHERE id = :id", id=other["id"])
+    with TestingSessionLocal() as db:
+        [drifted] = ledger.reconcile_all(db)
+        assert (drifted.account_id, drifted.months_checked) == (other["id"], 0)
+        assert str(drifted.drift) == "-0.01"
+
+        assert ledger.reconcile_all(db, repair=True)[0].repaired
+        assert ledger.reconcile_all(db) == []
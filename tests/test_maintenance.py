@@ -0,0 +1,130 @@
+"""Tests for the background maintenance scheduler and its tasks."""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.core.config import settings
+from app.db.session import Base
+from app.models.maintenance import MaintenanceLease
+from app.services import maintenance
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    target = create_engine(f"sqlite:///{tmp_path / 'maintenance.db'}")
+    Base.metadata.create_all(target, tables=[MaintenanceLease.__table__])
+    yield target
+    target.dispose()
+
+
+def _lease(target, task):
+    with target.connect() as conn:
+        return conn.execute(
+            select(MaintenanceLease.__table__).where(MaintenanceLease.task == task)
+        ).one()
+
+
+def test_lease_is_exclusive_until_it_expires(db_engine):
+    now = datetime.now(timezone.utc)
+    assert maintenance.acquire(db_engine, "optimize", "a:1", 3600, 900, now)
+    assert not maintenance.acquire(db_engine, "optimize", "b:2", 3600, 900, now)
+    # The holder died without releasing: the lease runs out
+    later = now + timedelta(seconds=901)
+    assert maintenance.acquire(db_engine, "optimize", "b:2", 3600, 900, later)
+    assert _lease(db_engine, "optimize").holder == "b:2"
+
+
+def test_interval_counts_from_the_last_finished_run(db_engine):
+    assert maintenance.acquire(db_engine, "optimize", "a:1", 3600, 900)
+    maintenance.release(db_engine, "optimize", "a:1", 0.25, "optimized")
+
+    lease = _lease(db_engine, "optimize")
+    assert lease.holder is None
+    assert lease.last_duration_ms == 250
+    assert not maintenance.acquire(db_engine, "optimize", "b:2", 3600, 900)
+    later = datetime.now(timezone.utc) + timedelta(hours=2)
+    assert maintenance.acquire(db_engine, "optimize", "b:2", 3600, 900, later)
+
+
+def test_scheduler_waits_for_a_quiet_database(db_engine):
+    scheduler = maintenance.Scheduler(
+        {"main": db_engine}, intervals={"optimize": 3600}, quiet_seconds=0
+    )
+    with db_engine.connect():
+        assert scheduler.tick() == []  # a request holds a connection
+
+    assert scheduler.tick() == [("main", "optimize", "optimized")]
+    lease = _lease(db_engine, "optimize")
+    assert lease.last_result == "optimized"
+    assert lease.last_duration_ms is not None
+    assert scheduler.tick() == []  # not due again for an hour
+
+    busy = maintenance.Scheduler({"main": db_engine}, {"cleanup": 60}, 3600)
+    assert busy.tick() == []  # the last request was less than an hour ago
+
+
+def test_failed_task_is_recorded_and_released(db_engine, monkeypatch):
+    def broken(target, deadline):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setitem(maintenance.TASKS, "optimize", maintenance.Task(broken))
+    scheduler = maintenance.Scheduler({"main": db_engine}, {"optimize": 60}, 0)
+    assert scheduler.tick() == [("main", "optimize", "error: disk full")]
+    assert _lease(db_engine, "optimize").holder is None
+
+
+def test_incremental_vacuum_frees_pages_in_steps(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAINTENANCE_VACUUM_PAGES", 10)
+    target = create_engine(f"sqlite:///{tmp_path / 'vacuum.db'}")
+    with target.begin() as conn:
+        conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.exec_driver_sql("CREATE TABLE blobs (data BLOB)")
+        for _ in range(100):
+            conn.exec_driver_sql("INSERT INTO blobs VALUES (zeroblob(4000))")
+    with target.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM blobs")
+
+    result = maintenance.incremental_vacuum(target, time.monotonic() + 10)
+    assert result.startswith("freed ") and result.endswith(", 0 left")
+    with target.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA freelist_count").scalar() == 0
+    target.dispose()
+
+
+def test_incremental_vacuum_skips_other_databases(db_engine):
+    result = maintenance.incremental_vacuum(db_engine, time.monotonic() + 10)
+    assert result == "skipped: auto_vacuum is not incremental"
+
+
+def test_wal_checkpoint(db_engine):
+    assert maintenance.wal_checkpoint(db_engine, 0) == "skipped: journal_mode=delete"
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode = WAL")
+    with db_engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x)")
+    assert maintenance.wal_checkpoint(db_engine, 0).startswith("checkpointed ")
+
+
+def test_cleanup_removes_expired_files(tmp_path, monkeypatch):
+    profiles, archive = tmp_path / "profiles", tmp_path / "archive"
+    profiles.mkdir()
+    archive.mkdir()
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(profiles))
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(archive))
+    old = time.time() - 30 * 86_400
+    for path in (profiles / "old.folded", archive / "user_1.moving"):
+        path.write_text("x")
+        os.utime(path, (old, old))
+    (profiles / "new.folded").write_text("x")
+    (archive / "user_1.ftarc").write_text("x")
+    os.utime(archive / "user_1.ftarc", (old, old))
+
+    assert maintenance.cleanup(None, 0) == "removed 2 files"
+    assert sorted(p.name for p in tmp_path.glob("*/*")) == [
+        "new.folded",
+        "user_1.ftarc",
+    ]
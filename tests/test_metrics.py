@@ -0,0 +1,50 @@
+"""Tests for the Prometheus /metrics endpoint."""
+
+import pytest  # noqa: F401 — fixtures injected via conftest
+
+
+def _sample(body: str, prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"no sample starting with {prefix!r}")
+
+
+def test_metrics_reports_route_latency_and_sql(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Checking"}).json()
+    auth_client.get(f"/accounts/{acct['id']}")
+    auth_client.get(f"/accounts/{acct['id']}")
+
+    resp = auth_client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+
+    # Both GETs are reported under the route template, not the concrete path
+    route = 'method="GET",route="/accounts/{account_id}"'
+    assert _sample(body, f"http_request_duration_seconds_count{{{route}}}") >= 2
+    assert _sample(body, 'db_statements_per_request_count{route="/auth/login"}') >= 1
+    assert _sample(body, "db_statements_total") > 0
+    assert _sample(body, "http_requests_in_flight") >= 1  # the scrape itself
+
+
+def test_metrics_counts_import_rows(auth_client):
+    before = auth_client.get("/metrics").text
+    try:
+        rows_before = _sample(before, 'import_rows_total{stage="confirm"}')
+    except AssertionError:
+        rows_before = 0
+
+    acct = auth_client.post("/accounts/", json={"name": "Fineco"}).json()
+    row = {
+        "date": "2026-01-15",
+        "description": "Test",
+        "amount": 10.0,
+        "transaction_type": "expense",
+    }
+    auth_client.post(
+        "/import/confirm", json={"account_id": acct["id"], "rows": [row, row, row]}
+    )
+
+    after = auth_client.get("/metrics").text
+    assert _sample(after, 'import_rows_total{stage="confirm"}') == rows_before + 3
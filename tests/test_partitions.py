@@ -0,0 +1,121 @@
+"""Tests for yearly transaction partitions (SQLite table-per-year mode)."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.core.query_log import QueryRecorder
+from app.db import partitions
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture(autouse=True)
+def partitioned(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSACTION_PARTITIONING", True)
+    yield
+    with TestingSessionLocal() as db:
+        for year in partitions.partition_years(db):
+            partitions.partition_table(year).drop(db.connection())
+        db.commit()
+
+
+def _add(client, account_id, day, amount, kind="expense", category_id=None):
+    resp = client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "category_id": category_id,
+            "date": f"{day}T12:00:00",
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _roll_over(today=date(2026, 6, 1)):
+    with TestingSessionLocal() as db:
+        return partitions.roll_over(db, today)
+
+
+@pytest.fixture
+def account(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    _add(auth_client, acct["id"], "2024-02-01", 1000, "income")
+    _add(auth_client, acct["id"], "2024-11-20", 30)
+    _add(auth_client, acct["id"], "2025-03-10", 45.5)
+    _add(auth_client, acct["id"], "2026-01-15", 12)
+    return acct
+
+
+def test_roll_over_moves_closed_years(auth_client, account):
+    before = auth_client.get("/transactions").json()
+    summary = auth_client.get("/transactions/summary").json()
+
+    assert _roll_over() == {2024: 2, 2025: 1}
+    assert _roll_over() == {}
+    with TestingSessionLocal() as db:
+        assert partitions.partition_years(db) == [2024, 2025]
+
+    assert auth_client.get("/transactions").json() == before
+    assert auth_client.get("/transactions/summary").json() == summary
+    page = auth_client.get("/transactions", params={"offset": 1, "limit": 2}).json()
+    assert [t["date"][:10] for t in page] == ["2025-03-10", "2024-11-20"]
+
+
+def test_date_predicates_prune_partitions(auth_client, account):
+    _roll_over()
+    with QueryRecorder() as queries:
+        resp = auth_client.get(
+            "/transactions/summary",
+            params={"start_date": "2025-01-01T00:00:00", "end_date": "2025-12-31"},
+        )
+    assert Decimal(resp.json()["total_expenses"]) == Decimal("45.5")
+    sql = "\n".join(queries.statements)
+    assert "transactions_2025" in sql
+    assert "transactions_2024" not in sql
+
+
+def test_budget_status_reads_partitions(auth_client, account):
+    food = auth_client.post("/categories", json={"name": "Food"}).json()
+    _add(auth_client, account["id"], "2025-03-11", 20, category_id=food["id"])
+    auth_client.post(
+        "/budgets/",
+        json={"category_id": food["id"], "amount": "50", "year": 2025, "month": 3},
+    )
+    _roll_over()
+    [status] = auth_client.get("/budgets/status?year=2025&month=3").json()
+    assert Decimal(status["spent"]) == Decimal("20")
+
+
+def test_editing_a_partitioned_row_promotes_it(auth_client, account):
+    old = auth_client.get("/transactions").json()[-1]
+    _roll_over()
+
+    resp = auth_client.patch(
+        f"/transactions/{old['id']}", json={"description": "Stipendio"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["description"] == "Stipendio"
+    with TestingSessionLocal() as db:
+        table = partitions.partition_table(2024)
+        assert db.query(table).count() == 1
+
+    # The next roll-over puts it back; ids are never reused meanwhile
+    assert _roll_over() == {2024: 1}
+    new = _add(auth_client, account["id"], "2026-02-01", 5)
+    assert new["id"] > max(t["id"] for t in auth_client.get("/transactions").json()[1:])
+
+    assert auth_client.delete(f"/transactions/{old['id']}").status_code == 204
+    assert auth_client.get(f"/transactions/{old['id']}").status_code == 404
+
+
+def test_deleting_an_account_clears_its_partitions(auth_client, account):
+    _roll_over()
+    assert auth_client.delete(f"/accounts/{account['id']}").status_code == 204
+    with TestingSessionLocal() as db:
+        for year in (2024, 2025):
+            assert db.query(partitions.partition_table(year)).count() == 0
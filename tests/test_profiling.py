@@ -0,0 +1,47 @@
+"""Tests for the on-demand request profiler."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfilingMiddleware
+from app.main import app
+
+
+@pytest.fixture
+def profiled(client, tmp_path):
+    """A client whose app is wrapped by the profiler (get_db already overridden)."""
+    wrapped = ProfilingMiddleware(app, directory=str(tmp_path), token="s3cret")
+    with TestClient(wrapped) as c:
+        yield c, tmp_path
+
+
+def test_profile_written_for_admin_header(profiled):
+    client, directory = profiled
+    resp = client.get("/health", headers={"X-Profile": "s3cret"})
+    assert resp.status_code == 200
+
+    folded = directory / f"{resp.headers['x-profile-file']}.folded"
+    assert folded.exists()
+    for line in folded.read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+
+
+def test_wrong_token_is_not_profiled(profiled):
+    client, directory = profiled
+    resp = client.get("/health", headers={"X-Profile": "guess"})
+    assert "x-profile-file" not in resp.headers
+    assert not list(directory.iterdir())
+
+
+def test_import_memory_snapshot(profiled):
+    client, directory = profiled
+    resp = client.post(
+        "/import/preview",
+        headers={"X-Profile": "s3cret", "X-Profile-Memory": "1"},
+        files={"file": ("notes.txt", b"hi")},
+    )
+    assert resp.status_code == 401  # unauthenticated, but still profiled
+    name = resp.headers["x-profile-file"]
+    assert (directory / f"{name}.tracemalloc").exists()
+    assert (directory / f"{name}.tracemalloc.txt").exists()
@@ -0,0 +1,54 @@
+"""Tests for the slow-query log and N+1 detector."""
+
+import logging
+
+import pytest
+from sqlalchemy import Engine, event, text
+
+from app.core import query_log
+from app.core.config import settings
+from app.core.query_log import QueryRecorder, normalize_statement
+from tests.conftest import engine
+
+
+@pytest.fixture
+def sql_hooks():
+    """The slow-query hooks, removed again unless they were already on."""
+    if query_log._hooks_installed:
+        yield
+        return
+    query_log.install_sqlalchemy_hooks()
+    try:
+        yield
+    finally:
+        event.remove(Engine, "before_cursor_execute", query_log._before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", query_log._after_cursor_execute)
+        query_log._hooks_installed = False
+
+
+def test_normalize_collapses_literals_and_in_lists():
+    a = normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = 'a'")
+    b = normalize_statement("SELECT *  FROM t\nWHERE id IN (?) AND x = 'bb'")
+    assert a == b == "SELECT * FROM t WHERE id IN (?) AND x = ?"
+
+
+def test_recorder_flags_repeated_statements():
+    with QueryRecorder() as queries, engine.connect() as conn:
+        for i in range(5):
+            conn.execute(text("SELECT id FROM users WHERE id = :id"), {"id": i})
+
+    assert queries.count == 5
+    assert list(queries.repeated(threshold=3).values()) == [5]
+    with pytest.raises(AssertionError, match="N\\+1"):
+        queries.assert_no_n_plus_one(threshold=3)
+
+
+def test_slow_query_logged_with_plan(sql_hooks, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0.0)
+
+    with caplog.at_level(logging.WARNING, logger="app.sql"), engine.connect() as conn:
+        conn.execute(text("SELECT * FROM users WHERE email = :e"), {"e": "a@b.c"})
+
+    record = next(r for r in caplog.records if "slow query" in r.getMessage())
+    assert "a@b.c" in record.getMessage()
+    assert "plan:" in record.getMessage()
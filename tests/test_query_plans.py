@@ -0,0 +1,145 @@
+"""
+Query-plan checks: no hot route reads a whole table.
+
+Every SELECT a route issues is re-planned with EXPLAIN QUERY PLAN against a
+seeded database with two users; a missing index shows up as a full scan.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.query_log import QueryRecorder
+from app.db import partitions
+from app.models.account import Account
+from app.models.budget import Budget
+from app.models.transaction import Category, Transaction
+from app.models.user import User
+from tests.conftest import TestingSessionLocal, engine
+
+MONTH = "2026-03"
+
+HOT_ROUTES = [
+    ("GET", "/users/me"),
+    ("GET", "/accounts/"),
+    ("GET", "/accounts/{account}"),
+    ("GET", "/accounts/{account}/reconcile"),
+    ("GET", "/categories"),
+    ("GET", "/transactions"),
+    ("GET", "/transactions?account_id={account}&start_date=2026-03-01T00:00:00"),
+    ("GET", "/transactions?category_id={category}"),
+    ("GET", "/transactions/summary"),
+    ("GET", "/transactions/summary?start_date=2026-03-01T00:00:00"),
+    ("GET", "/transactions/{transaction}"),
+    ("POST", "/transactions"),
+    ("GET", "/budgets/"),
+    ("GET", "/budgets/status?year=2026&month=3"),
+    ("GET", f"/dashboard?period={MONTH}"),
+    ("GET", "/reports?start_date=2026-01-01&end_date=2026-03-31"),
+    ("GET", "/recurring"),
+]
+
+
+def _seed_user(client, email):
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "secret123", "full_name": "Seed"},
+    )
+    token = client.post(
+        "/auth/login", data={"username": email, "password": "secret123"}
+    ).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+    with TestingSessionLocal() as db:
+        user_id = db.scalar(select(User.id).where(User.email == email))
+        accounts = [Account(owner_id=user_id, name=f"Account {i}") for i in range(3)]
+        categories = [
+            Category(owner_id=user_id, name=f"Category {i}") for i in range(4)
+        ]
+        db.add_all(accounts + categories)
+        db.flush()
+        db.add_all(
+            Budget(
+                owner_id=user_id,
+                category_id=category.id,
+                year=2026,
+                month=3,
+                amount=Decimal(100),
+            )
+            for category in categories
+        )
+        transactions = [
+            Transaction(
+                account_id=accounts[i % 3].id,
+                category_id=categories[i % 4].id,
+                amount=Decimal(5 + i) if i % 5 == 0 else -Decimal(5 + i),
+                transaction_type="income" if i % 5 == 0 else "expense",
+                description=f"Payee {i % 7}",
+                date=datetime(2026, 1 + i % 3, 1 + i % 28, 12),
+            )
+            for i in range(200)
+        ]
+        db.add_all(transactions)
+        db.commit()
+        return {
+            "account": accounts[0].id,
+            "category": categories[0].id,
+            "transaction": transactions[-1].id,
+        }
+
+
+@pytest.fixture
+def seeded(client):
+    _seed_user(client, "other@example.com")
+    return _seed_user(client, "seeded@example.com")
+
+
+@pytest.fixture
+def partitioned(monkeypatch, seeded):
+    """The seeded rows rolled over into SQLite's transactions_2026 table."""
+    monkeypatch.setattr(settings, "TRANSACTION_PARTITIONING", True)
+    with TestingSessionLocal() as db:
+        assert partitions.roll_over(db, date(2027, 1, 1))
+    yield seeded
+    with TestingSessionLocal() as db:
+        for year in partitions.partition_years(db):
+            partitions.partition_table(year).drop(db.connection())
+        db.commit()
+
+
+def _assert_indexed(client, seeded, method, path, allow=frozenset()):
+    path = path.format(**seeded)
+    body = None
+    if method == "POST":
+        body = {
+            "account_id": seeded["account"],
+            "amount": 12,
+            "transaction_type": "expense",
+            "date": "2026-03-15T09:00:00",
+        }
+    with QueryRecorder() as queries:
+        resp = client.request(method, path, json=body)
+    assert resp.status_code < 300, resp.text
+    queries.assert_no_full_scans(engine, allow)
+
+
+@pytest.mark.parametrize(("method", "path"), HOT_ROUTES)
+def test_hot_route_uses_indexes(client, seeded, method, path):
+    _assert_indexed(client, seeded, method, path)
+
+
+@pytest.mark.parametrize(("method", "path"), HOT_ROUTES)
+def test_hot_route_uses_indexes_when_partitioned(client, partitioned, method, path):
+    # Partition tables are listed from the schema, which is always a scan
+    _assert_indexed(client, partitioned, method, path, frozenset({"sqlite_master"}))
+
+
+def test_full_scan_is_reported(client, seeded):
+    with QueryRecorder() as queries:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT * FROM transactions WHERE description = 'x'")
+    assert list(queries.full_scans(engine).values())[0][0].endswith("SCAN transactions")
+    assert not queries.full_scans(engine, allow=frozenset({"transactions"}))
@@ -0,0 +1,157 @@
+"""Tests for recurring payment detection and GET /recurring."""
+
+from datetime import date, datetime, timedelta
+
+import pytest  # noqa: F401 — fixtures injected via conftest
+
+from app.core.config import settings
+from app.models.recurring import RecurringSeries, RecurringWatermark
+from app.services import archive
+from app.services.recurring import classify_interval, normalize_payee
+from tests.conftest import TestingSessionLocal
+
+
+def _add(client, account_id, day, amount, description, kind="expense"):
+    resp = client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "description": description,
+            "date": f"{day.isoformat()}T09:00:00",
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _series_ids():
+    with TestingSessionLocal() as db:
+        return sorted(s.id for s in db.query(RecurringSeries).all())
+
+
+@pytest.fixture
+def account(auth_client):
+    return auth_client.post("/accounts/", json={"name": "Fineco"}).json()
+
+
+def test_normalize_payee_strips_fineco_noise():
+    assert normalize_payee("Pagamento Visa Debit NETFLIX.COM") == "NETFLIX.COM"
+    assert (
+        normalize_payee("Pagamento Visa Debit NETFLIX.COM Carta N.****1234 Data 05/01")
+        == "NETFLIX.COM"
+    )
+    assert normalize_payee("Addebito SDD ENEL ENERGIA bolletta 2026") == (
+        "ENEL ENERGIA BOLLETTA"
+    )
+    assert normalize_payee(None) == "?"
+
+
+def test_classify_interval():
+    assert classify_interval(7) == "weekly"
+    assert classify_interval(31) == "monthly"
+    assert classify_interval(28) == "monthly"
+    assert classify_interval(365) == "yearly"
+    assert classify_interval(14) is None
+
+
+def test_detects_monthly_subscription(auth_client, account):
+    for month in (1, 2, 3, 4):
+        _add(
+            auth_client,
+            account["id"],
+            date(2026, month, 5),
+            12.99,
+            f"Pagamento Visa Debit NETFLIX.COM Carta N.****1234 Rif {month}",
+        )
+    _add(auth_client, account["id"], date(2026, 2, 11), 38.5, "ESSELUNGA MILANO")
+    _add(auth_client, account["id"], date(2026, 3, 2), 12.0, "ESSELUNGA MILANO")
+
+    data = auth_client.get("/recurring?include_inactive=true").json()
+    assert len(data) == 1
+    [netflix] = data
+    assert netflix["payee"] == "NETFLIX.COM"
+    assert netflix["period"] == "monthly"
+    assert netflix["occurrences"] == 4
+    assert netflix["next_date"] == "2026-05-05"
+    assert float(netflix["next_amount"]) == 12.99
+
+
+def test_amount_outside_tolerance_is_a_different_series(auth_client, account):
+    for week in range(4):
+        day = date(2026, 1, 5) + timedelta(weeks=week)
+        _add(auth_client, account["id"], day, 10, "PALESTRA FIT")
+        _add(auth_client, account["id"], day, 60, "PALESTRA FIT")
+
+    data = auth_client.get("/recurring?include_inactive=true").json()
+    assert sorted(float(s["next_amount"]) for s in data) == [10, 60]
+    assert {s["period"] for s in data} == {"weekly"}
+
+
+def test_inactive_series_are_hidden_by_default(auth_client, account):
+    today = date.today()
+    for months_ago in (3, 2, 1, 0):
+        _add(
+            auth_client,
+            account["id"],
+            today - timedelta(days=30 * months_ago),
+            9.99,
+            "Addebito SDD ILIAD ITALIA",
+        )
+    for years_ago in (4, 3):
+        _add(
+            auth_client,
+            account["id"],
+            today - timedelta(days=365 * years_ago),
+            49,
+            "OLD MAGAZINE",
+        )
+
+    assert [s["payee"] for s in auth_client.get("/recurring").json()] == [
+        "ILIAD ITALIA"
+    ]
+
+
+def test_new_transactions_are_folded_in_incrementally(auth_client, account):
+    for month in (1, 2, 3):
+        _add(auth_client, account["id"], date(2026, month, 1), 850, "AFFITTO ROSSI")
+    auth_client.get("/recurring?include_inactive=true")
+    before = _series_ids()
+
+    tx = _add(auth_client, account["id"], date(2026, 4, 1), 850, "AFFITTO ROSSI")
+    [rent] = auth_client.get("/recurring?include_inactive=true").json()
+    assert rent["occurrences"] == 4
+    assert _series_ids() == before  # updated in place, not rebuilt
+    with TestingSessionLocal() as db:
+        watermark = db.get(RecurringWatermark, account["owner_id"])
+        assert watermark.last_transaction_id == tx["id"]
+
+    # A delete invalidates the state: the next call rebuilds from scratch
+    auth_client.delete(f"/transactions/{tx['id']}")
+    [rent] = auth_client.get("/recurring?include_inactive=true").json()
+    assert rent["occurrences"] == 3
+    assert rent["next_date"] == "2026-04-01"
+
+
+def test_backdated_transaction_triggers_rebuild(auth_client, account):
+    for month in (2, 3, 4):
+        _add(auth_client, account["id"], date(2026, month, 18), 10.99, "SPOTIFY AB")
+    auth_client.get("/recurring?include_inactive=true")
+
+    _add(auth_client, account["id"], date(2026, 1, 18), 10.99, "SPOTIFY AB")
+    [spotify] = auth_client.get("/recurring?include_inactive=true").json()
+    assert spotify["occurrences"] == 4
+    assert spotify["first_date"] == "2026-01-18"
+
+
+def test_rebuild_includes_archived_history(auth_client, account, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    for month in (1, 2, 3, 4):
+        _add(auth_client, account["id"], date(2026, month, 1), 850, "AFFITTO ROSSI")
+    with TestingSessionLocal() as db:
+        assert archive.archive_user(db, account["owner_id"], datetime(2026, 3, 1)) == 2
+
+    [rent] = auth_client.get("/recurring?include_inactive=true").json()
+    assert rent["occurrences"] == 4
+    assert rent["first_date"] == "2026-01-01"
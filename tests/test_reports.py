@@ -0,0 +1,134 @@
+"""Tests for the NumPy analytics engine and GET /reports."""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest  # noqa: F401 — fixtures injected via conftest
+
+from app.core.config import settings
+from app.core.query_log import QueryRecorder
+from app.services import analytics, archive
+from tests.conftest import TestingSessionLocal
+
+
+def _add(client, account_id, day, amount, kind, category_id=None):
+    client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "category_id": category_id,
+            "date": f"{day}T10:00:00",
+        },
+    )
+
+
+@pytest.fixture
+def seeded(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    food = auth_client.post("/categories", json={"name": "Food"}).json()
+    rent = auth_client.post("/categories", json={"name": "Rent"}).json()
+    _add(auth_client, acct["id"], "2026-01-01", 2000, "income")
+    _add(auth_client, acct["id"], "2026-01-02", 800, "expense", rent["id"])
+    _add(auth_client, acct["id"], "2026-01-03", 40.25, "expense", food["id"])
+    _add(auth_client, acct["id"], "2026-02-01", 2000, "income")
+    _add(auth_client, acct["id"], "2026-02-02", 800, "expense", rent["id"])
+    _add(auth_client, acct["id"], "2026-02-10", 100.10, "expense", food["id"])
+    _add(auth_client, acct["id"], "2026-02-11", 9.99, "expense")
+    return acct, food, rent
+
+
+def _reports(client, **params):
+    query = {"start_date": "2026-01-01", "end_date": "2026-02-28", **params}
+    resp = client.get("/reports", params=query)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_reports_totals_and_months(auth_client, seeded):
+    data = _reports(auth_client)
+    assert data["transactions"] == 7
+
+    totals = data["totals"]
+    assert Decimal(totals["income"]) == Decimal("4000")
+    assert Decimal(totals["expenses"]) == Decimal("1750.34")
+    assert Decimal(totals["net"]) == Decimal("2249.66")
+    assert totals["savings_rate"] == 56.2
+    assert Decimal(totals["average_daily_spend"]) == Decimal("29.67")  # / 59 days
+
+    jan, feb = data["months"]
+    assert jan["month"] == "2026-01"
+    assert Decimal(jan["expenses"]) == Decimal("840.25")
+    assert jan["expenses_change"] is None
+    assert Decimal(feb["expenses_change"]) == Decimal("69.84")
+    assert Decimal(feb["cumulative_net"]) == Decimal("2249.66")
+
+
+def test_archived_rows_are_reported(auth_client, seeded, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    before = _reports(auth_client)
+    acct, _, _ = seeded
+    with TestingSessionLocal() as db:
+        assert archive.archive_user(db, acct["owner_id"], datetime(2026, 2, 5)) == 5
+    analytics.clear_cache()
+
+    assert _reports(auth_client) == before
+    summary = auth_client.get(
+        "/transactions/summary",
+        params={"start_date": "2026-01-01T00:00:00", "end_date": "2026-02-28T23:59:59"},
+    ).json()
+    assert Decimal(summary["total_expenses"]) == Decimal(before["totals"]["expenses"])
+
+
+def test_reports_category_trends(auth_client, seeded):
+    _, food, _ = seeded
+    categories = _reports(auth_client)["categories"]
+    assert [c["category_name"] for c in categories] == ["Rent", "Food"]
+    food_trend = categories[1]
+    assert food_trend["category_id"] == food["id"]
+    assert [Decimal(v) for v in food_trend["months"]] == [
+        Decimal("40.25"),
+        Decimal("100.10"),
+    ]
+
+
+def test_reports_rolling_spend(auth_client, seeded):
+    rolling = _reports(auth_client, window=2)["rolling_spend"]
+    assert len(rolling) == 59
+    assert rolling[0] == {"date": "2026-01-01", "average": "0"}
+    assert Decimal(rolling[1]["average"]) == Decimal("400")  # (0 + 800) / 2
+    assert Decimal(rolling[2]["average"]) == Decimal("420.12")
+
+
+def test_frames_are_cached_per_data_version(auth_client, seeded):
+    acct, _, _ = seeded
+    _reports(auth_client)
+    with QueryRecorder() as queries:
+        _reports(auth_client)
+    assert not any("FROM transactions" in s for s in queries.statements)
+
+    _add(auth_client, acct["id"], "2026-02-20", 5, "expense")
+    assert _reports(auth_client)["transactions"] == 8
+
+
+def test_reports_reject_foreign_account(auth_client, seeded):
+    resp = auth_client.get("/reports", params={"account_id": 999})
+    assert resp.status_code == 403
+
+
+def test_empty_frame_reports_zeroes():
+    frame = analytics.Frame(
+        cents=np.array([], dtype="int64"),
+        days=np.array([], dtype="datetime64[D]"),
+        income=np.array([], dtype=bool),
+        category=np.array([], dtype="int32"),
+        account=np.array([], dtype="int32"),
+        category_ids=np.array([], dtype="int64"),
+        account_ids=np.array([], dtype="int64"),
+    )
+    report = analytics.compute_reports(frame, date(2026, 1, 1), date(2026, 1, 31))
+    assert report["totals"]["income"] == 0
+    assert report["totals"]["savings_rate"] is None
+    assert report["categories"] == []
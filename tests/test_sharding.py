@@ -0,0 +1,190 @@
+"""Tests for sharded mode: routing, placement and rebalancing."""
+
+from collections import Counter
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.session import Base, ShardedSession, get_db
+from app.db.sharding import HashRing, assign_shard
+from app.main import app
+from app.models.account import Account
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services import archive, rebalance
+from tests.conftest import TestingSessionLocal
+from tests.conftest import engine as global_engine
+
+
+def _memory_engine():
+    shard = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # Enforce foreign keys like PostgreSQL would: the shard has no users rows
+    event.listen(
+        shard, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON")
+    )
+    Base.metadata.create_all(shard)
+    return shard
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    """Two in-memory shards, with the test database as the global one."""
+    engines = {"a": _memory_engine(), "b": _memory_engine()}
+    monkeypatch.setattr(db_session, "engine", global_engine)
+    monkeypatch.setattr(rebalance, "engine", global_engine)
+    for name, shard in engines.items():
+        monkeypatch.setitem(db_session.shard_engines, name, shard)
+    sharded = sessionmaker(class_=ShardedSession, autoflush=False, bind=global_engine)
+
+    def override_get_db():
+        with sharded() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    return engines
+
+
+def _register(client, email):
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "password123", "full_name": "Test"},
+    )
+    token = client.post(
+        "/auth/login", data={"username": email, "password": "password123"}
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _count(engine, column):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count(column))).scalar()
+
+
+def test_ring_is_stable_and_moves_little_when_growing():
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+    placed = Counter(before.node_for(i) for i in range(3000))
+    assert min(placed.values()) > 700  # roughly even
+
+    moved = [i for i in range(3000) if before.node_for(i) != after.node_for(i)]
+    assert all(after.node_for(i) == "d" for i in moved)
+    assert 450 < len(moved) < 1200  # about a quarter
+
+
+def test_requests_are_routed_to_the_users_shard(client, shards):
+    headers = _register(client, "user@example.com")
+    with global_engine.connect() as conn:
+        user_id, shard = conn.execute(select(User.id, User.shard)).one()
+    assert shard == assign_shard(user_id)
+
+    acct = client.post("/accounts/", json={"name": "Main"}, headers=headers).json()
+    food = client.post("/categories", json={"name": "Food"}, headers=headers).json()
+    budget = client.post(
+        "/budgets/",
+        json={"category_id": food["id"], "amount": 50, "year": 2026, "month": 3},
+        headers=headers,
+    )
+    assert budget.status_code == 201
+    client.post(
+        "/transactions",
+        json={"account_id": acct["id"], "amount": 10, "transaction_type": "expense"},
+        headers=headers,
+    )
+    other = "b" if shard == "a" else "a"
+    assert _count(shards[shard], Transaction.id) == 1
+    assert _count(shards[other], Account.id) == 0
+    assert _count(global_engine, Account.id) == 0
+    assert len(client.get("/transactions", headers=headers).json()) == 1
+
+
+def test_rebalance_moves_global_users_to_their_shard(auth_client, shards):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    food = auth_client.post("/categories", json={"name": "Food"}).json()
+    auth_client.post(
+        "/transactions",
+        json={
+            "account_id": acct["id"],
+            "category_id": food["id"],
+            "amount": 12.5,
+            "transaction_type": "expense",
+        },
+    )
+    # Occupy the target's first ids so the moved rows must be re-keyed
+    for shard in shards.values():
+        with shard.begin() as conn:
+            conn.execute(Account.__table__.insert().values(owner_id=99, name="x"))
+
+    [move] = rebalance.plan()
+    assert move.source is None
+    assert rebalance.rebalance(dry_run=True)[0].rows == 0
+    rebalance.rebalance()
+
+    assert rebalance.plan() == []
+    assert _count(global_engine, Account.id) == 0
+    assert _count(global_engine, Transaction.id) == 0
+    target = shards[move.target]
+    with target.connect() as conn:
+        new_account = conn.scalar(select(Account.id).where(Account.owner_id == 1))
+        tx = conn.execute(select(Transaction)).one()
+    assert new_account != acct["id"]
+    assert tx.account_id == new_account
+
+    # The API serves the moved data from the shard
+    [listed] = auth_client.get("/transactions").json()
+    assert listed["account_id"] == new_account
+    [category] = auth_client.get("/categories").json()
+    assert category["name"] == "Food"
+
+
+def test_transaction_ids_stay_unique_across_hot_and_archived_rows(
+    auth_client, shards, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+
+    def add(day):
+        return auth_client.post(
+            "/transactions",
+            json={
+                "account_id": acct["id"],
+                "amount": 10,
+                "transaction_type": "expense",
+                "date": f"{day}T12:00:00",
+            },
+        ).json()["id"]
+
+    # Older rows entered last: archived ids are above the hot ones
+    hot = [add(day) for day in ("2026-02-01", "2026-03-01")]
+    archived = [add(day) for day in ("2025-03-01", "2025-06-01")]
+    with TestingSessionLocal() as db:
+        assert archive.archive_user(db, acct["owner_id"], datetime(2026, 1, 1)) == 2
+    # Another user on each shard already holds the first hot id
+    for shard in shards.values():
+        with shard.begin() as conn:
+            other = conn.execute(
+                Account.__table__.insert().values(owner_id=99, name="x")
+            ).inserted_primary_key[0]
+            conn.execute(
+                Transaction.__table__.insert().values(
+                    id=hot[0], account_id=other, amount=1, transaction_type="income"
+                )
+            )
+
+    rebalance.rebalance()
+
+    txs = auth_client.get("/transactions").json()
+    listed = [tx["id"] for tx in txs]
+    assert len(listed) == len(set(listed)) == 4
+    # Free and archived ids are kept; the taken one is renumbered past them
+    assert sorted(listed) == [hot[1], *archived, archived[-1] + 1]
+    # New rows on the target never reuse an id the user's rows hold
+    acct["id"] = txs[0]["account_id"]
+    listed.append(add("2026-04-01"))
+    assert len(set(listed)) == 5
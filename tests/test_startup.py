@@ -0,0 +1,53 @@
+"""Tests for cold-start behaviour: lazy imports and the warm-up phase."""
+
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+import app.main
+from app.core.config import settings
+from app.core.query_log import QueryRecorder
+from app.db import session as db_session
+from app.db.warmup import warm_up
+from tests.conftest import engine
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('openpyxl', 'bcrypt', 'jose', 'numpy') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_warm_up_runs_hot_queries_on_empty_schema():
+    assert warm_up(engine, connections=2) > 0
+
+
+def test_shards_are_warmed_up_without_users_lookups():
+    with QueryRecorder() as queries:
+        warm_up(engine, connections=1, users=False)
+    assert queries.statements
+    assert not [s for s in queries.statements if "FROM users" in s]
+
+
+def test_a_failing_engine_does_not_skip_the_others(monkeypatch):
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", True)
+    for name in ("a", "b"):
+        monkeypatch.setitem(db_session.shard_engines, name, object())
+    warmed = []
+
+    def fake_warm_up(target, connections, users):
+        if target is db_session.shard_engines["a"]:
+            raise RuntimeError("shard a is down")
+        warmed.append((target, users))
+        return 0.1
+
+    monkeypatch.setattr(app.main, "warm_up", fake_warm_up)
+    with TestClient(app.main.app):
+        pass
+    assert warmed == [(app.main.engine, True), (db_session.shard_engines["b"], False)]
@@ -0,0 +1,58 @@
+"""Tests for response compression and static asset caching."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.static import CACHE_IMMUTABLE, CACHE_REVALIDATE, CachedStaticFiles
+from scripts.build_static import build
+
+
+def test_large_json_response_is_gzipped(auth_client):
+    for i in range(30):
+        auth_client.post("/categories", json={"name": f"Category number {i}"})
+
+    resp = auth_client.get("/categories", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()) == 30
+
+
+def test_small_json_response_is_not_compressed(client):
+    resp = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+
+def test_index_html_is_revalidated(client):
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == CACHE_REVALIDATE
+
+
+def test_built_assets_are_hashed_precompressed_and_immutable(tmp_path):
+    src = tmp_path / "static"
+    src.mkdir()
+    (src / "app.js").write_text("console.log('hi');\n" * 200)
+    (src / "style.css").write_text("body { color: red; }\n" * 200)
+    (src / "index.html").write_text(
+        '<link href="/style.css" /><script src="/app.js"></script>'
+    )
+
+    manifest = build(src, tmp_path / "dist")
+    index = (tmp_path / "dist" / "index.html").read_text()
+    assert f'"/{manifest["app.js"]}"' in index
+    assert f'"/{manifest["style.css"]}"' in index
+
+    app = FastAPI()
+    app.mount("/", CachedStaticFiles(directory=tmp_path / "dist", html=True))
+    client = TestClient(app)
+
+    resp = client.get(f"/{manifest['app.js']}", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == CACHE_IMMUTABLE
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"].startswith("text/javascript")
+    assert resp.text == "console.log('hi');\n" * 200
+
+    resp = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert resp.headers["cache-control"] == CACHE_REVALIDATE
+    assert "content-encoding" not in resp.headers
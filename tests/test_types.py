@@ -0,0 +1,84 @@
+"""Tests for the integer cents / epoch-microsecond column encodings."""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import select, text
+
+from app.db.types import epoch_day, from_micros, to_micros
+from app.models.transaction import Transaction
+from tests.conftest import TestingSessionLocal, engine
+
+
+def _add(client, account_id, amount, when, kind="expense"):
+    resp = client.post(
+        "/transactions",
+        json={
+            "account_id": account_id,
+            "amount": amount,
+            "transaction_type": kind,
+            "date": when,
+        },
+    )
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def test_rows_are_stored_as_integers(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    tx = _add(auth_client, acct["id"], "12.34", "2026-03-04T10:11:12.345678")
+
+    with engine.connect() as conn:
+        amount, date = conn.execute(
+            text("SELECT amount, date FROM transactions WHERE id = :id"),
+            {"id": tx["id"]},
+        ).one()
+        balance = conn.execute(text("SELECT balance FROM accounts")).scalar()
+    assert amount == -1234
+    assert date == to_micros(datetime(2026, 3, 4, 10, 11, 12, 345678))
+    assert balance == -1234
+
+
+def test_json_api_is_unchanged(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    tx = _add(auth_client, acct["id"], 12.5, "2026-03-04T10:11:12.345678")
+    assert Decimal(tx["amount"]) == Decimal("-12.50")
+    assert tx["date"] == "2026-03-04T10:11:12.345678"
+
+    fetched = auth_client.get(f"/transactions/{tx['id']}").json()
+    assert fetched["amount"] == tx["amount"]
+    assert fetched["date"] == tx["date"]
+    account = auth_client.get(f"/accounts/{acct['id']}").json()
+    assert Decimal(account["balance"]) == Decimal("-12.5")
+
+
+def test_aware_dates_are_stored_in_utc(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    tx = _add(auth_client, acct["id"], 1, "2026-03-04T10:00:00+02:00")
+    assert tx["date"].startswith("2026-03-04T08:00:00")
+
+
+def test_sums_are_exact(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    for _ in range(10):
+        _add(auth_client, acct["id"], "0.10", "2026-03-04T10:00:00", "income")
+    summary = auth_client.get("/transactions/summary").json()
+    assert summary["total_income"] == "1.00"
+
+
+def test_epoch_day_floors_before_1970(auth_client):
+    acct = auth_client.post("/accounts/", json={"name": "Main"}).json()
+    _add(auth_client, acct["id"], 1, "1969-12-31T23:00:00")
+    _add(auth_client, acct["id"], 1, "1970-01-02T01:00:00")
+    with TestingSessionLocal() as db:
+        days = db.scalars(
+            select(epoch_day(Transaction.date)).order_by(Transaction.date)
+        ).all()
+    assert days == [-1, 1]
+
+
+def test_micros_round_trip():
+    when = datetime(2026, 3, 4, 10, 11, 12, 345678)
+    assert from_micros(to_micros(when)) == when
+    aware = datetime(2026, 3, 4, 10, tzinfo=timezone.utc)
+    assert from_micros(to_micros(aware)) == datetime(2026, 3, 4, 10)
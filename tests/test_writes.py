@@ -0,0 +1,80 @@
+"""Statement counts of the write paths (RETURNING, constraint-based uniqueness)."""
+
+import pytest
+
+from app.core.query_log import QueryRecorder
+
+
+def _run(client, method, path, **kwargs):
+    with QueryRecorder() as queries:
+        resp = client.request(method, path, **kwargs)
+    return resp, [s.split()[0] for s in queries.statements]
+
+
+@pytest.fixture
+def account(auth_client):
+    return auth_client.post("/accounts/", json={"name": "Main"}).json()
+
+
+def test_create_returns_inserted_row_without_refresh(auth_client):
+    resp, statements = _run(auth_client, "POST", "/accounts/", json={"name": "Main"})
+    assert resp.status_code == 201
+    assert resp.json()["balance"] == "0.00"
+    # user lookup + INSERT ... RETURNING (was: + refresh SELECT, 4 in all)
+    assert statements == ["SELECT", "INSERT"]
+
+
+def test_update_checks_ownership_in_the_update(auth_client, account):
+    resp, statements = _run(
+        auth_client, "PATCH", f"/accounts/{account['id']}", json={"name": "Renamed"}
+    )
+    assert resp.json()["name"] == "Renamed"
+    assert statements == ["SELECT", "UPDATE"]  # was 5: + load, + refresh
+
+    resp = auth_client.patch("/accounts/9999", json={"name": "Nope"})
+    assert resp.status_code == 404
+
+
+def test_create_transaction_statement_count(auth_client, account):
+    resp, statements = _run(
+        auth_client,
+        "POST",
+        "/transactions",
+        json={
+            "account_id": account["id"],
+            "amount": 12.5,
+            "transaction_type": "expense",
+            "date": "2026-03-01T10:00:00",
+        },
+    )
+    assert resp.status_code == 201
+    assert resp.json()["amount"] == "-12.50"
+    # user, owned accounts, INSERT, balance += amount, ledger month upsert,
+    # data_version (was 8)
+    assert statements == ["SELECT", "SELECT", "INSERT", "UPDATE", "INSERT", "UPDATE"]
+    balance = auth_client.get(f"/accounts/{account['id']}").json()["balance"]
+    assert balance == "-12.50"
+
+
+def test_duplicate_budget_is_rejected_by_the_constraint(auth_client):
+    food = auth_client.post("/categories", json={"name": "Food"}).json()
+    body = {"category_id": food["id"], "year": 2026, "month": 3, "amount": 100}
+    resp, statements = _run(auth_client, "POST", "/budgets/", json=body)
+    assert resp.status_code == 201
+    assert statements == ["SELECT", "SELECT", "INSERT"]  # user, category, insert
+
+    resp, statements = _run(auth_client, "POST", "/budgets/", json=body)
+    assert resp.status_code == 400
+    assert statements == ["SELECT", "SELECT", "INSERT"]  # ON CONFLICT DO NOTHING
+    assert len(auth_client.get("/budgets/").json()) == 1
+
+
+def test_duplicate_email_is_rejected_by_the_constraint(client):
+    body = {"email": "a@example.com", "password": "password123", "full_name": "A"}
+    resp, statements = _run(client, "POST", "/auth/register", json=body)
+    assert resp.status_code == 201
+    assert statements == ["INSERT"]
+
+    resp, statements = _run(client, "POST", "/auth/register", json=body)
+    assert resp.status_code == 400
+    assert statements == ["INSERT"]